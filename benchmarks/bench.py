@@ -0,0 +1,282 @@
+"""
+BigBountyRecon benchmark suite
+Measures URL generation throughput, GUI cold start, browser dispatch latency and technique filtering,
+and writes the results as JSON so runs of different versions can be compared
+
+Usage:
+    python3 benchmarks/bench.py -o results.json
+    python3 benchmarks/bench.py --sizes 1000 100000 1000000 --startup-runs 10
+    python3 benchmarks/bench.py -o new.json --compare old.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import shlex
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC = os.path.join(ROOT, "src")
+sys.path.insert(0, SRC)
+
+import rate_limiter  # noqa: E402
+import techniques  # noqa: E402
+from browser_launcher import BrowserLauncher  # noqa: E402
+from technique_index import TechniqueIndex  # noqa: E402
+
+# Runs in a fresh interpreter: imports main and times everything up to the first rendered frame
+STARTUP_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+sys.path.insert(0, {src!r})
+import main
+imported = time.perf_counter()
+root = main.tk.Tk()
+app = main.BigBountyReconApp(root)
+first_frame = time.perf_counter()
+while not app.startup.done:
+    root.update()
+complete = time.perf_counter()
+root.destroy()
+print(json.dumps({{"import_seconds": imported - start, "first_frame_seconds": first_frame - start,
+                  "startup_complete_seconds": complete - start}}))
+"""
+
+
+def summarize(samples):
+    """Summary statistics of a list of durations in seconds"""
+    ordered = sorted(samples)
+    return {
+        "runs": len(ordered),
+        "min": ordered[0],
+        "median": statistics.median(ordered),
+        "p95": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+        "max": ordered[-1],
+    }
+
+
+def synthetic_domains(count):
+    """Yield count distinct domain names without building a list"""
+    for i in range(count):
+        yield f"host{i}.example{i % 97}.com"
+
+
+def bench_url_generation(sizes):
+    """Time building every technique URL for synthetic domain lists of each size"""
+    results = {}
+    for size in sizes:
+        start = time.perf_counter()
+        urls = 0
+        for domain in synthetic_domains(size):
+            urls += len(techniques.render_all(domain))
+        elapsed = time.perf_counter() - start
+        results[str(size)] = {
+            "domains": size,
+            "urls": urls,
+            "seconds": elapsed,
+            "urls_per_second": urls / elapsed if elapsed else None,
+        }
+    return results
+
+
+def startup_command():
+    """Command running the startup probe, under a virtual display if there is no display"""
+    command = [sys.executable, "-c", STARTUP_PROBE.format(src=SRC)]
+    if os.name == "nt" or sys.platform == "darwin" or os.environ.get("DISPLAY"):
+        return command, None
+    if shutil.which("xvfb-run"):
+        return ["xvfb-run", "-a"] + command, None
+    return None, "no DISPLAY and xvfb-run is not installed"
+
+
+def bench_startup(runs):
+    """Time cold import of main.py and the first rendered frame of BigBountyReconApp in fresh processes"""
+    command, skipped = startup_command()
+    if skipped:
+        return {"skipped": skipped}
+
+    imports, frames, completes, walls = [], [], [], []
+    for _ in range(runs):
+        start = time.perf_counter()
+        proc = subprocess.run(command, capture_output=True, text=True)
+        walls.append(time.perf_counter() - start)
+        if proc.returncode != 0:
+            return {"skipped": "startup probe failed: " + proc.stderr.strip().splitlines()[-1]}
+        probe = json.loads(proc.stdout.strip().splitlines()[-1])
+        imports.append(probe["import_seconds"])
+        frames.append(probe["first_frame_seconds"])
+        completes.append(probe["startup_complete_seconds"])
+    return {
+        "import": summarize(imports),
+        "first_frame": summarize(frames),
+        "startup_complete": summarize(completes),
+        "process_wall": summarize(walls),
+    }
+
+
+def bench_dispatch(runs):
+    """Time recon_searches.open_url end to end, and the browser launcher on its own, against a stub browser
+
+    The stub command exits immediately. open_url runs with a temporary BBR_HOME
+    and rate limits high enough that the limiter is consulted but never waits.
+    """
+    stub = " ".join(shlex.quote(arg) for arg in [sys.executable, "-c", "pass", "%s"])
+    url = techniques.get("directory_listing").url("tesla.com")
+    urls = [technique.url("tesla.com") for technique in techniques.TECHNIQUES]
+
+    launcher = BrowserLauncher(stub)
+    launcher_totals, resolves, opens = [], [], []
+    for _ in range(runs):
+        start = time.perf_counter()
+        timing = launcher.open(url)
+        launcher_totals.append(time.perf_counter() - start)
+        resolves.append(timing.resolve_seconds)
+        opens.append(timing.open_seconds)
+    start = time.perf_counter()
+    launcher.open_many(urls)
+    launcher_batch = time.perf_counter() - start
+
+    unlimited = {host: [10 ** 9, 10 ** 9] for host in {rate_limiter.host_of(u) for u in urls}}
+    overrides = {"BBR_BROWSER": stub, "BBR_RATE_LIMIT": "1", "BBR_RATE_LIMITS": json.dumps(unlimited),
+                 "BBR_CACHE_PROXY": "0"}
+    saved = {name: os.environ.get(name) for name in list(overrides) + ["BBR_HOME"]}
+    with tempfile.TemporaryDirectory() as home:
+        os.environ.update(overrides, BBR_HOME=home)
+        try:
+            import recon_searches
+
+            totals = []
+            for _ in range(runs):
+                start = time.perf_counter()
+                recon_searches.open_url(url, "directory_listing")
+                totals.append(time.perf_counter() - start)
+            start = time.perf_counter()
+            recon_searches.open_urls(urls)
+            batch = time.perf_counter() - start
+        finally:
+            for name, value in saved.items():
+                if value is None:
+                    os.environ.pop(name, None)
+                else:
+                    os.environ[name] = value
+
+    return {
+        "open_url": summarize(totals),
+        "open_urls_all_techniques_seconds": batch,
+        "launcher": {
+            "total": summarize(launcher_totals),
+            "resolve": summarize(resolves),
+            "open": summarize(opens),
+            "open_many_all_techniques_seconds": launcher_batch,
+        },
+    }
+
+
+def synthetic_catalogue(count):
+    """count techniques made by varying the registry's labels and descriptions, like an imported dork collection"""
+    base = techniques.TECHNIQUES
+    return [techniques.Technique(f"dork_{i}", f"{base[i % len(base)].label} {i}", base[i % len(base)].short_label,
+                                 "", base[i % len(base)].category, f"{base[i % len(base)].description} set{i % 997}",
+                                 base[i % len(base)].template)
+            for i in range(count)]
+
+
+def bench_filter(size):
+    """Time building the filter index for a synthetic catalogue and typing queries into it one key at a time"""
+    catalogue = synthetic_catalogue(size)
+    start = time.perf_counter()
+    index = TechniqueIndex(catalogue)
+    build = time.perf_counter() - start
+
+    keystrokes = []
+    for query in ("wordpress", "ext sql", "set12 login", "zzz"):
+        for end in range(1, len(query) + 1):
+            start = time.perf_counter()
+            index.search(query[:end], 240)
+            index.count(query[:end])
+            keystrokes.append(time.perf_counter() - start)
+    return {"techniques": size, "build_seconds": build, "keystroke": summarize(keystrokes)}
+
+
+def flatten(results, prefix=""):
+    """Flatten nested results into {"a.b.c": number} for comparison"""
+    flat = {}
+    for key, value in results.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, name + "."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = value
+    return flat
+
+
+def compare(baseline, current):
+    """Print the ratio current/baseline for every metric both runs have"""
+    old = flatten(baseline["results"])
+    new = flatten(current["results"])
+    for name in sorted(set(old) & set(new)):
+        if old[name]:
+            print(f"{name:70s} {old[name]:14.6g} -> {new[name]:14.6g}  x{new[name] / old[name]:.3f}", file=sys.stderr)
+
+
+def git_revision():
+    """Current git commit, if the benchmark runs from a git checkout"""
+    try:
+        proc = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True)
+        return proc.stdout.strip() or None
+    except OSError:
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="BigBountyRecon benchmarks")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 100000, 1000000],
+                        help="synthetic domain list sizes for URL generation")
+    parser.add_argument("--startup-runs", type=int, default=5, help="cold start runs")
+    parser.add_argument("--dispatch-runs", type=int, default=50, help="open_url dispatch runs")
+    parser.add_argument("--filter-size", type=int, default=10000, help="techniques in the filter benchmark catalogue")
+    parser.add_argument("--skip", action="append", default=[], choices=["urls", "startup", "dispatch", "filter"],
+                        help="skip a benchmark (repeatable)")
+    parser.add_argument("-o", "--output", default="-", help="JSON output file (default: stdout)")
+    parser.add_argument("--compare", help="earlier JSON results to compare against")
+    args = parser.parse_args(argv)
+
+    results = {}
+    if "urls" not in args.skip:
+        results["url_generation"] = bench_url_generation(args.sizes)
+    if "startup" not in args.skip:
+        results["startup"] = bench_startup(args.startup_runs)
+    if "dispatch" not in args.skip:
+        results["dispatch"] = bench_dispatch(args.dispatch_runs)
+    if "filter" not in args.skip:
+        results["filter"] = bench_filter(args.filter_size)
+
+    report = {
+        "revision": git_revision(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "techniques": len(techniques.TECHNIQUES),
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output == "-":
+        print(text)
+    else:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            compare(json.load(f), report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
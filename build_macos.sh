@@ -28,6 +28,28 @@ pyinstaller --name=BigBountyRecon \
     --hidden-import=urllib.parse \
     --hidden-import=platform \
     --hidden-import=recon_searches \
+    --hidden-import=refresh \
+    --hidden-import=compact_export \
+    --hidden-import=cdx_analyze \
+    --hidden-import=api_server \
+    --hidden-import=history \
+    --hidden-import=metrics \
+    --hidden-import=domain_normalize \
+    --hidden-import=report_export \
+    --hidden-import=technique_store \
+    --hidden-import=technique_index \
+    --hidden-import=dork_packer \
+    --hidden-import=site_fetch \
+    --hidden-import=fanout \
+    --hidden-import=ct_harvest \
+    --hidden-import=async_http \
+    --hidden-import=cache_proxy \
+    --hidden-import=rate_limiter \
+    --hidden-import=dispatcher \
+    --hidden-import=button_grid \
+    --hidden-import=techniques \
+    --hidden-import=config \
+    --hidden-import=browser_launcher \
     --osx-bundle-identifier=com.bigbountyrecon.app \
     src/main.py
 
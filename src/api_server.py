@@ -0,0 +1,294 @@
+"""
+Local HTTP/JSON API for BigBountyRecon
+Lets other tools list the techniques, generate their URLs for one or many
+domains and, if allowed, open them in the browser, without the Tk GUI
+
+Endpoints (all responses are JSON):
+    GET  /health
+    GET  /techniques
+    GET  /urls?domain=tesla.com[&technique=github&technique=shodan][&pack=1]
+    POST /urls   {"domains": [...], "techniques": [...], "pack": false}
+    POST /open   {"domain": "...", "techniques": [...], "pack": false}  (only with allow_open)
+
+/open only accepts bodies sent as Content-Type: application/json, which a
+web page can only send to another origin after a CORS preflight this
+server never answers, so sites open in the browser cannot trigger it.
+
+The server is a single asyncio process speaking HTTP/1.1 with keep-alive;
+requests on one connection are answered in order. Domains are normalized
+before use, and the invalid ones are listed in the response.
+"""
+
+import asyncio
+import json
+import urllib.parse
+
+import domain_normalize
+import dork_packer
+import metrics
+import technique_store
+import techniques
+
+DEFAULT_PORT = 8765
+
+# Largest request line / header line, number of headers and request body accepted
+MAX_LINE = 8192
+MAX_HEADERS = 100
+MAX_BODY = 16 * 1024 * 1024
+
+# Idle keep-alive connections are closed after this many seconds
+IDLE_TIMEOUT = 60
+
+ENDPOINTS = ("/health", "/techniques", "/urls", "/open")
+
+REASONS = {200: "OK", 202: "Accepted", 400: "Bad Request", 403: "Forbidden", 404: "Not Found",
+           405: "Method Not Allowed", 411: "Length Required", 413: "Payload Too Large",
+           415: "Unsupported Media Type", 500: "Internal Server Error", 501: "Not Implemented"}
+
+
+class ApiError(Exception):
+    """A request that cannot be served; answered with the given status and message"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class ApiServer:
+    """Serves the technique catalogue and URL generation over HTTP/JSON"""
+
+    def __init__(self, catalogue=None, allow_open=False, max_body=MAX_BODY):
+        self.catalogue = catalogue if catalogue is not None else technique_store.load_catalogue()
+        self.allow_open = allow_open
+        self.max_body = max_body
+        self.requests = 0
+        self._techniques_body = None
+        self._server = None
+
+    # Request handling
+
+    def select(self, ids):
+        """Techniques for a list of ids (all built-in ones if empty); ApiError for unknown ids"""
+        if not ids:
+            return techniques.TECHNIQUES
+        if isinstance(ids, str) or not isinstance(ids, list):
+            raise ApiError(400, '"techniques" must be a list of technique ids')
+        selected = []
+        unknown = []
+        for technique_id in ids:
+            technique = self.catalogue.get(technique_id) if isinstance(technique_id, str) else None
+            if technique is None:
+                unknown.append(technique_id)
+            else:
+                selected.append(technique)
+        if unknown:
+            raise ApiError(400, f"unknown technique(s): {', '.join(map(str, unknown))}")
+        return selected
+
+    @staticmethod
+    def render(domain, selected, pack=False):
+        """URL records of the selected techniques for one normalized domain"""
+        if pack:
+            result = dork_packer.pack(techniques.render_all(domain, selected))
+            return [{"techniques": list(query.technique_ids), "url": query.url} for query in result.queries]
+        return [{"technique": technique.id, "url": url} for technique, url in techniques.render_all(domain, selected)]
+
+    def techniques_body(self):
+        """JSON of the catalogue, built once"""
+        if self._techniques_body is None:
+            self._techniques_body = json.dumps({"techniques": [
+                {"id": technique.id, "label": technique.label, "category": technique.category,
+                 "description": technique.description, "cacheable": technique.cacheable}
+                for technique in self.catalogue]}).encode("utf-8")
+        return self._techniques_body
+
+    def urls(self, domains, technique_ids, pack):
+        selected = self.select(technique_ids)
+        normalizer = domain_normalize.Normalizer()
+        results = [{"domain": domain, "urls": self.render(domain, selected, pack)}
+                   for domain in normalizer(domains)]
+        return {"results": results, "invalid": normalizer.errors, "duplicates": normalizer.duplicates}
+
+    async def open(self, request):
+        """Open the techniques' URLs for a domain in the browser, on a worker thread"""
+        if not self.allow_open:
+            raise ApiError(403, "opening URLs is disabled; start the server with --allow-open")
+        try:
+            domain = domain_normalize.normalize(str(request.get("domain", "")))
+        except ValueError as e:
+            raise ApiError(400, str(e))
+        selected = self.select(request.get("techniques"))
+        # Imported here so a server that never opens anything does not load the browser machinery
+        import recon_searches
+        if request.get("pack"):
+            urls, result = recon_searches.packed_urls(selected, domain)
+            runs = [(technique_id, url) for url, query in zip(urls, result.queries)
+                    for technique_id in query.technique_ids]
+        else:
+            urls = recon_searches.technique_urls(selected, domain)
+            runs = list(zip((technique.id for technique in selected), urls))
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(None, recon_searches.open_recorded, domain, runs, None)
+        # Failures end up in the run history; retrieve them so asyncio does not log them as unhandled
+        future.add_done_callback(lambda f: f.exception())
+        return 202, {"domain": domain, "opening": len(urls)}
+
+    async def route(self, method, target, body, content_type=""):
+        """(status, JSON-able object or bytes) for one request"""
+        parts = urllib.parse.urlsplit(target)
+        path = parts.path.rstrip("/") or "/"
+        query = urllib.parse.parse_qs(parts.query)
+        if path == "/health":
+            return 200, {"status": "ok", "requests": self.requests}
+        if path == "/techniques":
+            if method != "GET":
+                raise ApiError(405, "use GET")
+            return 200, self.techniques_body()
+        if path == "/urls":
+            if method == "GET":
+                if "domain" not in query:
+                    raise ApiError(400, "missing domain parameter")
+                pack = query.get("pack", ["0"])[0] in ("1", "true", "yes")
+                return 200, self.urls(query["domain"], query.get("technique"), pack)
+            if method == "POST":
+                request = parse_body(body)
+                domains = request.get("domains")
+                if domains is None and "domain" in request:
+                    domains = [request["domain"]]
+                if not isinstance(domains, list) or not all(isinstance(domain, str) for domain in domains):
+                    raise ApiError(400, '"domains" must be a list of strings')
+                return 200, self.urls(domains, request.get("techniques"), bool(request.get("pack")))
+            raise ApiError(405, "use GET or POST")
+        if path == "/open":
+            if method != "POST":
+                raise ApiError(405, "use POST")
+            if content_type.split(";")[0].strip().lower() != "application/json":
+                raise ApiError(415, "send the request body as Content-Type: application/json")
+            return await self.open(parse_body(body))
+        raise ApiError(404, f"no such endpoint: {path}")
+
+    # HTTP/1.1
+
+    async def handle(self, reader, writer):
+        """Serve requests on one connection until the client closes it or stops keeping it alive"""
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(read_request(reader, self.max_body), IDLE_TIMEOUT)
+                except ApiError as e:
+                    await send(writer, e.status, {"error": str(e)}, keep_alive=False)
+                    return
+                if request is None:
+                    return
+                method, target, keep_alive, body, content_type = request
+                self.requests += 1
+                path = urllib.parse.urlsplit(target).path.rstrip("/")
+                with metrics.timed("api", path if path in ENDPOINTS else "other"):
+                    try:
+                        status, result = await self.route(method, target, body, content_type)
+                    except ApiError as e:
+                        status, result = e.status, {"error": str(e)}
+                    except Exception as e:
+                        status, result = 500, {"error": f"{type(e).__name__}: {e}"}
+                    await send(writer, status, result, keep_alive)
+                if not keep_alive:
+                    return
+        except (asyncio.TimeoutError, ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host="127.0.0.1", port=DEFAULT_PORT):
+        self._server = await asyncio.start_server(self.handle, host, port, limit=MAX_LINE)
+        return self._server
+
+    @property
+    def port(self):
+        return self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self, host="127.0.0.1", port=DEFAULT_PORT, on_ready=None):
+        server = await self.start(host, port)
+        if on_ready is not None:
+            on_ready(self)
+        async with server:
+            await server.serve_forever()
+
+
+def parse_body(body):
+    """JSON object of a request body; ApiError if it is not one"""
+    try:
+        request = json.loads(body or b"{}")
+    except ValueError as e:
+        raise ApiError(400, f"invalid JSON body: {e}")
+    if not isinstance(request, dict):
+        raise ApiError(400, "request body must be a JSON object")
+    return request
+
+
+async def read_request(reader, max_body=MAX_BODY):
+    """(method, target, keep alive, body, content type) of the next request, or None once the client has closed"""
+    try:
+        line = await reader.readline()
+    except ValueError:
+        raise ApiError(400, "request line too long")
+    if not line:
+        return None
+    try:
+        method, target, version = line.decode("latin-1").split()
+    except ValueError:
+        raise ApiError(400, "malformed request line")
+    if version not in ("HTTP/1.1", "HTTP/1.0"):
+        raise ApiError(400, f"unsupported protocol {version}")
+
+    headers = {}
+    while True:
+        try:
+            line = await reader.readline()
+        except ValueError:
+            raise ApiError(400, "header line too long")
+        if line in (b"\r\n", b"\n"):
+            break
+        if not line:
+            raise ApiError(400, "connection closed inside the headers")
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+        if len(headers) > MAX_HEADERS:
+            raise ApiError(400, "too many headers")
+
+    connection = headers.get("connection", "").lower()
+    keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+    if "chunked" in headers.get("transfer-encoding", "").lower():
+        raise ApiError(501, "chunked request bodies are not supported; send Content-Length")
+    try:
+        length = int(headers.get("content-length", 0))
+    except ValueError:
+        raise ApiError(400, "invalid Content-Length")
+    if length < 0:
+        raise ApiError(400, "invalid Content-Length")
+    if length > max_body:
+        raise ApiError(413, f"request body larger than {max_body} bytes")
+    if method == "POST" and "content-length" not in headers:
+        raise ApiError(411, "POST requests need a Content-Length")
+    body = await reader.readexactly(length) if length else b""
+    return method.upper(), target, keep_alive, body, headers.get("content-type", "")
+
+
+async def send(writer, status, result, keep_alive=True):
+    """Write one JSON response"""
+    body = result if isinstance(result, bytes) else json.dumps(result).encode("utf-8")
+    head_lines = (f"HTTP/1.1 {status} {REASONS.get(status, 'Unknown')}\r\n"
+                  f"Content-Type: application/json\r\n"
+                  f"Content-Length: {len(body)}\r\n"
+                  f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    writer.write(head_lines.encode("latin-1") + body)
+    await writer.drain()
+
+
+def serve(host="127.0.0.1", port=DEFAULT_PORT, allow_open=False, on_ready=None):
+    """Run an ApiServer until interrupted"""
+    server = ApiServer(allow_open=allow_open)
+    try:
+        asyncio.run(server.serve_forever(host, port, on_ready))
+    except KeyboardInterrupt:
+        pass
+    return server
@@ -0,0 +1,296 @@
+"""
+Minimal asyncio HTTP/1.1 client for BigBountyRecon
+Standard library only; streams response bodies instead of buffering them
+
+get() opens one connection per request. ConnectionPool keeps connections
+alive between requests to the same host and caps connections per host.
+"""
+
+import asyncio
+import ssl
+import urllib.parse
+
+USER_AGENT = "BigBountyRecon"
+
+# Largest status line / header line accepted from a server
+MAX_LINE = 65536
+
+
+class HttpError(Exception):
+    """The server sent something that is not valid HTTP/1.1, or the request timed out"""
+
+
+class Response:
+    """Status, headers and a streamed body of one HTTP response
+
+    Iterate over body() to receive the body in chunks; the connection is
+    released when the body has been read to the end or close() is called.
+    A release callback (set by ConnectionPool) gets the connection back
+    instead of it being closed, with whether it can be reused.
+    """
+
+    def __init__(self, url, status, reason, headers, reader, writer, timeout, method="GET", release=None):
+        self.url = url
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+        self._reader = reader
+        self._writer = writer
+        self._timeout = timeout
+        self._release = release
+        self.has_body = method != "HEAD" and status not in (204, 304) and status >= 200
+
+    def header(self, name, default=None):
+        return self.headers.get(name.lower(), default)
+
+    async def _read(self, coro):
+        try:
+            return await asyncio.wait_for(coro, self._timeout)
+        except asyncio.TimeoutError:
+            raise HttpError(f"timed out reading {self.url}")
+
+    async def body(self, chunk_size=65536):
+        """Yield the body in chunks, handling Content-Length, chunked encoding and read-to-close"""
+        reader = self._reader
+        complete = False
+        try:
+            if not self.has_body:
+                # HEAD, 204 and 304 responses end at the headers
+                pass
+            elif "chunked" in self.header("transfer-encoding", "").lower():
+                while True:
+                    size_line = await self._read(reader.readline())
+                    if not size_line:
+                        raise HttpError(f"connection closed before the last chunk by {self.url}")
+                    try:
+                        size = int(size_line.split(b";", 1)[0].strip(), 16)
+                    except ValueError:
+                        raise HttpError(f"bad chunk size from {self.url}")
+                    if size == 0:
+                        # Skip trailers up to the blank line
+                        while (await self._read(reader.readline())).strip():
+                            pass
+                        break
+                    remaining = size
+                    while remaining:
+                        data = await self._read(reader.read(min(chunk_size, remaining)))
+                        if not data:
+                            raise HttpError(f"connection closed mid-chunk by {self.url}")
+                        remaining -= len(data)
+                        yield data
+                    try:
+                        await self._read(reader.readexactly(2))
+                    except asyncio.IncompleteReadError:
+                        raise HttpError(f"connection closed mid-chunk by {self.url}")
+            elif self.header("content-length") is not None:
+                try:
+                    remaining = int(self.header("content-length"))
+                except ValueError:
+                    raise HttpError(f"bad Content-Length from {self.url}")
+                if remaining < 0:
+                    raise HttpError(f"bad Content-Length from {self.url}")
+                while remaining:
+                    data = await self._read(reader.read(min(chunk_size, remaining)))
+                    if not data:
+                        raise HttpError(f"connection closed early by {self.url}")
+                    remaining -= len(data)
+                    yield data
+            else:
+                while True:
+                    data = await self._read(reader.read(chunk_size))
+                    if not data:
+                        break
+                    yield data
+                # Read to close, so the connection cannot be reused
+                return
+            complete = True
+        finally:
+            await self._finish(complete and self.header("connection", "").lower() != "close")
+
+    async def read(self, limit=None):
+        """Read the whole body, or at most limit bytes of it"""
+        parts = []
+        size = 0
+        body = self.body()
+        try:
+            async for data in body:
+                parts.append(data)
+                size += len(data)
+                if limit is not None and size >= limit:
+                    break
+        finally:
+            await body.aclose()
+        return b"".join(parts)[:limit] if limit is not None else b"".join(parts)
+
+    async def drain(self, limit=1024 * 1024):
+        """Discard the body so the connection can be reused; bodies over limit close it instead"""
+        size = 0
+        body = self.body()
+        try:
+            async for data in body:
+                size += len(data)
+                if size > limit:
+                    break
+        finally:
+            await body.aclose()
+
+    async def close(self):
+        await self._finish(False)
+
+    async def _finish(self, reusable):
+        writer, self._writer = self._writer, None
+        if writer is None:
+            return
+        if self._release is not None:
+            await self._release(self._reader, writer, reusable)
+        else:
+            await close_writer(writer)
+
+
+async def close_writer(writer):
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except (OSError, ssl.SSLError):
+        pass
+
+
+async def read_head(reader, url, timeout):
+    """Read a status line and headers, returning (status, reason, headers with lowercased names)"""
+    try:
+        status_line = await asyncio.wait_for(reader.readline(), timeout)
+        parts = status_line.decode("iso-8859-1").rstrip("\r\n").split(" ", 2)
+        if len(parts) < 2 or not parts[0].startswith("HTTP/"):
+            raise HttpError(f"bad status line from {url}: {status_line[:100]!r}")
+        try:
+            status = int(parts[1])
+        except ValueError:
+            raise HttpError(f"bad status line from {url}: {status_line[:100]!r}")
+        headers = {}
+        while True:
+            line = await asyncio.wait_for(reader.readline(), timeout)
+            if len(line) > MAX_LINE:
+                raise HttpError(f"header line too long from {url}")
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("iso-8859-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+    except asyncio.TimeoutError:
+        raise HttpError(f"timed out waiting for {url}")
+    return status, parts[2] if len(parts) > 2 else "", headers
+
+
+def request_bytes(method, parts, headers):
+    """Serialize a request head for a urlsplit() result"""
+    path = parts.path or "/"
+    if parts.query:
+        path += "?" + parts.query
+    lines = [f"{method} {path} HTTP/1.1", f"Host: {parts.netloc}"]
+    lines += [f"{name}: {value}" for name, value in headers.items()]
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("iso-8859-1")
+
+
+async def get(url, timeout=30, headers=None, ssl_context=None):
+    """Send a GET request and return the Response once its headers have arrived"""
+    parts = urllib.parse.urlsplit(url)
+    https = parts.scheme == "https"
+    port = parts.port or (443 if https else 80)
+    context = (ssl_context or ssl.create_default_context()) if https else None
+    try:
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(parts.hostname, port, ssl=context, limit=MAX_LINE), timeout)
+    except asyncio.TimeoutError:
+        raise HttpError(f"timed out connecting to {url}")
+
+    request_headers = {"User-Agent": USER_AGENT, "Accept-Encoding": "identity", "Connection": "close"}
+    request_headers.update(headers or {})
+    writer.write(request_bytes("GET", parts, request_headers))
+    try:
+        await writer.drain()
+        status, reason, response_headers = await read_head(reader, url, timeout)
+    except Exception:
+        writer.close()
+        raise
+    return Response(url, status, reason, response_headers, reader, writer, timeout)
+
+
+class ConnectionPool:
+    """Keep-alive connections shared between requests, at most per_host open at once per host
+
+    A request waits for a free slot for its host, reuses an idle connection
+    if there is one and retries once on a fresh connection if the server had
+    closed the idle one. Call close() when done.
+    """
+
+    def __init__(self, per_host=2, timeout=30, ssl_context=None):
+        self.per_host = per_host
+        self.timeout = timeout
+        self.ssl_context = ssl_context
+        self.opened = 0
+        self.reused = 0
+        self._idle = {}  # (scheme, host, port) -> [(reader, writer)]
+        self._slots = {}  # (scheme, host, port) -> Semaphore
+
+    async def _connect(self, key):
+        scheme, host, port = key
+        context = (self.ssl_context or ssl.create_default_context()) if scheme == "https" else None
+        try:
+            connection = await asyncio.wait_for(
+                asyncio.open_connection(host, port, ssl=context, limit=MAX_LINE), self.timeout)
+        except asyncio.TimeoutError:
+            raise HttpError(f"timed out connecting to {host}:{port}")
+        self.opened += 1
+        return connection
+
+    async def request(self, method, url, headers=None):
+        """Send a request and return the Response once its headers have arrived
+
+        The connection goes back to the pool once the body has been read to the end.
+        """
+        parts = urllib.parse.urlsplit(url)
+        scheme = parts.scheme
+        key = (scheme, parts.hostname, parts.port or (443 if scheme == "https" else 80))
+        slot = self._slots.get(key)
+        if slot is None:
+            slot = self._slots[key] = asyncio.Semaphore(self.per_host)
+        await slot.acquire()
+
+        async def release(reader, writer, reusable):
+            if reusable and not reader.at_eof():
+                self._idle.setdefault(key, []).append((reader, writer))
+            else:
+                await close_writer(writer)
+            slot.release()
+
+        request_headers = {"User-Agent": USER_AGENT, "Accept-Encoding": "identity", "Connection": "keep-alive"}
+        request_headers.update(headers or {})
+        data = request_bytes(method, parts, request_headers)
+        try:
+            while True:
+                idle = self._idle.get(key)
+                reused = bool(idle)
+                reader, writer = idle.pop() if reused else await self._connect(key)
+                try:
+                    writer.write(data)
+                    await writer.drain()
+                    status, reason, response_headers = await read_head(reader, url, self.timeout)
+                except (HttpError, OSError):
+                    await close_writer(writer)
+                    if reused:
+                        # The server closed the idle connection; try another or a new one
+                        continue
+                    raise
+                if reused:
+                    self.reused += 1
+                return Response(url, status, reason, response_headers, reader, writer, self.timeout,
+                                method, release)
+        except BaseException:
+            slot.release()
+            raise
+
+    async def close(self):
+        """Close all idle connections"""
+        idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for _, writer in connections:
+                await close_writer(writer)
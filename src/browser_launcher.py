@@ -0,0 +1,198 @@
+"""
+Browser launcher for BigBountyRecon
+Discovers the Chrome browser once and reuses the controller for every technique
+"""
+
+import collections
+import os
+import platform
+import shlex
+import shutil
+import subprocess
+import threading
+import time
+import webbrowser
+
+import config
+
+# Chrome browser names known to webbrowser, in order of preference
+CHROME_NAMES = ['chrome', 'google-chrome', 'chromium', 'chromium-browser']
+
+# Chrome locations on macOS, which webbrowser does not register by itself
+MACOS_CHROME_PATHS = [
+    '/Applications/Google Chrome.app/Contents/MacOS/Google Chrome',
+    '/Applications/Chromium.app/Contents/MacOS/Chromium'
+]
+
+# Timing of a single launch: how long resolving the controller and opening the URL took
+LaunchTiming = collections.namedtuple("LaunchTiming", "url resolve_seconds open_seconds cached")
+
+
+def discover_browser(override=None):
+    """Find a browser controller: explicit override, then Chrome, then the default browser"""
+    if override:
+        # A command line containing %s (e.g. "chrome --incognito %s") is used as-is, launched
+        # in the background so opening a URL never waits for the browser to exit
+        if '%s' in override:
+            return webbrowser.BackgroundBrowser(shlex.split(override))
+        if os.path.isfile(override):
+            return webbrowser.BackgroundBrowser(override)
+        try:
+            return webbrowser.get(override)
+        except webbrowser.Error:
+            pass
+
+    for name in CHROME_NAMES:
+        try:
+            return webbrowser.get(name)
+        except webbrowser.Error:
+            continue
+
+    # If Chrome not found, try to register it manually on macOS
+    if platform.system() == 'Darwin':
+        for path in MACOS_CHROME_PATHS:
+            if os.path.exists(path):
+                webbrowser.register('chrome', None, webbrowser.BackgroundBrowser(path))
+                return webbrowser.get('chrome')
+
+    # Fallback to default browser
+    return webbrowser
+
+
+def browser_executable(controller):
+    """Executable behind a controller, or None if it is not a plain command (e.g. the default browser)"""
+    if isinstance(controller, (webbrowser.GenericBrowser, webbrowser.UnixBrowser)):
+        return controller.name
+    return None
+
+
+def executable_exists(executable):
+    """Check whether an executable name or path can still be run"""
+    if os.path.isabs(executable):
+        return os.path.exists(executable)
+    return shutil.which(executable) is not None
+
+
+class BrowserLauncher:
+    """Resolves the browser controller once and caches it for the process lifetime"""
+
+    def __init__(self, override=None):
+        self.override = override
+        self.last_timing = None
+        self._controller = None
+        self._lock = threading.Lock()
+
+    def resolve(self):
+        """Get the cached controller, discovering it on first use"""
+        controller = self._controller
+        if controller is None:
+            with self._lock:
+                if self._controller is None:
+                    self._controller = discover_browser(self.override)
+                controller = self._controller
+        return controller
+
+    def invalidate(self):
+        """Forget the cached controller so the next launch discovers the browser again"""
+        with self._lock:
+            self._controller = None
+
+    def _resolve_checked(self):
+        """Resolve the controller, rediscovering it if its executable has disappeared"""
+        cached = self._controller is not None
+        controller = self.resolve()
+        executable = browser_executable(controller)
+        if cached and executable and not executable_exists(executable):
+            self.invalidate()
+            controller = self.resolve()
+            cached = False
+        return controller, cached
+
+    def open(self, url):
+        """Open URL in the browser, returning the LaunchTiming of this launch"""
+        start = time.perf_counter()
+        controller, cached = self._resolve_checked()
+        resolved = time.perf_counter()
+
+        opened = controller.open(url)
+        if not opened and cached:
+            # The cached browser failed to start, discover again and retry once
+            self.invalidate()
+            controller = self.resolve()
+            cached = False
+            controller.open(url)
+        finished = time.perf_counter()
+
+        self.last_timing = LaunchTiming(url, resolved - start, finished - resolved, cached)
+        return self.last_timing
+
+    def open_many(self, urls, window_size=None):
+        """Open several URLs with one browser process per window of window_size URLs (all at once if None)
+
+        Returns one LaunchTiming per browser invocation
+        """
+        urls = list(urls)
+        if not urls:
+            return []
+        if not window_size or window_size < 1:
+            window_size = len(urls)
+
+        timings = []
+        for i in range(0, len(urls), window_size):
+            window = urls[i:i + window_size]
+            start = time.perf_counter()
+            controller, cached = self._resolve_checked()
+            resolved = time.perf_counter()
+
+            cmdline = batch_command(controller, window)
+            if cmdline is None or not spawn(cmdline):
+                # Browser cannot take several URLs at once, open them one by one
+                for url in window:
+                    controller.open(url)
+            finished = time.perf_counter()
+
+            self.last_timing = LaunchTiming(" ".join(window), resolved - start, finished - resolved, cached)
+            timings.append(self.last_timing)
+        return timings
+
+
+def batch_command(controller, urls):
+    """Command line opening all urls in one browser process, or None if the controller cannot do that"""
+    if isinstance(controller, webbrowser.GenericBrowser):
+        if controller.args.count('%s') != 1 or any('%s' in arg and arg != '%s' for arg in controller.args):
+            return None
+        args = []
+        for arg in controller.args:
+            if arg == '%s':
+                args.extend(urls)
+            else:
+                args.append(arg)
+        return [controller.name] + args
+    if isinstance(controller, webbrowser.UnixBrowser):
+        return [controller.name] + list(urls)
+    return None
+
+
+def spawn(cmdline):
+    """Start a browser process in the background, returning False if it could not be started"""
+    try:
+        subprocess.Popen(cmdline, close_fds=True, stdin=subprocess.DEVNULL,
+                         stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                         start_new_session=(os.name != 'nt'))
+        return True
+    except OSError:
+        return False
+
+
+_launcher = None
+_launcher_lock = threading.Lock()
+
+
+def get_launcher():
+    """Process-wide launcher, honouring the "browser" setting (BBR_BROWSER)"""
+    global _launcher
+    if _launcher is None:
+        with _launcher_lock:
+            if _launcher is None:
+                _launcher = BrowserLauncher(config.get("browser"))
+    return _launcher
@@ -0,0 +1,116 @@
+"""
+Button grid layout for BigBountyRecon
+Lays technique buttons out in a uniform grid and keeps their text wrapping in
+step with the column width from a single, debounced container resize handler
+"""
+
+
+class ButtonGrid:
+    """Uniform grid of buttons inside a container frame
+
+    Instead of every button reacting to its own <Configure> event, the grid
+    listens to the container only, waits until resizing pauses for
+    debounce_ms, then computes the wraplength once and applies it to all
+    buttons in one pass.
+    """
+
+    def __init__(self, container, columns=12, column_minsize=90, row_minsize=65,
+                 padx=1, debounce_ms=60):
+        self.container = container
+        self.columns = max(1, columns)
+        self.column_minsize = column_minsize
+        self.row_minsize = row_minsize
+        self.padx = padx
+        self.debounce_ms = debounce_ms
+        self.buttons = []
+        self.wraplength = self.wraplength_for(column_minsize)
+        self._rows = 0
+        self._pending = None
+        self._configure_columns(0)
+        container.bind('<Configure>', self._on_configure, add='+')
+
+    def wraplength_for(self, column_width):
+        """Text wrap width for buttons in a column of the given width"""
+        return max(60, column_width - 2 * self.padx - 20)
+
+    def _configure_columns(self, previous):
+        """Give columns [0, columns) equal weight and reset any columns beyond that"""
+        for i in range(self.columns):
+            self.container.columnconfigure(i, weight=1, uniform="button_col", minsize=self.column_minsize)
+        for i in range(self.columns, previous):
+            self.container.columnconfigure(i, weight=0, uniform="", minsize=0)
+
+    def capacity(self, height):
+        """Number of buttons whose rows fit in height pixels at row_minsize (at least one row)"""
+        return max(1, height // self.row_minsize) * self.columns
+
+    def reserve(self, count):
+        """Configure enough rows for count buttons up front, so the layout does not jump while they are added"""
+        rows = (count + self.columns - 1) // self.columns
+        for i in range(self._rows, rows):
+            self.container.rowconfigure(i, weight=1, uniform="button_row", minsize=self.row_minsize)
+        for i in range(rows, self._rows):
+            self.container.rowconfigure(i, weight=0, uniform="", minsize=0)
+        self._rows = rows
+
+    def add(self, button):
+        """Place a button in the next free cell (left to right, top to bottom)"""
+        index = len(self.buttons)
+        self.buttons.append(button)
+        if index // self.columns >= self._rows:
+            self.reserve(index + 1)
+        button.config(wraplength=self.wraplength)
+        button.grid(row=index // self.columns, column=index % self.columns,
+                    padx=self.padx, pady=1, sticky="nsew")
+        return button
+
+    def show(self, buttons, min_rows=0):
+        """Show exactly these buttons, in order, hiding any other placed button
+
+        At least min_rows rows stay configured, so a short list of buttons keeps
+        the normal button size instead of stretching to fill the container.
+        """
+        keep = set(buttons)
+        for button in self.buttons:
+            if button not in keep:
+                button.grid_remove()
+        self.buttons = []
+        self.reserve(max(len(buttons), min_rows * self.columns))
+        for button in buttons:
+            self.add(button)
+
+    def set_columns(self, columns):
+        """Change the number of columns and re-place all buttons"""
+        columns = max(1, columns)
+        if columns == self.columns:
+            return
+        previous = self.columns
+        self.columns = columns
+        self._configure_columns(previous)
+        self.reserve(len(self.buttons))
+        for index, button in enumerate(self.buttons):
+            button.grid_configure(row=index // columns, column=index % columns)
+        self._schedule()
+
+    def _on_configure(self, event):
+        if event.widget is self.container:
+            self._schedule()
+
+    def _schedule(self):
+        """Restart the debounce timer; only the last resize of a burst is applied"""
+        if self._pending is not None:
+            self.container.after_cancel(self._pending)
+        self._pending = self.container.after(self.debounce_ms, self.apply_layout)
+
+    def apply_layout(self):
+        """Recompute the wraplength from the current container width and apply it to all buttons at once"""
+        self._pending = None
+        width = self.container.winfo_width()
+        if width <= 1:
+            return
+        wraplength = self.wraplength_for(width // self.columns)
+        if wraplength == self.wraplength:
+            return
+        self.wraplength = wraplength
+        for button in self.buttons:
+            button.config(wraplength=wraplength)
@@ -0,0 +1,287 @@
+"""
+Local caching proxy for BigBountyRecon
+Serves the data-heavy Wayback CDX and crt.sh URLs from a local cache so repeat
+investigations of the same target load instantly
+
+URLs are routed through the proxy as http://127.0.0.1:<port>/fetch?url=<url>.
+Only hosts with a TTL (the Wayback Machine, crt.sh and any added in
+cache_ttls) are proxied; other URLs get 403, so pages open in the browser
+cannot use the proxy to reach arbitrary or internal addresses.
+Responses are stored zlib-compressed in a single SQLite file, keyed by the
+normalized upstream URL, expire after a per-host TTL and are evicted least
+recently used first when the cache grows past its disk budget.
+"""
+
+import http.client
+import http.server
+import json
+import sqlite3
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+import zlib
+
+import config
+
+# How long cached responses stay fresh, per host (seconds)
+DEFAULT_TTLS = {
+    "web.archive.org": 24 * 3600,
+    "wwwb-dedup.us.archive.org": 24 * 3600,
+    "crt.sh": 6 * 3600,
+}
+
+# TTL for hosts not listed above
+FALLBACK_TTL = 3600
+
+USER_AGENT = "BigBountyRecon"
+
+
+def normalize_url(url):
+    """Cache key for a URL: lowercase scheme and host, no default port or fragment, sorted query"""
+    parts = urllib.parse.urlsplit(url)
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != {"http": 80, "https": 443}.get(scheme):
+        host += f":{parts.port}"
+    query = urllib.parse.urlencode(sorted(urllib.parse.parse_qsl(parts.query, keep_blank_values=True)))
+    return urllib.parse.urlunsplit((scheme, host, parts.path or "/", query, ""))
+
+
+class CacheStore:
+    """Single-file response cache with per-host TTLs and LRU eviction under a size budget"""
+
+    def __init__(self, path, max_bytes=512 * 1024 * 1024, ttls=None):
+        self.max_bytes = max_bytes
+        self.ttls = dict(DEFAULT_TTLS)
+        self.ttls.update(ttls or {})
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.upstream_errors = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY, host TEXT, status INTEGER, content_type TEXT,"
+            " body BLOB, size INTEGER, stored REAL, expires REAL, last_access REAL)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access)")
+        self.total_bytes = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def ttl_for(self, host):
+        return self.ttls.get(host, FALLBACK_TTL)
+
+    def allows(self, url):
+        """Whether url's host is one the proxy caches"""
+        return (urllib.parse.urlsplit(url).hostname or "").lower() in self.ttls
+
+    def get(self, url):
+        """Cached (status, content_type, body) for url, or None on a miss or an expired entry"""
+        key = normalize_url(url)
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT status, content_type, body, expires FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None or row[3] < now:
+                self.misses += 1
+                return None
+            self._db.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            self.hits += 1
+        return row[0], row[1], zlib.decompress(row[2])
+
+    def put(self, url, status, content_type, compressed):
+        """Store an already zlib-compressed body, then evict old entries if over budget"""
+        key = normalize_url(url)
+        host = urllib.parse.urlsplit(key).hostname or ""
+        now = time.time()
+        with self._lock:
+            old = self._db.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, host, status, content_type, compressed, len(compressed), now, now + self.ttl_for(host), now))
+            self.total_bytes += len(compressed) - (old[0] if old else 0)
+            self._evict()
+
+    def _evict(self):
+        """Drop expired entries, then least recently used ones, until the cache fits its budget"""
+        if self.total_bytes <= self.max_bytes:
+            return
+        self._db.execute("DELETE FROM responses WHERE expires < ?", (time.time(),))
+        self.total_bytes = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        while self.total_bytes > self.max_bytes:
+            rows = self._db.execute(
+                "SELECT key, size FROM responses ORDER BY last_access LIMIT 32").fetchall()
+            if not rows:
+                break
+            for key, size in rows:
+                self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self.total_bytes -= size
+                self.evictions += 1
+                if self.total_bytes <= self.max_bytes:
+                    break
+
+    def upstream_failed(self):
+        """Count an upstream request that failed or was cut short"""
+        with self._lock:
+            self.upstream_errors += 1
+
+    def stats(self):
+        with self._lock:
+            entries = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                "upstream_errors": self.upstream_errors, "entries": entries,
+                "bytes": self.total_bytes, "max_bytes": self.max_bytes}
+
+
+class ProxyHandler(http.server.BaseHTTPRequestHandler):
+    """Serves /fetch?url=... from the cache, fetching and storing the response on a miss"""
+
+    server_version = "BigBountyReconCache"
+
+    def do_GET(self):
+        parts = urllib.parse.urlsplit(self.path)
+        if parts.path == "/__stats__":
+            self._send(200, "application/json", json.dumps(self.server.store.stats()).encode())
+            return
+        url = dict(urllib.parse.parse_qsl(parts.query)).get("url")
+        if parts.path != "/fetch" or not url or urllib.parse.urlsplit(url).scheme not in ("http", "https"):
+            self._send(400, "text/plain", b"expected /fetch?url=<http(s) url>")
+            return
+        if not self.server.store.allows(url):
+            self._send(403, "text/plain", b"host is not cached by this proxy")
+            return
+
+        cached = self.server.store.get(url)
+        if cached is not None:
+            status, content_type, body = cached
+            self._send(status, content_type, body, cache="HIT")
+            return
+        self._fetch_and_store(url)
+
+    def _send(self, status, content_type, body, cache=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type or "application/octet-stream")
+        self.send_header("Content-Length", str(len(body)))
+        if cache:
+            self.send_header("X-Cache", cache)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _fetch_and_store(self, url):
+        """Stream the upstream response to the browser while compressing it into the cache"""
+        request = urllib.request.Request(url, headers={"User-Agent": USER_AGENT})
+        try:
+            upstream = urllib.request.urlopen(request, timeout=self.server.timeout)
+        except urllib.error.HTTPError as e:
+            # Errors are passed through but not cached
+            self._send(e.code, e.headers.get("Content-Type"), e.read())
+            return
+        except (urllib.error.URLError, OSError, http.client.HTTPException) as e:
+            self.server.store.upstream_failed()
+            self._send(502, "text/plain", f"upstream failed: {e}".encode())
+            return
+
+        with upstream:
+            content_type = upstream.headers.get("Content-Type")
+            length = upstream.headers.get("Content-Length")
+            expected = int(length) if length and length.isdigit() else None
+            self.send_response(upstream.status)
+            self.send_header("Content-Type", content_type or "application/octet-stream")
+            if expected is not None:
+                # Lets the browser tell a cut-short relay from a complete one
+                self.send_header("Content-Length", str(expected))
+            self.send_header("X-Cache", "MISS")
+            self.send_header("Connection", "close")
+            self.end_headers()
+
+            compressor = zlib.compressobj(6)
+            compressed = []
+            compressed_size = 0
+            max_entry = self.server.store.max_bytes // 4
+            received = 0
+            while True:
+                try:
+                    data = upstream.read(65536)
+                except (http.client.HTTPException, OSError):
+                    # IncompleteRead, a reset or a timeout: relay what arrived, cache nothing
+                    compressed = None
+                    self.server.store.upstream_failed()
+                    break
+                if not data:
+                    if expected is not None and received != expected:
+                        compressed = None
+                        self.server.store.upstream_failed()
+                    break
+                received += len(data)
+                self.wfile.write(data)
+                if compressed is not None:
+                    piece = compressor.compress(data)
+                    compressed.append(piece)
+                    compressed_size += len(piece)
+                    if compressed_size > max_entry:
+                        # Too big to cache within budget, keep streaming only
+                        compressed = None
+            if compressed is not None:
+                compressed.append(compressor.flush())
+                self.server.store.put(url, upstream.status, content_type, b"".join(compressed))
+
+    def log_message(self, format, *args):
+        pass
+
+
+class CachingProxy(http.server.ThreadingHTTPServer):
+    """Local caching proxy server bound to 127.0.0.1"""
+
+    daemon_threads = True
+
+    def __init__(self, store, port=0, timeout=120):
+        super().__init__(("127.0.0.1", port), ProxyHandler)
+        self.store = store
+        self.timeout = timeout
+
+    @property
+    def port(self):
+        return self.server_address[1]
+
+    def proxied_url(self, url):
+        """URL that fetches url through this proxy"""
+        return f"http://127.0.0.1:{self.port}/fetch?" + urllib.parse.urlencode({"url": url})
+
+    def upstream_url(self, url):
+        """The URL a proxied_url() fetches; other URLs are returned unchanged"""
+        prefix = f"http://127.0.0.1:{self.port}/fetch?"
+        if not url.startswith(prefix):
+            return url
+        return dict(urllib.parse.parse_qsl(url[len(prefix):])).get("url", url)
+
+
+def open_store():
+    """Cache store at ~/.bigbountyrecon/cache.sqlite3 with the configured budget and TTLs"""
+    ttls = config.get("cache_ttls")
+    if isinstance(ttls, str):
+        try:
+            ttls = json.loads(ttls)
+        except ValueError:
+            ttls = None
+    max_bytes = config.get_int("cache_max_mb", 512) * 1024 * 1024
+    return CacheStore(config.state_path("cache.sqlite3"), max_bytes, ttls if isinstance(ttls, dict) else None)
+
+
+_proxy = None
+_proxy_lock = threading.Lock()
+
+
+def get_proxy():
+    """Process-wide proxy, started in a background thread on first use; None unless BBR_CACHE_PROXY=1"""
+    global _proxy
+    if not config.get_bool("cache_proxy", False):
+        return None
+    if _proxy is None:
+        with _proxy_lock:
+            if _proxy is None:
+                proxy = CachingProxy(open_store(), config.get_int("cache_proxy_port", 0))
+                threading.Thread(target=proxy.serve_forever, name="bbr-cache-proxy", daemon=True).start()
+                _proxy = proxy
+    return _proxy
@@ -0,0 +1,184 @@
+"""
+Wayback Machine CDX client for BigBountyRecon
+Streams CDX API results page by page to disk instead of opening them in a browser tab
+
+The query parameters come from the Wayback techniques in the registry
+(wordpress_wayback, swf_wayback, swf_wayback_mime), so results match what
+the browser would show, but they are fetched in pages using CDX resume keys.
+"""
+
+import collections
+import http.client
+import os
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+
+import metrics
+import techniques
+from rate_limiter import get_limiter
+
+# Techniques whose URL is a CDX API query
+CDX_TECHNIQUES = ("wordpress_wayback", "swf_wayback", "swf_wayback_mime")
+
+# Fields returned by the CDX API when the query has no fl= parameter
+DEFAULT_FIELDS = ("urlkey", "timestamp", "original", "mimetype", "statuscode", "digest", "length")
+
+USER_AGENT = "BigBountyRecon"
+
+
+class CdxError(Exception):
+    """A CDX request failed after all retries"""
+
+
+class ResumeKey(str):
+    """Resume key at the end of a CDX page, marking that there is a next page"""
+
+
+def technique_query(technique_id, domain, base_url=None):
+    """Split a CDX technique's URL for domain into (endpoint, params)
+
+    base_url replaces the scheme/host/path, e.g. to use web.archive.org
+    instead of the dedup host or a local stand-in server.
+    """
+    if technique_id not in CDX_TECHNIQUES:
+        raise ValueError(f"{technique_id} is not a CDX technique")
+    parts = urllib.parse.urlsplit(techniques.get(technique_id).url(domain))
+    params = [(key, value) for key, value in urllib.parse.parse_qsl(parts.query, keep_blank_values=True)
+              if key not in ("limit", "xx", "showResumeKey", "resumeKey")]
+    endpoint = base_url or urllib.parse.urlunsplit((parts.scheme, parts.netloc, parts.path, "", ""))
+    return endpoint, params
+
+
+def record_type(params):
+    """Namedtuple type for the fields a query returns"""
+    fields = dict(params).get("fl")
+    names = tuple(fields.split(",")) if fields else DEFAULT_FIELDS
+    return collections.namedtuple("CdxRecord", names)
+
+
+def parse_page(lines, record):
+    """Parse one page of CDX text output
+
+    Yields records, then a final ResumeKey if the page ended with a resume
+    key (a blank line followed by the key).
+    """
+    blank_seen = False
+    for raw in lines:
+        line = raw.decode("utf-8", "replace").rstrip("\r\n")
+        if not line:
+            blank_seen = True
+            continue
+        if blank_seen:
+            yield ResumeKey(urllib.parse.unquote(line.strip()))
+            return
+        values = line.split(" ", len(record._fields) - 1)
+        if len(values) == len(record._fields):
+            yield record(*values)
+
+
+class CdxClient:
+    """Fetches a CDX query page by page
+
+    Each page is read completely before its records are yielded; a page that
+    fails or arrives cut short is fetched again with the same resume key.
+    """
+
+    def __init__(self, page_size=5000, timeout=60, retries=3):
+        self.page_size = page_size
+        self.timeout = timeout
+        self.retries = retries
+
+    def _read(self, url):
+        """Body of a page, read completely, retrying transient failures with backoff"""
+        limiter = get_limiter()
+        for attempt in range(self.retries + 1):
+            if limiter is not None:
+                limiter.acquire(url)
+            metrics.count("fetches", "cdx")
+            try:
+                request = urllib.request.Request(url, headers={"User-Agent": USER_AGENT})
+                with metrics.timed("fetch", "cdx"):
+                    with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                        body = response.read()
+                        length = response.headers.get("Content-Length")
+                if length is not None and length.isdigit() and len(body) < int(length):
+                    raise http.client.IncompleteRead(body, int(length) - len(body))
+                # Text output ends every line, the resume key included, with a newline
+                if body and not body.endswith(b"\n"):
+                    raise http.client.IncompleteRead(body)
+                return body
+            except urllib.error.HTTPError as e:
+                metrics.count("fetch_errors", "cdx")
+                if e.code < 500 and e.code != 429 or attempt == self.retries:
+                    raise CdxError(f"CDX request failed: HTTP {e.code} for {url}")
+            except (urllib.error.URLError, OSError, http.client.HTTPException) as e:
+                metrics.count("fetch_errors", "cdx")
+                if attempt == self.retries:
+                    if isinstance(e, http.client.IncompleteRead):
+                        e = "response cut short"
+                    raise CdxError(f"CDX request failed: {e} for {url}")
+            time.sleep(2 ** attempt)
+
+    def iter_records(self, endpoint, params, resume_key=None, on_resume_key=None):
+        """Yield records for a query, following resume keys until the last page
+
+        on_resume_key(key) is called after each page that has a next page,
+        so callers can persist it and resume an interrupted fetch.
+        """
+        record = record_type(params)
+        while True:
+            query = list(params) + [("limit", str(self.page_size)), ("showResumeKey", "true")]
+            if resume_key:
+                query.append(("resumeKey", resume_key))
+            url = endpoint + "?" + urllib.parse.urlencode(query)
+
+            resume_key = None
+            for item in parse_page(self._read(url).splitlines(keepends=True), record):
+                if isinstance(item, ResumeKey):
+                    resume_key = item
+                else:
+                    yield item
+            if not resume_key:
+                return
+            if on_resume_key is not None:
+                on_resume_key(resume_key)
+
+
+def fetch_to_file(technique_id, domain, output, base_url=None, page_size=5000, max_records=None, resume=False):
+    """Fetch a CDX technique's results for domain into output as tab-separated lines
+
+    The resume key of the last completed page and the output size at that
+    point are kept in output + ".resume" and removed when the fetch
+    completes; with resume=True an interrupted fetch drops any partly
+    written page and continues from there. Returns the number of records
+    written by this call.
+    """
+    endpoint, params = technique_query(technique_id, domain, base_url)
+    resume_file = output + ".resume"
+    resume_key = None
+    mode = "w"
+    if resume and os.path.exists(resume_file) and os.path.exists(output):
+        with open(resume_file, "r", encoding="utf-8") as f:
+            size, _, resume_key = f.read().strip().partition("\t")
+        with open(output, "r+b") as f:
+            f.truncate(int(size))
+        mode = "a"
+
+    written = 0
+    client = CdxClient(page_size=page_size)
+    with open(output, mode, encoding="utf-8", newline="\n") as out:
+        def save_resume_key(key):
+            out.flush()
+            with open(resume_file, "w", encoding="utf-8") as f:
+                f.write(f"{out.tell()}\t{key}")
+
+        for record in client.iter_records(endpoint, params, resume_key or None, save_resume_key):
+            out.write("\t".join(record) + "\n")
+            written += 1
+            if max_records and written >= max_records:
+                return written
+    if os.path.exists(resume_file):
+        os.remove(resume_file)
+    return written
@@ -0,0 +1,251 @@
+"""
+Wayback CDX analyzer for BigBountyRecon
+Reads CDX output (the text the Wayback techniques return, or a file written
+by the cdx command) as a stream and summarizes it: unique URLs, what kind of
+file or endpoint each one is, and the most common extensions, parameters and
+status codes
+
+Memory use is fixed by the budget given, whatever the input size: URLs are
+deduplicated by urlkey with a Bloom filter sized to the budget (so a small
+share of distinct URLs may be counted as duplicates; the expected rate is
+reported), and the top lists are kept approximately by pruning the rarest
+entries whenever they grow past twice their size.
+"""
+
+import hashlib
+import json
+import math
+import re
+import sys
+import urllib.parse
+import urllib.request
+
+DEFAULT_MEMORY = 32 * 1024 * 1024
+
+# Categories a URL can fall into, checked in this order; a URL can be in several
+CATEGORIES = ("backup", "config", "database", "log", "swf", "wordpress", "document", "dynamic", "api",
+              "parameters")
+
+EXTENSIONS = {
+    "backup": {"bak", "bkp", "bkf", "old", "orig", "backup", "save", "swp", "tmp", "zip", "tar", "gz", "tgz",
+               "7z", "rar", "bz2"},
+    "config": {"conf", "cfg", "cnf", "ini", "env", "yml", "yaml", "properties", "config", "reg", "inf",
+               "htaccess", "htpasswd", "rdp", "ora"},
+    "database": {"sql", "db", "sqlite", "sqlite3", "mdb", "dbf"},
+    "log": {"log"},
+    "swf": {"swf"},
+    "document": {"pdf", "doc", "docx", "xls", "xlsx", "csv", "ppt", "pptx", "pps", "odt", "rtf", "txt"},
+    "dynamic": {"php", "asp", "aspx", "jsp", "jspx", "cgi", "pl", "do", "action", "cfm"},
+}
+
+PATH_PATTERNS = {
+    "backup": re.compile(r"(~|\.(bak|old|orig|save|swp)\.[a-z0-9]+)$"),
+    "config": re.compile(r"(^|/)(\.env|web\.config|wp-config\.php|config\.(json|js|php)|\.git/config)$"),
+    "wordpress": re.compile(r"/(wp-(content|admin|includes|json|login\.php|config)|xmlrpc\.php)"),
+    "api": re.compile(r"/(api|rest|graphql|v[0-9]+)(/|$)|\.(json|wsdl|asmx|svc)$"),
+}
+
+_WWW = re.compile(r"^www[0-9]*\.")
+
+
+class BloomFilter:
+    """Fixed-size set membership test with no false negatives and a small false positive rate"""
+
+    def __init__(self, size_bytes, expected=1000000):
+        self.bits = max(64, size_bytes * 8)
+        self.array = bytearray(self.bits // 8)
+        # Number of hashes that minimizes false positives at the expected item count, capped for speed
+        self.hashes = max(1, min(8, round(self.bits / max(1, expected) * math.log(2))))
+        self.count = 0
+
+    def add(self, key):
+        """Add a key, returning False if it was (probably) already present"""
+        digest = hashlib.blake2b(key.encode("utf-8", "surrogateescape"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        array = self.array
+        bits = self.bits
+        new = False
+        for i in range(self.hashes):
+            position = (h1 + i * h2) % bits
+            byte, mask = position >> 3, 1 << (position & 7)
+            if not array[byte] & mask:
+                array[byte] |= mask
+                new = True
+        if new:
+            self.count += 1
+        return new
+
+    def false_positive_rate(self):
+        """Expected false positive rate at the current number of keys"""
+        return (1 - math.exp(-self.hashes * self.count / self.bits)) ** self.hashes
+
+
+class TopCounter:
+    """Approximate most-common counts in bounded memory
+
+    Holds at most 2 * size keys; past that the rarest are dropped, so counts
+    of keys that were dropped and came back are lower bounds.
+    """
+
+    def __init__(self, size=25):
+        self.size = size
+        self.counts = {}
+
+    def add(self, key, n=1):
+        counts = self.counts
+        counts[key] = counts.get(key, 0) + n
+        if len(counts) > 2 * self.size:
+            keep = sorted(counts.items(), key=lambda item: -item[1])[:self.size]
+            self.counts = dict(keep)
+
+    def most_common(self):
+        return sorted(self.counts.items(), key=lambda item: (-item[1], item[0]))[:self.size]
+
+
+def url_key(url):
+    """Deduplication key of a URL, like the CDX urlkey: no scheme, www or default port, lowercase"""
+    key = url.strip().lower()
+    scheme, sep, rest = key.partition("://")
+    if sep:
+        key = rest
+    key = key.split("#", 1)[0]
+    host, slash, path = key.partition("/")
+    host = _WWW.sub("", host.rpartition("@")[2])
+    if host.endswith((":80", ":443")):
+        host = host.rpartition(":")[0]
+    return host + slash + path
+
+
+def parse_line(line):
+    """(urlkey, original url, status code) of one CDX line, or None if it has no URL
+
+    Handles the default 7-field output (urlkey timestamp original mimetype
+    statuscode digest length), fl= output starting with the original URL,
+    and the tab-separated files written by the cdx command.
+    """
+    fields = line.split()
+    if not fields:
+        return None
+    if len(fields) >= 3 and ")" in fields[0] and "://" in fields[2]:
+        status = fields[4] if len(fields) >= 5 and fields[4].isdigit() else None
+        return fields[0], fields[2], status
+    for field in fields:
+        if "://" in field or "/" in field:
+            return url_key(field), field, None
+    return None
+
+
+def classify(url):
+    """Categories of a URL from its extension, path and query"""
+    rest = url.partition("://")[2] or url
+    path, _, query = rest.partition("?")
+    path = path.split("#", 1)[0]
+    slash = path.find("/")
+    path = urllib.parse.unquote(path[slash:] if slash >= 0 else "/").lower()
+    name = path.rpartition("/")[2]
+    extension = name.rpartition(".")[2] if "." in name else ""
+    categories = []
+    for category in CATEGORIES:
+        if category == "parameters":
+            if query:
+                categories.append(category)
+            continue
+        if extension in EXTENSIONS.get(category, ()):
+            categories.append(category)
+            continue
+        pattern = PATH_PATTERNS.get(category)
+        if pattern is not None and pattern.search(path):
+            categories.append(category)
+    return categories, extension, query
+
+
+class CdxAnalyzer:
+    """Streaming CDX summary within a fixed memory budget"""
+
+    def __init__(self, memory=DEFAULT_MEMORY, expected=1000000, samples=10, top=25):
+        self.seen = BloomFilter(memory, expected)
+        self.samples = samples
+        self.lines = 0
+        self.malformed = 0
+        self.duplicates = 0
+        self.unique = 0
+        self.categories = dict.fromkeys(CATEGORIES, 0)
+        self.examples = {category: [] for category in CATEGORIES}
+        self.extensions = TopCounter(top)
+        self.parameters = TopCounter(top)
+        self.paths = TopCounter(top)
+        self.statuses = TopCounter(top)
+
+    def add(self, line):
+        """Add one CDX line; returns the original URL if it is new, else None"""
+        self.lines += 1
+        parsed = parse_line(line)
+        if parsed is None:
+            self.malformed += 1
+            return None
+        key, url, status = parsed
+        if status is not None:
+            self.statuses.add(status)
+        if not self.seen.add(key):
+            self.duplicates += 1
+            return None
+        self.unique += 1
+        categories, extension, query = classify(url)
+        for category in categories:
+            self.categories[category] += 1
+            examples = self.examples[category]
+            if len(examples) < self.samples:
+                examples.append(url)
+        if extension:
+            self.extensions.add(extension)
+        if query:
+            for name in {pair.partition("=")[0] for pair in query.split("&") if pair}:
+                self.parameters.add(urllib.parse.unquote_plus(name)[:100])
+        first_segment = url.partition("://")[2].partition("/")[2].partition("/")[0].partition("?")[0]
+        self.paths.add("/" + first_segment[:100])
+        return url
+
+    def summary(self):
+        return {
+            "lines": self.lines,
+            "unique_urls": self.unique,
+            "duplicates": self.duplicates,
+            "malformed": self.malformed,
+            "dedup_false_positive_rate": round(self.seen.false_positive_rate(), 6),
+            "categories": self.categories,
+            "examples": {category: urls for category, urls in self.examples.items() if urls},
+            "top_extensions": self.extensions.most_common(),
+            "top_parameters": self.parameters.most_common(),
+            "top_paths": self.paths.most_common(),
+            "status_codes": self.statuses.most_common(),
+        }
+
+
+def open_source(source, timeout=60):
+    """Binary line stream for a file path, "-" (stdin) or an http(s) URL such as a local CDX stand-in"""
+    if source.startswith(("http://", "https://")):
+        request = urllib.request.Request(source, headers={"User-Agent": "BigBountyRecon"})
+        return urllib.request.urlopen(request, timeout=timeout)
+    if source == "-":
+        return sys.stdin.buffer
+    return open(source, "rb")
+
+
+def analyze(lines, memory=DEFAULT_MEMORY, expected=1000000, on_unique=None, samples=10, top=25):
+    """Analyze an iterable of CDX lines (bytes or str); returns the summary dict
+
+    on_unique(url) is called for every URL seen for the first time.
+    """
+    analyzer = CdxAnalyzer(memory, expected, samples, top)
+    for line in lines:
+        if isinstance(line, bytes):
+            line = line.decode("utf-8", "replace")
+        url = analyzer.add(line)
+        if url is not None and on_unique is not None:
+            on_unique(url)
+    return analyzer.summary()
+
+
+def to_json(summary):
+    return json.dumps(summary, indent=2)
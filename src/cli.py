@@ -0,0 +1,691 @@
+"""
+BigBountyRecon - headless command line
+Generates technique URLs for domain lists without Tkinter or a browser
+
+Usage:
+    python src/cli.py urls domains.txt > urls.jsonl
+    cat domains.txt | python src/cli.py urls --format csv -t ct_logs -t github
+    python src/cli.py urls --pack domains.txt > packed.jsonl
+    python src/cli.py urls -f compact -o scope.bbru scope.txt
+    python src/cli.py compact scope.bbru > urls.jsonl
+    python src/cli.py import ghdb.json my-dorks.csv
+    python src/cli.py report scope.txt --html report.html --json report.json
+    python src/cli.py normalize --apex scope.txt > apexes.txt
+    python src/cli.py --metrics fetch.prom fetch -i hosts.txt > checks.jsonl
+    python src/cli.py fanout tesla.com --open --skip-checked --max-age 7
+    python src/cli.py history tesla.com
+    python src/cli.py serve --port 8765
+    python src/cli.py cdx-analyze swf.tsv --unique swf-unique.txt > swf-summary.json
+    python src/cli.py cdx tesla.com -t swf_wayback -o swf.tsv
+    python src/cli.py ct tesla.com spacex.com > subdomains.tsv
+    python src/cli.py refresh -i monitored.txt -o new.tsv
+    python src/cli.py fanout tesla.com --depth 2 -t directory_listing -t configuration_files > sweep.jsonl
+    python src/cli.py fetch -i hosts.txt -c 100 > checks.jsonl
+"""
+
+import argparse
+import csv
+import functools
+import itertools
+import json
+import multiprocessing
+import sys
+import time
+
+import api_server
+import cache_proxy
+import cdx
+import cdx_analyze
+import compact_export
+import config
+import ct_harvest
+import domain_normalize
+import dork_packer
+import fanout
+import history
+import metrics
+import refresh
+import report_export
+import site_fetch
+import technique_store
+import techniques
+
+# Sources the refresh command can update
+REFRESH_SOURCES = cdx.CDX_TECHNIQUES + (refresh.CT_SOURCE,)
+
+
+def read_domains(stream):
+    """Yield domains from a text stream one at a time, skipping blank lines and # comments"""
+    for line in stream:
+        domain = line.strip()
+        if domain and not domain.startswith("#"):
+            yield domain
+
+
+def normalized_domains(source, normalizer):
+    """Domains of a text stream, normalized (and deduplicated, if it does that) by normalizer"""
+    return normalizer(read_domains(source))
+
+
+def print_skipped(normalizer):
+    """Report entries dropped by a Normalizer on stderr"""
+    for error in normalizer.errors:
+        print(f"Skipped {error}", file=sys.stderr)
+    if normalizer.invalid > len(normalizer.errors):
+        print(f"... {normalizer.invalid - len(normalizer.errors)} more invalid entries", file=sys.stderr)
+    if normalizer.invalid or normalizer.duplicates:
+        print(f"{normalizer.invalid} invalid and {normalizer.duplicates} duplicate entries skipped",
+              file=sys.stderr)
+
+
+def select_techniques(names):
+    """Techniques for the given names, built-in or imported, or all built-in ones if no names are given
+
+    Returns (techniques, names not found).
+    """
+    if not names:
+        return techniques.TECHNIQUES, []
+    catalogue = technique_store.load_catalogue()
+    selected = [catalogue.get(name) for name in names]
+    return selected, [name for name, technique in zip(names, selected) if technique is None]
+
+
+def generate_records(domains, selected=techniques.TECHNIQUES):
+    """Yield (domain, technique, url) for every domain and technique, one domain at a time"""
+    for domain in domains:
+        for technique, url in techniques.render_all(domain, selected):
+            yield domain, technique.id, url
+
+
+def generate_packed_records(domains, selected=techniques.TECHNIQUES, totals=None):
+    """Like generate_records, with each domain's Google queries packed into fewer searches
+
+    The technique field lists every technique a URL covers, joined with "+".
+    totals, if given, is a list [original, packed] updated as domains are processed.
+    """
+    for domain in domains:
+        result = dork_packer.pack(techniques.render_all(domain, selected))
+        if totals is not None:
+            totals[0] += result.original
+            totals[1] += len(result.queries)
+        for query in result.queries:
+            yield domain, "+".join(query.technique_ids), query.url
+
+
+def write_records(records, out, fmt):
+    """Write records to out as JSON lines or CSV, returning the number written"""
+    count = 0
+    if fmt == "csv":
+        writer = csv.writer(out)
+        writer.writerow(["domain", "technique", "url"])
+        for record in records:
+            writer.writerow(record)
+            count += 1
+    else:
+        for domain, technique, url in records:
+            out.write(json.dumps({"domain": domain, "technique": technique, "url": url}) + "\n")
+            count += 1
+    return count
+
+
+def open_input(path):
+    """Open an input file, or stdin for "-" """
+    if path == "-":
+        return sys.stdin
+    return open(path, "r", encoding="utf-8")
+
+
+def open_output(path):
+    """Open an output file, or stdout for "-" """
+    if path == "-":
+        return sys.stdout
+    return open(path, "w", encoding="utf-8", newline="")
+
+
+def cmd_urls(args):
+    """Generate technique URLs for every domain in the input"""
+    selected, unknown = select_techniques(args.technique)
+    if unknown:
+        print(f"Unknown technique(s): {', '.join(unknown)}", file=sys.stderr)
+        return 2
+
+    if args.format == "compact":
+        return write_compact(args, selected)
+
+    source = open_input(args.input)
+    out = open_output(args.output)
+    normalizer = domain_normalize.Normalizer(dedup=args.dedup)
+    totals = [0, 0]
+    if args.pack:
+        records = generate_packed_records(normalized_domains(source, normalizer), selected, totals)
+    else:
+        records = generate_records(normalized_domains(source, normalizer), selected)
+    try:
+        write_records(records, out, args.format)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if out is not sys.stdout:
+            out.close()
+    print_skipped(normalizer)
+    if args.pack:
+        print(f"{totals[1]} requests instead of {totals[0]} ({totals[0] - totals[1]} saved)", file=sys.stderr)
+    return 0
+
+
+def write_compact(args, selected):
+    """urls -f compact: write a dictionary-encoded .bbru file instead of text"""
+    if args.output == "-":
+        print("The compact format needs an output file: give -o FILE", file=sys.stderr)
+        return 2
+    if args.pack:
+        print("--pack cannot be used with the compact format", file=sys.stderr)
+        return 2
+    source = open_input(args.input)
+    normalizer = domain_normalize.Normalizer(dedup=args.dedup)
+    try:
+        domains, rows = compact_export.export(normalized_domains(source, normalizer), args.output, selected)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+    print_skipped(normalizer)
+    print(f"{rows} URLs for {domains} domains written to {args.output}", file=sys.stderr)
+    return 0
+
+
+def cmd_compact(args):
+    """Convert a compact .bbru export back to JSON lines or CSV, or print single rows"""
+    try:
+        reader = compact_export.CompactReader(args.input)
+    except (OSError, ValueError) as e:
+        print(f"Cannot read {args.input}: {e}", file=sys.stderr)
+        return 1
+    out = open_output(args.output)
+    try:
+        if args.row:
+            try:
+                records = [reader[index] for index in args.row]
+            except IndexError:
+                print(f"{args.input} has {len(reader)} rows", file=sys.stderr)
+                return 2
+        else:
+            records = reader
+        write_records(records, out, args.format)
+    finally:
+        reader.close()
+        if out is not sys.stdout:
+            out.close()
+    return 0
+
+
+def cmd_report(args):
+    """Write HTML and/or JSON reports with every technique URL for every domain in the input"""
+    if not args.html and not args.json:
+        print("Give --html and/or --json", file=sys.stderr)
+        return 2
+    selected, unknown = select_techniques(args.technique)
+    if unknown:
+        print(f"Unknown technique(s): {', '.join(unknown)}", file=sys.stderr)
+        return 2
+
+    source = open_input(args.input)
+    normalizer = domain_normalize.Normalizer(dedup=args.dedup)
+    html_out = open(args.html, "w", encoding="utf-8") if args.html else None
+    json_out = open(args.json, "w", encoding="utf-8") if args.json else None
+    try:
+        domains, urls = report_export.export(normalized_domains(source, normalizer), html_out, json_out, selected,
+                                             workers=args.workers, chunk_size=args.chunk_size, title=args.title)
+    finally:
+        for stream in (html_out, json_out):
+            if stream is not None:
+                stream.close()
+        if source is not sys.stdin:
+            source.close()
+    print_skipped(normalizer)
+    print(f"{domains} domains, {urls} URLs written", file=sys.stderr)
+    return 0
+
+
+def cmd_normalize(args):
+    """Clean up a scope list: bare lowercase IDNA host names (or apex domains), each once"""
+    source = open_input(args.input)
+    out = open_output(args.output)
+    normalizer = domain_normalize.Normalizer(to_apex=args.apex)
+    written = 0
+    try:
+        for domain in normalized_domains(source, normalizer):
+            out.write(domain + "\n")
+            written += 1
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if out is not sys.stdout:
+            out.close()
+    print_skipped(normalizer)
+    print(f"{written} domains written", file=sys.stderr)
+    return 0
+
+
+def cmd_techniques(args):
+    """List the available technique names, built-in and imported"""
+    for technique in technique_store.load_catalogue():
+        print(f"{technique.id}\t{technique.category}\t{technique.description}")
+    return 0
+
+
+def cmd_import(args):
+    """Import dork collections into the technique store"""
+    status = 0
+    for path in args.files:
+        try:
+            added, duplicates, invalid = technique_store.import_file(path, args.format, default_category=args.category)
+        except (OSError, ValueError) as e:
+            print(f"{path}: {e}", file=sys.stderr)
+            status = 1
+            continue
+        print(f"{path}: {added} added, {duplicates} duplicates skipped, {invalid} without a usable dork",
+              file=sys.stderr)
+    return status
+
+
+def cmd_cdx(args):
+    """Fetch Wayback CDX results for a domain to a file"""
+    try:
+        written = cdx.fetch_to_file(args.technique, args.domain, args.output, base_url=args.base_url,
+                                    page_size=args.page_size, max_records=args.max_records, resume=args.resume)
+    except cdx.CdxError as e:
+        print(e, file=sys.stderr)
+        return 1
+    print(f"{written} records written to {args.output}", file=sys.stderr)
+    return 0
+
+
+def cmd_cdx_analyze(args):
+    """Summarize CDX output (file, stdin or URL) in bounded memory"""
+    try:
+        source = cdx_analyze.open_source(args.source)
+    except (OSError, ValueError) as e:
+        print(f"Cannot read {args.source}: {e}", file=sys.stderr)
+        return 1
+    unique = open(args.unique, "w", encoding="utf-8") if args.unique else None
+    try:
+        summary = cdx_analyze.analyze(source, args.memory_mb * 1024 * 1024, args.expected,
+                                      (lambda url: unique.write(url + "\n")) if unique else None,
+                                      args.samples, args.top)
+    finally:
+        if unique is not None:
+            unique.close()
+        if source is not sys.stdin.buffer:
+            source.close()
+    out = open_output(args.output)
+    try:
+        out.write(cdx_analyze.to_json(summary) + "\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    print(f"{summary['lines']} lines, {summary['unique_urls']} unique URLs", file=sys.stderr)
+    return 0
+
+
+def cmd_ct(args):
+    """Harvest subdomains for domains from Certificate Transparency logs (crt.sh)"""
+    normalizer = domain_normalize.Normalizer()
+    domains = list(normalizer(args.domains))
+    if args.input:
+        source = open_input(args.input)
+        try:
+            domains.extend(normalized_domains(source, normalizer))
+        finally:
+            if source is not sys.stdin:
+                source.close()
+    print_skipped(normalizer)
+
+    harvester = ct_harvest.harvest(domains, concurrency=args.concurrency, base_url=args.base_url)
+    out = open_output(args.output)
+    try:
+        if args.format == "json":
+            json.dump({apex: sorted(names) for apex, names in harvester.subdomains.items()}, out, indent=2)
+            out.write("\n")
+        else:
+            for apex, names in harvester.subdomains.items():
+                for name in sorted(names):
+                    out.write(f"{apex}\t{name}\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    for apex, error in harvester.errors.items():
+        print(f"{apex}: {error}", file=sys.stderr)
+    return 1 if harvester.errors else 0
+
+
+def cmd_refresh(args):
+    """Fetch only the CDX captures and CT certificates newer than the last refresh, printing what is new"""
+    sources = list(dict.fromkeys(args.source or REFRESH_SOURCES))
+    normalizer = domain_normalize.Normalizer()
+    domains = list(normalizer(args.domains))
+    if args.input:
+        source = open_input(args.input)
+        try:
+            domains.extend(normalized_domains(source, normalizer))
+        finally:
+            if source is not sys.stdin:
+                source.close()
+    print_skipped(normalizer)
+    if not domains:
+        print("Give domains or -i FILE", file=sys.stderr)
+        return 2
+
+    store = refresh.get_store()
+    if args.reset:
+        for domain in domains:
+            for name in sources:
+                store.forget(domain, name)
+    out = open_output(args.output)
+    results = []
+    try:
+        def emit(result):
+            results.append(result)
+            for item in result.new:
+                out.write(f"{result.domain}\t{result.source}\t{item}\n")
+            out.flush()
+
+        for domain in domains:
+            for name in sources:
+                if name != refresh.CT_SOURCE:
+                    emit(refresh.refresh_cdx(store, name, domain, base_url=args.cdx_base_url,
+                                             page_size=args.page_size))
+        if refresh.CT_SOURCE in sources:
+            for result in refresh.refresh_ct(store, domains, base_url=args.ct_base_url,
+                                             concurrency=args.concurrency):
+                emit(result)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    for result in results:
+        since = f"since {result.previous}" if result.previous else "full fetch"
+        status = f"error: {result.error}" if result.error else f"{result.fetched} fetched, {len(result.new)} new"
+        print(f"{result.domain} {result.source} ({since}): {status}", file=sys.stderr)
+    return 1 if any(result.error for result in results) else 0
+
+
+def cmd_fanout(args):
+    """Discover subdomains of a seed domain and run techniques across all of them"""
+    selected, unknown = select_techniques(args.technique)
+    if unknown:
+        print(f"Unknown technique(s): {', '.join(unknown)}", file=sys.stderr)
+        return 2
+    try:
+        domain = domain_normalize.normalize(args.domain)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+
+    sources = [functools.partial(fanout.ct_source, base_url=args.base_url)]
+    since = history.max_age_since(args.max_age)
+    if args.open:
+        # Imported here so the other commands never load the browser machinery
+        import recon_searches
+        sweep, hosts = recon_searches.sweep_subdomains(domain, selected, args.depth, args.max_hosts,
+                                                       config.get_int("batch_window", 0), sources,
+                                                       args.skip_checked, since)
+        print(f"{hosts} hosts swept", file=sys.stderr)
+    else:
+        sweep = fanout.FanoutSweep(domain, selected, max_depth=args.depth, max_hosts=args.max_hosts,
+                                   sources=sources)
+        runs = history.get_history() if args.skip_checked else None
+        checked = {}
+        out = open_output(args.output)
+        try:
+            for item in sweep.items():
+                if runs is not None:
+                    if item.host not in checked:
+                        checked = {item.host: runs.checked(item.host, since)}
+                    if item.technique.id in checked[item.host]:
+                        continue
+                out.write(json.dumps({"host": item.host, "depth": item.depth,
+                                      "technique": item.technique.id, "url": item.url}) + "\n")
+        finally:
+            if out is not sys.stdout:
+                out.close()
+    for error in sweep.errors:
+        print(error, file=sys.stderr)
+    return 1 if sweep.errors else 0
+
+
+def cmd_history(args):
+    """Show the most recent technique runs, optionally for one domain"""
+    runs = history.get_history()
+    if runs is None:
+        print("Run history is turned off (BBR_HISTORY=0)", file=sys.stderr)
+        return 1
+    domain = None
+    if args.domain:
+        try:
+            domain = domain_normalize.normalize(args.domain)
+        except ValueError as e:
+            print(e, file=sys.stderr)
+            return 2
+    for domain, technique, url, run_at, outcome in runs.runs(domain, args.limit):
+        print(json.dumps({"domain": domain, "technique": technique, "url": url,
+                          "run_at": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(run_at)),
+                          "outcome": outcome}))
+    return 0
+
+
+def cmd_fetch(args):
+    """Fetch robots.txt and crossdomain.xml and grade security headers for many hosts"""
+    hosts = list(args.hosts)
+    source = open_input(args.input) if args.input else None
+    if source is not None:
+        hosts = itertools.chain(hosts, read_domains(source))
+    out = open_output(args.output)
+
+    def write_result(record):
+        out.write(json.dumps(record) + "\n")
+        out.flush()
+
+    try:
+        fetcher = site_fetch.fetch(hosts, write_result, checks=args.check or site_fetch.CHECKS,
+                                   concurrency=args.concurrency, per_host=args.per_host,
+                                   timeout=args.timeout, scheme=args.scheme)
+    finally:
+        if source is not None and source is not sys.stdin:
+            source.close()
+        if out is not sys.stdout:
+            out.close()
+    print(f"{fetcher.pool.opened} connections opened, {fetcher.pool.reused} requests on reused connections",
+          file=sys.stderr)
+    return 0
+
+
+def cmd_proxy(args):
+    """Run the local caching proxy in the foreground"""
+    proxy = cache_proxy.CachingProxy(cache_proxy.open_store(), args.port)
+    print(f"Caching proxy listening on http://127.0.0.1:{proxy.port}/fetch?url=<url>", file=sys.stderr)
+    try:
+        proxy.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    print(json.dumps(proxy.store.stats()), file=sys.stderr)
+    return 0
+
+
+def cmd_serve(args):
+    """Run the local HTTP/JSON API in the foreground"""
+    def ready(server):
+        print(f"API listening on http://{args.host}:{server.port}/ (endpoints: "
+              f"{', '.join(api_server.ENDPOINTS)})", file=sys.stderr)
+    server = api_server.serve(args.host, args.port, args.allow_open, ready)
+    print(f"{server.requests} requests served", file=sys.stderr)
+    return 0
+
+
+def build_parser():
+    """Build the argument parser with one sub-command per headless mode"""
+    parser = argparse.ArgumentParser(prog="bigbountyrecon", description="BigBountyRecon headless mode")
+    parser.add_argument("--metrics", metavar="FILE",
+                        help="write timing metrics to FILE on exit (Prometheus text for *.prom, else JSON)")
+    commands = parser.add_subparsers(dest="command")
+    commands.required = True
+
+    urls = commands.add_parser("urls", help="generate technique URLs for a list of domains")
+    urls.add_argument("input", nargs="?", default="-", help="file with one domain per line (default: stdin)")
+    urls.add_argument("-o", "--output", default="-", help="output file (default: stdout)")
+    urls.add_argument("-f", "--format", choices=["jsonl", "csv", "compact"], default="jsonl",
+                      help="output format (compact: dictionary-encoded binary file, needs -o)")
+    urls.add_argument("-t", "--technique", action="append",
+                      help="only generate this technique (repeatable, see the techniques command)")
+    urls.add_argument("--dedup", action="store_true", help="skip repeated domains (keeps every domain in memory)")
+    urls.add_argument("--pack", action="store_true",
+                      help="merge compatible Google queries into fewer searches and drop duplicates")
+    urls.set_defaults(func=cmd_urls)
+
+    compact = commands.add_parser("compact", help="convert a compact URL export back to JSON lines or CSV")
+    compact.add_argument("input", help="file written by urls -f compact")
+    compact.add_argument("-o", "--output", default="-", help="output file (default: stdout)")
+    compact.add_argument("-f", "--format", choices=["jsonl", "csv"], default="jsonl", help="output format")
+    compact.add_argument("-r", "--row", type=int, action="append", help="only this row number (repeatable)")
+    compact.set_defaults(func=cmd_compact)
+
+    report = commands.add_parser("report", help="write HTML/JSON reports of all technique URLs for a domain list")
+    report.add_argument("input", nargs="?", default="-", help="file with one domain per line (default: stdin)")
+    report.add_argument("--html", help="HTML report file")
+    report.add_argument("--json", help="JSON report file")
+    report.add_argument("-t", "--technique", action="append",
+                        help="only include this technique (repeatable, default: all built-in)")
+    report.add_argument("-w", "--workers", type=int, help="worker processes (default: one per CPU, 1 for none)")
+    report.add_argument("--chunk-size", type=int, default=500, help="domains rendered per worker task")
+    report.add_argument("--dedup", action="store_true", help="skip repeated domains (keeps every domain in memory)")
+    report.add_argument("--title", default="BigBountyRecon report", help="report title")
+    report.set_defaults(func=cmd_report)
+
+    normalize = commands.add_parser("normalize", help="normalize and deduplicate a list of domains")
+    normalize.add_argument("input", nargs="?", default="-", help="file with one entry per line (default: stdin)")
+    normalize.add_argument("-o", "--output", default="-", help="output file (default: stdout)")
+    normalize.add_argument("--apex", action="store_true",
+                           help="reduce every host to its registrable domain using the public suffix list")
+    normalize.set_defaults(func=cmd_normalize)
+
+    listing = commands.add_parser("techniques", help="list available techniques")
+    listing.set_defaults(func=cmd_techniques)
+
+    dorks = commands.add_parser("import", help="import dork collections (CSV, JSON, JSON lines, YAML) as techniques")
+    dorks.add_argument("files", nargs="+", help="export files, e.g. a GHDB export")
+    dorks.add_argument("-f", "--format", choices=["csv", "json", "jsonl", "yaml"],
+                       help="file format (default: from the file extension)")
+    dorks.add_argument("--category", default=technique_store.CATEGORY,
+                       help="category for entries that have none")
+    dorks.set_defaults(func=cmd_import)
+
+    wayback = commands.add_parser("cdx", help="fetch Wayback Machine CDX results for a domain to a file")
+    wayback.add_argument("domain")
+    wayback.add_argument("-t", "--technique", choices=cdx.CDX_TECHNIQUES, default="swf_wayback",
+                         help="CDX technique whose query to run")
+    wayback.add_argument("-o", "--output", required=True, help="output file, one tab-separated record per line")
+    wayback.add_argument("--base-url", help="CDX endpoint to use instead of the technique's (e.g. a local mirror)")
+    wayback.add_argument("--page-size", type=int, default=5000, help="records per CDX request")
+    wayback.add_argument("--max-records", type=int, help="stop after this many records")
+    wayback.add_argument("--resume", action="store_true", help="continue an interrupted fetch into the same output")
+    wayback.set_defaults(func=cmd_cdx)
+
+    analyze = commands.add_parser("cdx-analyze", help="summarize Wayback CDX output in bounded memory")
+    analyze.add_argument("source", nargs="?", default="-",
+                         help="CDX output: a file (e.g. from the cdx command), - for stdin, or an http(s) CDX URL")
+    analyze.add_argument("-o", "--output", default="-", help="summary JSON file (default: stdout)")
+    analyze.add_argument("--unique", help="also write every unique URL to this file")
+    analyze.add_argument("--memory-mb", type=int, default=32, help="memory for deduplication (default: 32)")
+    analyze.add_argument("--expected", type=int, default=1000000, help="expected number of unique URLs")
+    analyze.add_argument("--samples", type=int, default=10, help="example URLs kept per category")
+    analyze.add_argument("--top", type=int, default=25, help="length of the top extension/parameter/path lists")
+    analyze.set_defaults(func=cmd_cdx_analyze)
+
+    ct = commands.add_parser("ct", help="harvest subdomains from Certificate Transparency logs (crt.sh)")
+    ct.add_argument("domains", nargs="*", help="apex domains to query")
+    ct.add_argument("-i", "--input", help="file with one domain per line (- for stdin)")
+    ct.add_argument("-o", "--output", default="-", help="output file (default: stdout)")
+    ct.add_argument("-f", "--format", choices=["tsv", "json"], default="tsv",
+                    help="tsv: one apex<TAB>subdomain per line, json: {apex: [subdomains]}")
+    ct.add_argument("-c", "--concurrency", type=int, default=4, help="concurrent crt.sh connections")
+    ct.add_argument("--base-url", default=ct_harvest.CRT_SH_URL, help="crt.sh endpoint (e.g. a local stand-in)")
+    ct.set_defaults(func=cmd_ct)
+
+    monitor = commands.add_parser("refresh", help="fetch only new Wayback CDX captures and CT certificates since the last run")
+    monitor.add_argument("domains", nargs="*", help="domains to refresh")
+    monitor.add_argument("-i", "--input", help="file with one domain per line (- for stdin)")
+    monitor.add_argument("-o", "--output", default="-",
+                         help="new items as domain<TAB>source<TAB>url or subdomain (default: stdout)")
+    monitor.add_argument("-s", "--source", action="append", choices=REFRESH_SOURCES,
+                         help="only refresh this source (repeatable, default: all)")
+    monitor.add_argument("--reset", action="store_true", help="forget the watermarks and stored items first")
+    monitor.add_argument("--cdx-base-url", help="CDX endpoint to use instead of the techniques' (e.g. a local mirror)")
+    monitor.add_argument("--ct-base-url", default=ct_harvest.CRT_SH_URL, help="crt.sh endpoint (e.g. a local stand-in)")
+    monitor.add_argument("--page-size", type=int, default=5000, help="records per CDX request")
+    monitor.add_argument("-c", "--concurrency", type=int, default=4, help="concurrent crt.sh connections")
+    monitor.set_defaults(func=cmd_refresh)
+
+    sweep = commands.add_parser("fanout", help="discover subdomains of a domain and run techniques across all of them")
+    sweep.add_argument("domain", help="seed domain")
+    sweep.add_argument("-t", "--technique", action="append",
+                       help="technique to run on every host (repeatable, default: all)")
+    sweep.add_argument("-d", "--depth", type=int, default=1,
+                       help="how many labels below the seed to go, e.g. 2 includes a.b.example.com")
+    sweep.add_argument("--max-hosts", type=int, default=1000, help="stop discovering after this many hosts")
+    sweep.add_argument("-o", "--output", default="-", help="output file for JSON lines (default: stdout)")
+    sweep.add_argument("--open", action="store_true", help="open the URLs in the browser instead of printing them")
+    sweep.add_argument("--base-url", default=ct_harvest.CRT_SH_URL, help="crt.sh endpoint (e.g. a local stand-in)")
+    sweep.add_argument("--skip-checked", action="store_true",
+                       help="leave out techniques already run for a host, according to the run history")
+    sweep.add_argument("--max-age", type=float, metavar="DAYS",
+                       help="with --skip-checked, runs older than this many days do not count "
+                            "(default: BBR_HISTORY_MAX_AGE_DAYS, else any age)")
+    sweep.set_defaults(func=cmd_fanout)
+
+    runs = commands.add_parser("history", help="show the most recent technique runs")
+    runs.add_argument("domain", nargs="?", help="only runs for this domain")
+    runs.add_argument("-n", "--limit", type=int, default=100, help="how many runs to show")
+    runs.set_defaults(func=cmd_history)
+
+    checks = commands.add_parser("fetch", help="fetch robots.txt, crossdomain.xml and grade security headers directly")
+    checks.add_argument("hosts", nargs="*", help="hosts to check (host, host:port or http://host:port)")
+    checks.add_argument("-i", "--input", help="file with one host per line (- for stdin)")
+    checks.add_argument("-o", "--output", default="-", help="output file for JSON lines (default: stdout)")
+    checks.add_argument("--check", action="append", choices=site_fetch.CHECKS,
+                        help="check to run (repeatable, default: all)")
+    checks.add_argument("-c", "--concurrency", type=int, default=50, help="requests in flight at once")
+    checks.add_argument("--per-host", type=int, default=2, help="connections per host")
+    checks.add_argument("--timeout", type=float, default=10, help="seconds per request")
+    checks.add_argument("--scheme", choices=["https", "http"], default="https",
+                        help="scheme for hosts given without one")
+    checks.set_defaults(func=cmd_fetch)
+
+    proxy = commands.add_parser("proxy", help="run the local caching proxy for Wayback CDX and crt.sh URLs")
+    proxy.add_argument("-p", "--port", type=int, default=config.get_int("cache_proxy_port", 0),
+                       help="port on 127.0.0.1 (default: BBR_CACHE_PROXY_PORT or any free port)")
+    proxy.set_defaults(func=cmd_proxy)
+
+    serve = commands.add_parser("serve", help="run the local HTTP/JSON API for technique URLs")
+    serve.add_argument("--host", default="127.0.0.1", help="address to listen on (default: 127.0.0.1)")
+    serve.add_argument("-p", "--port", type=int, default=config.get_int("api_port", api_server.DEFAULT_PORT),
+                       help=f"port (default: BBR_API_PORT or {api_server.DEFAULT_PORT})")
+    serve.add_argument("--allow-open", action="store_true",
+                       help="let clients open URLs in this machine's browser with POST /open")
+    serve.set_defaults(func=cmd_serve)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.metrics:
+        metrics.enable(args.metrics)
+    try:
+        return args.func(args)
+    except BrokenPipeError:
+        # Output piped into e.g. head, which has stopped reading
+        sys.stderr.close()
+        return 0
+
+
+if __name__ == "__main__":
+    # Needed for the report command's worker processes in frozen executables
+    multiprocessing.freeze_support()
+    sys.exit(main())
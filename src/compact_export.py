@@ -0,0 +1,229 @@
+"""
+Compact binary export of technique URLs for BigBountyRecon
+Stores the URLs of a bulk export as dictionary-encoded columns instead of
+text, so an export is an order of magnitude smaller and can be memory-mapped
+
+A .bbru file holds each technique's template once, each domain once, and
+one (domain id, technique id) pair per URL:
+    header      64 bytes: magic, version, counts and section offsets
+    techniques  JSON list of {id, label, category, template, encoding}
+    domains     uint64 offsets (domain count + 1), then the UTF-8 domains
+    rows        uint32 domain ids, then uint16 technique ids
+Sections start on 8-byte boundaries so the columns can be used straight
+from the mapped file. URLs are rebuilt from the template only when read.
+"""
+
+import array
+import json
+import mmap
+import os
+import shutil
+import struct
+import sys
+import tempfile
+
+import techniques
+
+MAGIC = b"BBRURL01"
+VERSION = 1
+HEADER = struct.Struct("<8sIIQQQQQ8x")
+
+MAX_DOMAINS = 2 ** 32
+MAX_TECHNIQUES = 2 ** 16
+
+
+def _check_byteorder():
+    # The columns are used in place as native arrays, and the format is little-endian
+    if sys.byteorder != "little":
+        raise RuntimeError("compact exports need a little-endian machine")
+
+
+def _pad(out):
+    """Pad a file to the next 8-byte boundary; returns the new position"""
+    position = out.tell()
+    if position % 8:
+        out.write(b"\0" * (8 - position % 8))
+    return out.tell()
+
+
+class CompactWriter:
+    """Writes a .bbru file; rows are spooled to temporary files so memory stays small"""
+
+    def __init__(self, path, selected=techniques.TECHNIQUES):
+        _check_byteorder()
+        self.path = path
+        self.techniques = list(selected)
+        if len(self.techniques) > MAX_TECHNIQUES:
+            raise ValueError(f"at most {MAX_TECHNIQUES} techniques fit in a compact export")
+        directory = os.path.dirname(os.path.abspath(path))
+        self._names = tempfile.TemporaryFile(dir=directory)
+        self._domain_ids = tempfile.TemporaryFile(dir=directory)
+        self._technique_ids = tempfile.TemporaryFile(dir=directory)
+        self._offsets = array.array("Q", [0])
+        self._ids = array.array("I")
+        self._tids = array.array("H")
+        self.rows = 0
+
+    @property
+    def domains(self):
+        return len(self._offsets) - 1
+
+    def add_domain(self, domain):
+        """Add a domain, returning its id"""
+        if self.domains >= MAX_DOMAINS:
+            raise ValueError(f"at most {MAX_DOMAINS} domains fit in a compact export")
+        data = domain.encode("utf-8")
+        self._names.write(data)
+        self._offsets.append(self._offsets[-1] + len(data))
+        return self.domains - 1
+
+    def add_rows(self, domain_id, technique_indexes=None):
+        """Add rows for a domain id, for the given technique indexes or all techniques"""
+        if technique_indexes is None:
+            technique_indexes = range(len(self.techniques))
+        for index in technique_indexes:
+            self._ids.append(domain_id)
+            self._tids.append(index)
+        self.rows += len(technique_indexes)
+        if len(self._ids) >= 65536:
+            self._flush()
+
+    def _flush(self):
+        self._ids.tofile(self._domain_ids)
+        self._tids.tofile(self._technique_ids)
+        self._ids = array.array("I")
+        self._tids = array.array("H")
+
+    def close(self):
+        """Assemble the final file from the spooled columns"""
+        self._flush()
+        temp = self.path + ".tmp"
+        with open(temp, "wb") as out:
+            out.write(b"\0" * HEADER.size)
+            techniques_offset = out.tell()
+            out.write(json.dumps([{"id": technique.id, "label": technique.label, "category": technique.category,
+                                   "template": technique.template, "encoding": technique.encoding}
+                                  for technique in self.techniques]).encode("utf-8"))
+            domains_offset = _pad(out)
+            self._offsets.tofile(out)
+            self._names.seek(0)
+            shutil.copyfileobj(self._names, out)
+            rows_offset = _pad(out)
+            self._domain_ids.seek(0)
+            shutil.copyfileobj(self._domain_ids, out)
+            _pad(out)
+            self._technique_ids.seek(0)
+            shutil.copyfileobj(self._technique_ids, out)
+            out.seek(0)
+            out.write(HEADER.pack(MAGIC, VERSION, len(self.techniques), self.domains, self.rows,
+                                  techniques_offset, domains_offset, rows_offset))
+        for spooled in (self._names, self._domain_ids, self._technique_ids):
+            spooled.close()
+        os.replace(temp, self.path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            for spooled in (self._names, self._domain_ids, self._technique_ids):
+                spooled.close()
+        return False
+
+
+class CompactReader:
+    """Memory-mapped, random-access view of a .bbru file; rows are (domain, technique id, url)"""
+
+    def __init__(self, path):
+        _check_byteorder()
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, technique_count, self.domain_count, self.rows,
+         techniques_offset, domains_offset, rows_offset) = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a compact URL export")
+        if version > VERSION:
+            raise ValueError(f"{path} was written by a newer version (format {version})")
+        entries = json.loads(self._map[techniques_offset:domains_offset].rstrip(b"\0"))
+        if len(entries) != technique_count:
+            raise ValueError(f"{path} is damaged: technique table does not match the header")
+        self.techniques = [techniques.Technique(entry["id"], entry["label"], entry["label"], "", entry["category"],
+                                                entry["label"], entry["template"], entry["encoding"])
+                           for entry in entries]
+        view = memoryview(self._map)
+        offsets_end = domains_offset + (self.domain_count + 1) * 8
+        self._offsets = view[domains_offset:offsets_end].cast("Q")
+        self._names_offset = offsets_end
+        ids_end = rows_offset + self.rows * 4
+        self._domain_ids = view[rows_offset:ids_end].cast("I")
+        tids_offset = ids_end + (-ids_end % 8)
+        self._technique_ids = view[tids_offset:tids_offset + self.rows * 2].cast("H")
+
+    def __len__(self):
+        return self.rows
+
+    def domain(self, domain_id):
+        """Domain with the given id"""
+        start = self._names_offset + self._offsets[domain_id]
+        return self._map[start:start + self._offsets[domain_id + 1] - self._offsets[domain_id]].decode("utf-8")
+
+    def row(self, index):
+        """(domain id, technique) of row index"""
+        if index < 0:
+            index += self.rows
+        if not 0 <= index < self.rows:
+            raise IndexError("row index out of range")
+        return self._domain_ids[index], self.techniques[self._technique_ids[index]]
+
+    def __getitem__(self, index):
+        domain_id, technique = self.row(index)
+        domain = self.domain(domain_id)
+        return domain, technique.id, technique.url(domain)
+
+    def url(self, index):
+        """URL of row index"""
+        return self[index][2]
+
+    def __iter__(self):
+        """All rows in order; each domain is decoded and encoded once for its run of rows"""
+        current = None
+        domain = None
+        encoded = {}
+        domain_ids = self._domain_ids
+        technique_ids = self._technique_ids
+        for index in range(self.rows):
+            domain_id = domain_ids[index]
+            if domain_id != current:
+                current = domain_id
+                domain = self.domain(domain_id)
+                encoded = {}
+            technique = self.techniques[technique_ids[index]]
+            value = encoded.get(technique.encoding)
+            if value is None:
+                value = encoded[technique.encoding] = techniques.ENCODERS[technique.encoding](domain)
+            yield domain, technique.id, technique.render(value)
+
+    def close(self):
+        """Release the column views and unmap the file"""
+        self._offsets.release()
+        self._domain_ids.release()
+        self._technique_ids.release()
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+def export(domains, path, selected=techniques.TECHNIQUES):
+    """Write the URLs of the selected techniques for every domain to a .bbru file; returns (domains, rows)"""
+    with CompactWriter(path, selected) as writer:
+        for domain in domains:
+            writer.add_rows(writer.add_domain(domain))
+    return writer.domains, writer.rows
+
@@ -0,0 +1,68 @@
+"""
+Runtime configuration for BigBountyRecon
+Values are read from BBR_* environment variables first, then from
+~/.bigbountyrecon/config.json (the directory can be moved with BBR_HOME)
+"""
+
+import json
+import os
+
+
+def config_dir():
+    """Directory holding the config file and any persisted state"""
+    return os.environ.get("BBR_HOME") or os.path.join(os.path.expanduser("~"), ".bigbountyrecon")
+
+
+_file_values = None
+
+
+def _load_file():
+    """Load config.json once per process, ignoring a missing or broken file"""
+    global _file_values
+    if _file_values is None:
+        try:
+            with open(os.path.join(config_dir(), "config.json"), "r", encoding="utf-8") as f:
+                values = json.load(f)
+            _file_values = values if isinstance(values, dict) else {}
+        except (OSError, ValueError):
+            _file_values = {}
+    return _file_values
+
+
+def get(name, default=None):
+    """Get a setting by name, e.g. get("browser") reads BBR_BROWSER or "browser" in config.json"""
+    value = os.environ.get("BBR_" + name.upper())
+    if value:
+        return value
+    return _load_file().get(name, default)
+
+
+def get_int(name, default):
+    """Get an integer setting, falling back to default if unset or invalid"""
+    try:
+        return int(get(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def get_float(name, default):
+    """Get a float setting, falling back to default if unset or invalid"""
+    try:
+        return float(get(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def get_bool(name, default=False):
+    """Get a boolean setting ("1", "true", "yes", "on" are true)"""
+    value = get(name, default)
+    if isinstance(value, str):
+        return value.strip().lower() in ("1", "true", "yes", "on")
+    return bool(value)
+
+
+def state_path(filename):
+    """Path of a state file inside the config directory, creating the directory if needed"""
+    directory = config_dir()
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, filename)
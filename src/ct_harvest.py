@@ -0,0 +1,166 @@
+"""
+Certificate Transparency harvester for BigBountyRecon
+Queries crt.sh's JSON output for many domains concurrently and merges the
+certificate names into a deduplicated subdomain set per apex domain
+"""
+
+import asyncio
+import codecs
+import json
+import urllib.parse
+
+import async_http
+import metrics
+from rate_limiter import get_limiter
+
+CRT_SH_URL = "https://crt.sh/"
+
+_decoder = json.JSONDecoder()
+
+
+def crt_sh_url(domain, base_url=CRT_SH_URL):
+    """crt.sh JSON query for all certificates under a domain"""
+    return base_url + "?" + urllib.parse.urlencode({"q": "%." + domain, "output": "json"})
+
+
+def normalize_name(name, apex):
+    """Normalize one certificate name, returning None if it is not apex or under it
+
+    Lowercases, drops a trailing dot and reduces wildcards ("*.a.example.com")
+    to the name they cover ("a.example.com").
+    """
+    name = name.strip().lower().rstrip(".")
+    while name.startswith("*."):
+        name = name[2:]
+    if not name or " " in name or "@" in name:
+        return None
+    if name == apex or name.endswith("." + apex):
+        return name
+    return None
+
+
+def names_in_entry(entry):
+    """All names in a crt.sh entry; name_value holds several SAN names separated by newlines"""
+    name_value = entry.get("name_value")
+    names = name_value.split("\n") if isinstance(name_value, str) else []
+    common_name = entry.get("common_name")
+    if isinstance(common_name, str) and common_name:
+        names.append(common_name)
+    return names
+
+
+async def iter_json_array(chunks):
+    """Yield the objects of a JSON array as they arrive in a stream of byte chunks
+
+    Only one object (plus the unparsed tail of the current chunk) is held in
+    memory at a time, however large the array is. Raises ValueError if the
+    stream ends before the closing bracket, so a cut-off response is not
+    mistaken for a complete one.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")("replace")
+    buffer = ""
+    started = False
+    finished = False
+    async for chunk in chunks:
+        buffer += decoder.decode(chunk)
+        position = 0
+        while True:
+            # Skip whitespace, the opening bracket and separators
+            while position < len(buffer) and buffer[position] in " \t\r\n,[":
+                if buffer[position] == "[":
+                    started = True
+                position += 1
+            if position >= len(buffer):
+                break
+            if buffer[position] == "]" and started:
+                finished = True
+                break
+            if not started:
+                raise ValueError("response is not a JSON array")
+            try:
+                value, end = _decoder.raw_decode(buffer, position)
+            except ValueError:
+                # Object continues in the next chunk
+                break
+            yield value
+            position = end
+        buffer = buffer[position:]
+    if not finished:
+        raise ValueError("response ended before the end of the JSON array")
+
+
+class CtHarvester:
+    """Harvests subdomains from crt.sh for many apex domains with a limit on concurrent connections"""
+
+    def __init__(self, concurrency=4, timeout=120, base_url=CRT_SH_URL, retries=2):
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.base_url = base_url
+        self.retries = retries
+        self.subdomains = {}  # apex -> set of names
+        self.errors = {}  # apex -> error message
+        self.since = {}  # apex -> certificate id; entries at or below it are skipped
+        self.latest = {}  # apex -> highest certificate id in a complete response
+
+    async def _query(self, apex, semaphore):
+        url = crt_sh_url(apex, self.base_url)
+        found = self.subdomains.setdefault(apex, set())
+        since = self.since.get(apex)
+        limiter = get_limiter()
+        for attempt in range(self.retries + 1):
+            # Wait for a rate-limit token before taking a slot, so waiting never holds one
+            if limiter is not None:
+                wait = limiter.reserve(url)
+                if wait > 0:
+                    await asyncio.sleep(wait)
+            async with semaphore:
+                metrics.count("fetches", "ct")
+                try:
+                    with metrics.timed("fetch", "ct"):
+                        response = await async_http.get(url, timeout=self.timeout)
+                        if response.status != 200:
+                            await response.close()
+                            raise async_http.HttpError(f"HTTP {response.status} from {url}")
+                        latest = None
+                        async for entry in iter_json_array(response.body()):
+                            if not isinstance(entry, dict):
+                                continue
+                            entry_id = entry.get("id")
+                            if isinstance(entry_id, int):
+                                if latest is None or entry_id > latest:
+                                    latest = entry_id
+                                if since is not None and entry_id <= since:
+                                    continue
+                            for name in names_in_entry(entry):
+                                name = normalize_name(name, apex)
+                                if name:
+                                    found.add(name)
+                    # Only a response read through to its closing bracket moves the latest id
+                    if latest is not None:
+                        self.latest[apex] = latest
+                    self.errors.pop(apex, None)
+                    return
+                except (async_http.HttpError, OSError, ValueError) as e:
+                    self.errors[apex] = str(e)
+                    metrics.count("fetch_errors", "ct")
+            if attempt < self.retries:
+                await asyncio.sleep(2 ** attempt)
+
+    async def harvest(self, domains):
+        """Query crt.sh for every domain, merging results into self.subdomains"""
+        semaphore = asyncio.Semaphore(self.concurrency)
+        apexes = []
+        for domain in domains:
+            apex = domain.strip().lower().rstrip(".")
+            if apex and apex not in self.subdomains:
+                self.subdomains[apex] = set()
+                apexes.append(apex)
+        await asyncio.gather(*(self._query(apex, semaphore) for apex in apexes))
+        return self.subdomains
+
+
+def harvest(domains, concurrency=4, base_url=CRT_SH_URL, timeout=120):
+    """Run a CtHarvester to completion and return it (subdomains per apex plus errors)"""
+    harvester = CtHarvester(concurrency=concurrency, timeout=timeout, base_url=base_url)
+    asyncio.run(harvester.harvest(domains))
+    return harvester
@@ -0,0 +1,92 @@
+"""
+Background dispatch for BigBountyRecon
+Runs technique launches on a bounded worker pool so the Tk main thread never blocks
+"""
+
+import collections
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Outcome of one dispatched job; error is None on success, "cancelled" if it never ran
+DispatchResult = collections.namedtuple("DispatchResult", "label ok error seconds")
+
+
+class Dispatcher:
+    """Bounded worker pool with a result queue
+
+    Jobs are submitted from the UI thread and run on at most `workers`
+    threads. Finished jobs are put on a queue which the UI thread drains
+    (e.g. from a Tk `after` callback), so widgets are only touched from the
+    UI thread. All counters are updated by drain() and so also belong to
+    the UI thread.
+    """
+
+    def __init__(self, workers=4):
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="bbr-dispatch")
+        self._results = queue.Queue()
+        self._pending = set()
+        self._lock = threading.Lock()
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0
+
+    @property
+    def in_flight(self):
+        """Jobs submitted but not yet drained as finished (queued or running)"""
+        return self.submitted - self.completed - self.failed - self.cancelled
+
+    def submit(self, label, func, *args):
+        """Queue func(*args) to run on a worker thread"""
+        future = self._executor.submit(self._run, label, func, args)
+        with self._lock:
+            self._pending.add(future)
+        self.submitted += 1
+        future.add_done_callback(lambda f: self._finished(label, f))
+        return future
+
+    def _run(self, label, func, args):
+        start = time.perf_counter()
+        try:
+            func(*args)
+        except Exception as e:
+            return DispatchResult(label, False, f"{type(e).__name__}: {e}", time.perf_counter() - start)
+        return DispatchResult(label, True, None, time.perf_counter() - start)
+
+    def _finished(self, label, future):
+        with self._lock:
+            self._pending.discard(future)
+        if future.cancelled():
+            self._results.put(DispatchResult(label, False, "cancelled", 0.0))
+        else:
+            self._results.put(future.result())
+
+    def cancel_pending(self):
+        """Cancel all jobs that have not started yet, returning how many were cancelled"""
+        with self._lock:
+            pending = list(self._pending)
+        return sum(1 for future in pending if future.cancel())
+
+    def drain(self):
+        """Take all finished results off the queue without blocking and update the counters"""
+        results = []
+        while True:
+            try:
+                result = self._results.get_nowait()
+            except queue.Empty:
+                break
+            if result.ok:
+                self.completed += 1
+            elif result.error == "cancelled":
+                self.cancelled += 1
+            else:
+                self.failed += 1
+            results.append(result)
+        return results
+
+    def shutdown(self):
+        """Cancel queued jobs and stop the workers without waiting for running ones"""
+        self.cancel_pending()
+        self._executor.shutdown(wait=False)
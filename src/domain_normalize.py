@@ -0,0 +1,251 @@
+"""
+Domain normalization for BigBountyRecon
+Turns whatever was typed or pasted as a target ("https://Tesla.com/about",
+"*.tesla.com", "bücher.de.", "user@host:8443") into the bare, lowercase,
+IDNA-encoded host name the techniques expect, and finds the registrable
+(apex) domain of a host using the Public Suffix List
+
+The suffix list is read from a public_suffix_list.dat file (the "psl_file"
+setting, one in the config directory, or the copy many Linux distributions
+ship) and compiled into a label trie, which is cached next to the config
+file so later runs load it with a single marshal read. Without a list file a
+small built-in set of common suffixes is used, with a warning on stderr, as
+apex domains under other suffixes come out wrong.
+"""
+
+import ipaddress
+import marshal
+import os
+import re
+import sys
+
+import config
+
+SYSTEM_PSL_PATHS = (
+    "/usr/share/publicsuffix/public_suffix_list.dat",
+    "/usr/local/share/publicsuffix/public_suffix_list.dat",
+)
+
+CACHE_VERSION = 1
+
+# Used when no public_suffix_list.dat is available
+BUILTIN_SUFFIXES = """
+com net org edu gov mil int io co ai app dev info biz me tv us uk de fr nl es it ru cn jp in br au ca ch se no
+co.uk org.uk ac.uk gov.uk me.uk ltd.uk plc.uk net.uk
+com.au net.au org.au edu.au gov.au co.nz org.nz net.nz govt.nz
+co.jp ne.jp or.jp ac.jp go.jp co.kr or.kr com.cn net.cn org.cn gov.cn com.hk com.tw com.sg com.my
+co.in net.in org.in gov.in ac.in com.br net.br org.br gov.br com.mx com.ar co.za org.za gov.za com.tr
+github.io gitlab.io herokuapp.com azurewebsites.net cloudfront.net appspot.com blogspot.com
+s3.amazonaws.com elasticbeanstalk.com netlify.app vercel.app pages.dev workers.dev firebaseapp.com web.app
+"""
+
+# Already-clean ASCII host names skip the slower parsing path
+_PLAIN_HOST = re.compile(r"[a-z0-9_]([a-z0-9_-]{0,61}[a-z0-9_])?(\.[a-z0-9_]([a-z0-9_-]{0,61}[a-z0-9_])?)*")
+_IPV4_LIKE = re.compile(r"[0-9.]+")
+_SCHEME = re.compile(r"^[a-zA-Z][a-zA-Z0-9+.-]*://")
+
+# Key marking a trie node that ends a suffix rule; never a valid label
+_END = "."
+
+
+def _idna_label(label):
+    """ASCII form of one label, or None if it cannot be encoded"""
+    if label.isascii():
+        return label.lower()
+    try:
+        return label.encode("idna").decode("ascii")
+    except UnicodeError:
+        return None
+
+
+def compile_rules(lines):
+    """Compile Public Suffix List rule lines into a trie of reversed labels
+
+    Each node is a dict of label -> node; "*" is a wildcard child, "!label"
+    an exception, and the "." key marks the end of a rule.
+    """
+    trie = {}
+    for line in lines:
+        rule = line.split("//", 1)[0].strip()
+        if not rule:
+            continue
+        rule = rule.split()[0]
+        exception = rule.startswith("!")
+        labels = [_idna_label(label) for label in rule.lstrip("!").split(".")]
+        if None in labels:
+            continue
+        node = trie
+        for label in reversed(labels[1:] if exception else labels):
+            node = node.setdefault(label, {})
+        if exception:
+            node["!" + labels[0]] = {}
+        else:
+            node[_END] = {}
+    return trie
+
+
+def psl_path():
+    """Public suffix list file to use, or None"""
+    candidates = [config.get("psl_file"), os.path.join(config.config_dir(), "public_suffix_list.dat")]
+    candidates.extend(SYSTEM_PSL_PATHS)
+    for path in candidates:
+        if path and os.path.isfile(path):
+            return path
+    return None
+
+
+def load_suffixes(path=None):
+    """Suffix trie from a list file (compiled once, then cached) or the built-in suffixes"""
+    path = path or psl_path()
+    if path is None:
+        print("No public_suffix_list.dat found; using a short built-in suffix list, so apex domains may be "
+              "wrong for many country domains. Download https://publicsuffix.org/list/public_suffix_list.dat "
+              f"to {config.config_dir()} or set BBR_PSL_FILE.", file=sys.stderr)
+        return compile_rules(BUILTIN_SUFFIXES.split())
+    stat = os.stat(path)
+    key = (CACHE_VERSION, os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+    cache = os.path.join(config.config_dir(), "psl.cache")
+    try:
+        with open(cache, "rb") as f:
+            cached_key, trie = marshal.load(f)
+        if tuple(cached_key) == key:
+            return trie
+    except (OSError, EOFError, ValueError, TypeError):
+        pass
+    with open(path, "r", encoding="utf-8") as f:
+        trie = compile_rules(f)
+    try:
+        with open(config.state_path("psl.cache"), "wb") as f:
+            marshal.dump((key, trie), f)
+    except OSError:
+        pass
+    return trie
+
+
+_suffixes = None
+
+
+def get_suffixes():
+    """Shared suffix trie, loaded on first use"""
+    global _suffixes
+    if _suffixes is None:
+        _suffixes = load_suffixes()
+    return _suffixes
+
+
+def normalize(entry):
+    """Bare lowercase ASCII host name for a target entry; raises ValueError if it is not one
+
+    Strips a scheme, user info, port, path, query and trailing dot, reduces a
+    wildcard ("*.tesla.com") to the domain it covers and IDNA-encodes Unicode
+    labels. IP addresses are returned in their standard form.
+    """
+    host = entry.strip()
+    lowered = host.lower()
+    if _PLAIN_HOST.fullmatch(lowered) and len(lowered) <= 253:
+        return lowered
+
+    if not host:
+        raise ValueError("empty domain")
+    host = _SCHEME.sub("", host, count=1)
+    host = re.split(r"[/?#\\]", host, maxsplit=1)[0]
+    host = host.rpartition("@")[2]
+    if host.startswith("["):
+        # Bracketed IPv6 literal, possibly with a port
+        host = host[1:].partition("]")[0]
+    elif host.count(":") == 1:
+        host = host.partition(":")[0]
+    if ":" in host or _IPV4_LIKE.fullmatch(host):
+        try:
+            return str(ipaddress.ip_address(host))
+        except ValueError:
+            raise ValueError(f"{entry.strip()!r} is not a valid domain name or IP address")
+
+    host = host.strip().rstrip(".。．｡")
+    while host.startswith("*."):
+        host = host[2:]
+    host = host.lstrip(".")
+    if not host:
+        raise ValueError(f"no domain in {entry.strip()!r}")
+    if not host.isascii():
+        try:
+            host = host.encode("idna").decode("ascii")
+        except UnicodeError:
+            raise ValueError(f"{entry.strip()!r} is not a valid domain name")
+    host = host.lower()
+    if len(host) > 253 or not _PLAIN_HOST.fullmatch(host):
+        raise ValueError(f"{entry.strip()!r} is not a valid domain name")
+    return host
+
+
+def public_suffix(host, suffixes=None):
+    """Number of trailing labels of a normalized host that form its public suffix"""
+    node = suffixes if suffixes is not None else get_suffixes()
+    labels = host.split(".")
+    # Unlisted TLDs count as one-label suffixes (the implicit "*" rule)
+    length = 1
+    for depth, label in enumerate(reversed(labels), 1):
+        if "!" + label in node:
+            return depth - 1
+        child = node.get(label)
+        if child is None:
+            child = node.get("*")
+            if child is None:
+                break
+        if _END in child:
+            length = depth
+        node = child
+    return length
+
+
+def apex(host, suffixes=None):
+    """Registrable domain of a normalized host ("a.b.tesla.co.uk" -> "tesla.co.uk")
+
+    IP addresses are returned unchanged; a host that is itself a public
+    suffix has no apex and gives None.
+    """
+    if ":" in host or host.replace(".", "").isdigit():
+        return host
+    labels = host.split(".")
+    length = public_suffix(host, suffixes)
+    if len(labels) <= length:
+        return None
+    return ".".join(labels[-length - 1:])
+
+
+class Normalizer:
+    """Normalizes and deduplicates a stream of target entries, counting what was dropped
+
+    Deduplication keeps every domain seen in memory; with dedup=False memory
+    use stays constant however long the stream is.
+    """
+
+    def __init__(self, to_apex=False, suffixes=None, dedup=True):
+        self.to_apex = to_apex
+        self.suffixes = suffixes
+        self.seen = set() if dedup else None
+        self.invalid = 0
+        self.duplicates = 0
+        self.errors = []
+
+    def __call__(self, entries, max_errors=20):
+        """Yield each normalized domain (each distinct one once if deduplicating), skipping invalid entries"""
+        seen = self.seen
+        for entry in entries:
+            try:
+                domain = normalize(entry)
+                if self.to_apex:
+                    domain = apex(domain, self.suffixes)
+                    if domain is None:
+                        raise ValueError(f"{entry.strip()!r} is a public suffix")
+            except ValueError as e:
+                self.invalid += 1
+                if len(self.errors) < max_errors:
+                    self.errors.append(str(e))
+                continue
+            if seen is not None:
+                if domain in seen:
+                    self.duplicates += 1
+                    continue
+                seen.add(domain)
+            yield domain
@@ -0,0 +1,209 @@
+"""
+Google dork packer for BigBountyRecon
+Merges the Google queries of several techniques into as few search requests
+as possible, to cut the number of requests per target and CAPTCHA exposure
+
+A query such as "site:tesla.com ext:sql | ext:dbf | ext:mdb" is a scope (the
+site: terms) plus one OR-list. Queries with the same scope have their
+OR-lists merged and packed into as few queries as fit Google's word and
+length limits. Other queries and non-Google URLs are kept as they are, apart
+from dropping exact duplicates.
+"""
+
+import collections
+import re
+import urllib.parse
+
+# Google ignores words after the 32nd
+MAX_WORDS = 32
+
+# Longest search URL sent
+MAX_URL_LENGTH = 2000
+
+SEARCH_URL = "https://www.google.com/search?"
+
+GOOGLE_HOSTS = ("www.google.com", "google.com")
+
+# One term: optional -, optional operator (Google allows a space after the colon), then a phrase or word
+_TERM = re.compile(r'\||-?(?:[A-Za-z]+:\s*)?(?:"[^"]*"|[^\s|"]+)(?:"[^"]*")?')
+
+# A packed search request and the techniques whose terms it covers
+PackedQuery = collections.namedtuple("PackedQuery", "url query technique_ids")
+
+# Result of packing: the queries to send plus how many requests that saves
+PackResult = collections.namedtuple("PackResult", "queries original duplicates covered packed")
+
+
+def canonical_term(term):
+    """Lowercase the operator (and file extensions) and drop the space Google allows after its colon"""
+    match = re.match(r"(-?)([A-Za-z]+):\s*(.+)", term, re.DOTALL)
+    if match:
+        sign, operator, value = match.groups()
+        operator = operator.lower()
+        if operator in ("ext", "filetype"):
+            value = value.lower()
+        return f"{sign}{operator}:{value}"
+    return term
+
+
+def parse_query(query):
+    """Split a query into AND-ed groups, each a list of OR-ed canonical terms"""
+    groups = []
+    joined = False
+    for token in _TERM.findall(query):
+        if token == "|":
+            joined = bool(groups)
+            continue
+        term = canonical_term(token)
+        if joined:
+            groups[-1].append(term)
+        else:
+            groups.append([term])
+        joined = False
+    return groups
+
+
+def split_query(query):
+    """(scope, OR-terms) for a packable query, or None
+
+    A query is packable when its site: terms stand alone and everything else
+    is a single OR-list, so OR-lists with the same scope can be merged.
+    """
+    groups = parse_query(query)
+    scope = tuple(sorted(group[0] for group in groups if len(group) == 1 and group[0].startswith("site:")))
+    rest = [group for group in groups if not (len(group) == 1 and group[0].startswith("site:"))]
+    if not scope or len(rest) != 1:
+        return None
+    terms = list(dict.fromkeys(rest[0]))
+    if any(term.startswith("site:") for term in terms):
+        return None
+    return scope, terms
+
+
+def search_query(url):
+    """The q= parameter of a Google search URL, or None for any other URL"""
+    parts = urllib.parse.urlsplit(url)
+    if parts.hostname not in GOOGLE_HOSTS or parts.path != "/search":
+        return None
+    return dict(urllib.parse.parse_qsl(parts.query)).get("q")
+
+
+def canonical_query(query):
+    """Query with canonical terms and single spaces, for spotting duplicates"""
+    return " ".join(" | ".join(group) for group in parse_query(query))
+
+
+def word_count(term):
+    return len(term.split())
+
+
+def search_url(query):
+    return SEARCH_URL + urllib.parse.urlencode({"q": query})
+
+
+def covering_scope(scope, scopes):
+    """The broadest site:*.x query in scopes covering a lone site:*.*.x query (every subdomain depth), or None"""
+    if len(scope) != 1 or not scope[0].startswith("site:*."):
+        return None
+    pattern = scope[0][len("site:"):]
+    best = None
+    for other in scopes:
+        if other != scope and len(other) == 1 and other[0].startswith("site:*."):
+            parent = other[0][len("site:*."):]
+            if pattern.endswith("." + parent) and (best is None or len(other[0]) < len(best[0])):
+                best = other
+    return best
+
+
+def pack_scope(scope, terms, max_words=MAX_WORDS, max_length=MAX_URL_LENGTH):
+    """Pack (term, technique_ids) pairs for one scope into as few queries as fit the limits
+
+    First-fit decreasing by word count; terms keep their original order within each query.
+    """
+    scope_text = " ".join(scope)
+    order = {term: index for index, (term, _) in enumerate(terms)}
+    bins = []  # [words, [terms]]
+    for term, _ in sorted(terms, key=lambda item: -word_count(item[0])):
+        words = word_count(term)
+        for entry in bins:
+            if entry[0] + words <= max_words and \
+                    len(search_url(scope_text + " " + " | ".join(entry[1] + [term]))) <= max_length:
+                entry[0] += words
+                entry[1].append(term)
+                break
+        else:
+            bins.append([len(scope) + words, [term]])
+
+    owners = dict(terms)
+    queries = []
+    for _, bin_terms in bins:
+        bin_terms.sort(key=order.get)
+        query = scope_text + " " + " | ".join(bin_terms)
+        ids = list(dict.fromkeys(technique_id for term in bin_terms for technique_id in owners[term]))
+        queries.append(PackedQuery(search_url(query), query, ids))
+    return queries
+
+
+def pack(items, max_words=MAX_WORDS, max_length=MAX_URL_LENGTH):
+    """Pack (technique, url) pairs, e.g. from techniques.render_all, into fewer requests
+
+    Returns a PackResult whose queries keep the order in which scopes first appear.
+    """
+    original = 0
+    duplicates = 0
+    covered = 0
+    seen = {}  # canonical query or url -> PackedQuery index or scope
+    kept = []  # PackedQuery, or scope key for packable groups
+    scopes = collections.OrderedDict()  # scope -> OrderedDict(term -> [technique ids])
+    for technique, url in items:
+        original += 1
+        query = search_query(url)
+        key = canonical_query(query) if query is not None else url
+        if key in seen:
+            duplicates += 1
+            target = seen[key]
+            if isinstance(target, int):
+                kept[target].technique_ids.append(technique.id)
+            else:
+                for term in split_query(query)[1]:
+                    scopes[target][term].append(technique.id)
+            continue
+        split = split_query(query) if query is not None else None
+        if split is None:
+            seen[key] = len(kept)
+            kept.append(PackedQuery(url, query, [technique.id]))
+            continue
+        scope, terms = split
+        seen[key] = scope
+        if scope not in scopes:
+            scopes[scope] = collections.OrderedDict()
+            kept.append(scope)
+        for term in terms:
+            scopes[scope].setdefault(term, []).append(technique.id)
+
+    lone_scopes = {}  # one-term query -> its PackedQuery
+    for item in kept:
+        if isinstance(item, PackedQuery) and item.query and len(item.query.split()) == 1:
+            lone_scopes.setdefault(tuple(item.query.split()), item)
+    queries = []
+    for item in kept:
+        if isinstance(item, PackedQuery):
+            cover = covering_scope(tuple(item.query.split()), lone_scopes) if item.query else None
+            if cover is not None:
+                # The covering query now runs on behalf of the dropped one's techniques too
+                covered += 1
+                ids = lone_scopes[cover].technique_ids
+                ids.extend(technique_id for technique_id in item.technique_ids if technique_id not in ids)
+                continue
+            queries.append(item)
+        else:
+            queries.extend(pack_scope(item, list(scopes[item].items()), max_words, max_length))
+    packed = original - duplicates - covered - len(queries)
+    return PackResult(queries, original, duplicates, covered, packed)
+
+
+def summary(result):
+    """One-line report of how many requests packing saved"""
+    saved = result.original - len(result.queries)
+    return (f"{len(result.queries)} requests instead of {result.original} ({saved} saved: "
+            f"{result.duplicates} duplicate, {result.covered} covered, {result.packed} merged)")
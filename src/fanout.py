@@ -0,0 +1,155 @@
+"""
+Subdomain fan-out for BigBountyRecon
+Discovers the subdomains of a seed domain and runs a set of techniques
+against every discovered host, as one operation
+
+Discovery is breadth-first: the seed is queried first, then every newly
+found host that is less than max_depth labels below the seed is queried in
+turn. Hosts are deduplicated, and (host, technique, url) work items pass
+through a bounded queue to the consumer, so discovery never runs far ahead
+of a slow consumer such as the rate-limited browser.
+"""
+
+import collections
+import queue
+import threading
+
+import async_http
+import ct_harvest
+import techniques
+
+# One unit of work: run technique against host via url
+WorkItem = collections.namedtuple("WorkItem", "host depth technique url")
+
+_DONE = object()
+
+
+def ct_source(host, base_url=ct_harvest.CRT_SH_URL):
+    """Subdomains of host from Certificate Transparency logs (crt.sh); raises if the query failed"""
+    harvester = ct_harvest.harvest([host], base_url=base_url)
+    if host in harvester.errors:
+        raise async_http.HttpError(f"crt.sh: {harvester.errors[host]}")
+    return harvester.subdomains.get(host, ())
+
+
+# Subdomain sources available for discovery, by name
+SOURCES = {
+    "ct": ct_source,
+}
+
+
+def depth_below(host, seed):
+    """How many labels host has below seed (0 for the seed itself)"""
+    if host == seed:
+        return 0
+    return host[:-len(seed) - 1].count(".") + 1
+
+
+class SweepCancelled(Exception):
+    """The sweep was cancelled before it finished"""
+
+
+class FanoutSweep:
+    """Subdomain discovery plus technique scheduling for one seed domain"""
+
+    def __init__(self, seed, selected, max_depth=1, max_hosts=1000, queue_size=256, sources=None):
+        self.seed = seed.strip().lower().rstrip(".")
+        self.selected = list(selected)
+        self.max_depth = max_depth
+        self.max_hosts = max_hosts
+        self.queue_size = queue_size
+        self.sources = list(sources or SOURCES.values())
+        self.hosts = []
+        self.errors = []
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def discover(self):
+        """Yield (host, depth) for the seed and each new subdomain, breadth first, up to max_hosts"""
+        seen = {self.seed}
+        pending = collections.deque([(self.seed, 0)])
+        while pending and not self._cancel.is_set():
+            host, depth = pending.popleft()
+            self.hosts.append(host)
+            yield host, depth
+            if depth >= self.max_depth or len(seen) >= self.max_hosts:
+                continue
+            for source in self.sources:
+                try:
+                    names = sorted(source(host))
+                except Exception as e:
+                    self.errors.append(f"{host}: {e}")
+                    continue
+                for name in names:
+                    if name in seen or len(seen) >= self.max_hosts:
+                        continue
+                    name_depth = depth_below(name, self.seed)
+                    if name_depth <= self.max_depth:
+                        seen.add(name)
+                        pending.append((name, name_depth))
+
+    def _produce(self, work):
+        try:
+            for host, depth in self.discover():
+                for technique, url in techniques.render_all(host, self.selected):
+                    while not self._cancel.is_set():
+                        try:
+                            work.put(WorkItem(host, depth, technique, url), timeout=0.2)
+                            break
+                        except queue.Full:
+                            continue
+                    if self._cancel.is_set():
+                        return
+        except Exception as e:
+            self.errors.append(str(e))
+        finally:
+            while True:
+                try:
+                    work.put(_DONE, timeout=0.2)
+                    return
+                except queue.Full:
+                    if self._cancel.is_set():
+                        return
+
+    def items(self):
+        """Yield WorkItems while discovery continues in a background thread
+
+        At most queue_size items are buffered between discovery and the caller.
+        """
+        work = queue.Queue(maxsize=self.queue_size)
+        producer = threading.Thread(target=self._produce, args=(work,), name="bbr-fanout", daemon=True)
+        producer.start()
+        try:
+            while True:
+                try:
+                    item = work.get(timeout=0.2)
+                except queue.Empty:
+                    if self._cancel.is_set():
+                        raise SweepCancelled()
+                    continue
+                if item is _DONE:
+                    break
+                yield item
+        finally:
+            self._cancel.set()
+            producer.join()
+
+    def run(self, open_host):
+        """Run the sweep, calling open_host(items) once per host with that host's WorkItems
+
+        Returns the number of hosts swept.
+        """
+        batch = []
+        count = 0
+        for item in self.items():
+            if batch and item.host != batch[0].host:
+                open_host(batch)
+                count += 1
+                batch = []
+            batch.append(item)
+        if batch:
+            open_host(batch)
+            count += 1
+        return count
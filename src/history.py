@@ -0,0 +1,111 @@
+"""
+Run history for BigBountyRecon
+Records which technique URLs were opened for which domain, and when, so sweeps
+can skip techniques already run for a target and the grid can mark them
+
+Every launch is appended to the runs table of ~/.bigbountyrecon/history.sqlite3
+with its outcome. Successful launches also update the checked table, keyed by
+(domain, technique), which answers "was this run, and when" with a single
+primary key lookup however long the log grows.
+"""
+
+import sqlite3
+import threading
+import time
+
+import config
+
+
+class History:
+    """Append-only run log plus an index of the last successful run per (domain, technique)"""
+
+    def __init__(self, path):
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS runs ("
+            " id INTEGER PRIMARY KEY, domain TEXT, technique TEXT, url TEXT, run_at REAL, outcome TEXT)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS runs_domain ON runs (domain, run_at)")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS checked ("
+            " domain TEXT, technique TEXT, run_at REAL, PRIMARY KEY (domain, technique)) WITHOUT ROWID")
+
+    def record(self, domain, runs, outcome="ok", run_at=None):
+        """Append (technique id, url) pairs run for a domain, in one transaction
+
+        outcome is "ok" or an error message; only successful runs count as checked.
+        """
+        run_at = run_at if run_at is not None else time.time()
+        runs = list(runs)
+        with self._lock:
+            self._db.execute("BEGIN")
+            try:
+                self._db.executemany(
+                    "INSERT INTO runs (domain, technique, url, run_at, outcome) VALUES (?, ?, ?, ?, ?)",
+                    [(domain, technique_id, url, run_at, outcome) for technique_id, url in runs])
+                if outcome == "ok":
+                    self._db.executemany("INSERT OR REPLACE INTO checked VALUES (?, ?, ?)",
+                                         [(domain, technique_id, run_at) for technique_id, _ in runs])
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+
+    def last_run(self, domain, technique_id):
+        """Time of the last successful run of a technique for a domain, or None"""
+        with self._lock:
+            row = self._db.execute("SELECT run_at FROM checked WHERE domain = ? AND technique = ?",
+                                   (domain, technique_id)).fetchone()
+        return row[0] if row else None
+
+    def checked(self, domain, since=None):
+        """Technique ids run successfully for a domain (at or after since, if given) -> time of last run"""
+        with self._lock:
+            rows = self._db.execute("SELECT technique, run_at FROM checked WHERE domain = ? AND run_at >= ?",
+                                    (domain, since or 0)).fetchall()
+        return dict(rows)
+
+    def unchecked(self, domain, selected, since=None):
+        """The techniques of selected not yet run for a domain (or not since the given time)"""
+        done = self.checked(domain, since)
+        return [technique for technique in selected if technique.id not in done]
+
+    def runs(self, domain=None, limit=100):
+        """Most recent runs, newest first, as (domain, technique, url, run_at, outcome) tuples"""
+        query = "SELECT domain, technique, url, run_at, outcome FROM runs"
+        params = ()
+        if domain is not None:
+            query += " WHERE domain = ?"
+            params = (domain,)
+        query += " ORDER BY run_at DESC, id DESC LIMIT ?"
+        with self._lock:
+            return self._db.execute(query, params + (limit,)).fetchall()
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+def max_age_since(days=None):
+    """Earliest run time that still counts as checked, from history_max_age_days (None: any age)"""
+    if days is None:
+        days = config.get_float("history_max_age_days", 0)
+    return time.time() - days * 86400 if days > 0 else None
+
+
+_history = None
+_history_lock = threading.Lock()
+
+
+def get_history():
+    """Process-wide history at ~/.bigbountyrecon/history.sqlite3; None if BBR_HISTORY=0"""
+    global _history
+    if not config.get_bool("history", True):
+        return None
+    if _history is None:
+        with _history_lock:
+            if _history is None:
+                _history = History(config.state_path("history.sqlite3"))
+    return _history
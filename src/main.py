@@ -3,31 +3,323 @@ BigBountyRecon - Python Tkinter Version
 Reconnaissance tool with 58+ techniques using Google dorks and open source tools
 """
 
+import time
+
+PROCESS_START = time.perf_counter()
+
+import sys
 import tkinter as tk
-from tkinter import ttk, messagebox
-import recon_searches
+import tkinter.font as tkfont
+import config
+import domain_normalize
+import metrics
+import techniques
+from button_grid import ButtonGrid
+from dispatcher import Dispatcher
+
+IMPORTS_DONE = time.perf_counter()
 
 # Set to True to use the old categorized UI, False for the new grid layout matching original
 use_old_ui = False
 
+# How often the UI checks the worker pool for finished jobs while work is in flight
+DISPATCH_POLL_MS = 100
+
+# Buttons created per idle callback while the technique grid is built
+GRID_CHUNK_SIZE = 12
+
+# Delay after the last keystroke in the filter box before the grid is filtered
+FILTER_DEBOUNCE_MS = 40
+
+# Delay after the last keystroke in the domain box before checked techniques are marked
+CHECKED_DEBOUNCE_MS = 150
+
+# Text colour of buttons whose technique has already been run for the domain
+CHECKED_FG = "#1B7F3B"
+
+
+class StartupTimings:
+    """Startup phase timings, in seconds since main.py started loading"""
+
+    def __init__(self):
+        self.phases = [("imports", IMPORTS_DONE - PROCESS_START)]
+        self.done = False
+
+    def mark(self, phase):
+        self.phases.append((phase, time.perf_counter() - PROCESS_START))
+
+    def finish(self, report=False):
+        """Mark startup as complete and optionally print the phase timings to stderr"""
+        self.mark("startup_complete")
+        self.done = True
+        if report:
+            for phase, seconds in self.phases:
+                print(f"[startup] {phase:20s} {seconds * 1000:8.1f} ms", file=sys.stderr)
+
 
 class BigBountyReconApp:
-    def __init__(self, root):
+    def __init__(self, root, report_timings=False):
         self.root = root
         self.root.title("BigBountyRecon")
+        self.all_techniques = []
+        self.visible_techniques = []
+        self.buttons = {}  # technique -> button, created the first time the technique is shown
+        self.selected = {}  # technique -> button, for the new UI's multi-select
+        self.index = None
+        self._index_thread = None
+        self.grid_ready = False
+        self._filter_job = None
+        self.checked_ids = set()  # ids of techniques already run for the domain in the entry field
+        self._checked_job = None
+        self.skip_checked = tk.BooleanVar(root, value=config.get_bool("skip_checked"))
+        self.startup = StartupTimings()
+        self.startup.mark("tk_root")
+        self.report_timings = report_timings
+        self.dispatcher = Dispatcher(config.get_int("dispatch_workers", 4))
+        self._poll_job = None
+        self.last_error = None
+        self.root.protocol("WM_DELETE_WINDOW", self.close)
+        
+        # Fonts are shared by all widgets instead of being created per widget
+        self.fonts = {
+            "logo": tkfont.Font(root=root, family="Arial", size=24, weight="bold"),
+            "entry": tkfont.Font(root=root, family="Arial", size=16),
+            "button": tkfont.Font(root=root, family="Arial", size=12, weight="normal"),
+            "label": tkfont.Font(root=root, family="Arial", size=12, weight="bold"),
+            "old_entry": tkfont.Font(root=root, family="Arial", size=11),
+        }
         
         if use_old_ui:
             self.create_old_ui()
+            self.startup.finish(self.report_timings)
         else:
             self.create_new_ui()
     
-    def validate_and_run(self, func):
-        """Validate domain input and run the function"""
-        domain = self.domain_entry.get().strip()
-        if not domain:
-            messagebox.showwarning("Warning", "Please enter a target domain")
+    def warn(self, message):
+        """Show a warning dialog"""
+        from tkinter import messagebox
+        messagebox.showwarning("Warning", message)
+    
+    def target_domain(self, technique=None):
+        """Normalized domain from the entry field, shown back in the field; None (after a warning) if invalid
+
+        With a technique label, the normalization (not the warning dialog) is timed as "validate".
+        """
+        entry = self.domain_entry.get().strip()
+        if not entry:
+            self.warn("Please enter a target domain")
+            return None
+        try:
+            if technique is None:
+                domain = domain_normalize.normalize(entry)
+            else:
+                with metrics.timed("validate", technique):
+                    domain = domain_normalize.normalize(entry)
+        except ValueError as e:
+            self.warn(f"Please enter a valid target domain: {e}")
+            return None
+        if domain != entry:
+            self.domain_entry.delete(0, tk.END)
+            self.domain_entry.insert(0, domain)
+        return domain
+
+    def validate_and_run(self, technique):
+        """Validate domain input and run the technique"""
+        domain = self.target_domain(technique.id)
+        if domain is None:
+            return
+        # Imported on first use so the browser machinery stays off the startup path
+        import recon_searches
+        self.dispatch(technique.label, recon_searches.run_technique, technique, domain)
+    
+    def run_batch(self, selected):
+        """Validate domain input and open the URLs of several techniques in as few browser launches as possible"""
+        domain = self.target_domain("batch")
+        if domain is None:
+            return
+        if not selected:
+            self.warn("Shift+click buttons to select techniques first")
+            return
+        if self.skip_checked.get():
+            history = self.history()
+            if history is not None:
+                selected = history.unchecked(domain, selected, self.history_since())
+                if not selected:
+                    self.warn(f"All of these techniques have already been run for {domain}")
+                    return
+        import recon_searches
+        if config.get_bool("pack_dorks"):
+            urls, result = recon_searches.packed_urls(selected, domain)
+            runs = [(technique_id, url) for url, query in zip(urls, result.queries)
+                    for technique_id in query.technique_ids]
+            label = f"{len(selected)} techniques in {len(urls)} searches"
+        else:
+            urls = recon_searches.technique_urls(selected, domain)
+            runs = list(zip((technique.id for technique in selected), urls))
+            label = f"{len(urls)} techniques"
+        self.dispatch(label, recon_searches.open_recorded, domain, runs, config.get_int("batch_window", 0))
+    
+    def run_sweep(self):
+        """Run the selected techniques against the domain and every subdomain discovered under it"""
+        domain = self.target_domain()
+        if domain is None:
+            return
+        if not self.selected:
+            self.warn("Shift+click buttons to select techniques first")
             return
-        func(domain)
+        import recon_searches
+        selected = list(self.selected)
+        self.dispatch(f"Subdomain sweep of {domain}", recon_searches.sweep_subdomains, domain, selected,
+                      config.get_int("sweep_depth", 1), config.get_int("sweep_max_hosts", 1000),
+                      config.get_int("batch_window", 0), None, self.skip_checked.get(), self.history_since())
+    
+    def history(self):
+        """The run history, or None if it is turned off"""
+        import history
+        return history.get_history()
+    
+    def history_since(self):
+        """Earliest run time that still counts as checked (history_max_age_days), or None for any age"""
+        import history
+        return history.max_age_since()
+    
+    def schedule_checked_refresh(self):
+        """Mark checked techniques once typing in the domain box pauses"""
+        if self._checked_job is not None:
+            self.root.after_cancel(self._checked_job)
+        self._checked_job = self.root.after(CHECKED_DEBOUNCE_MS, self.refresh_checked)
+    
+    def refresh_checked(self):
+        """Colour the buttons of techniques already run for the domain in the entry field"""
+        self._checked_job = None
+        history = self.history()
+        checked = set()
+        if history is not None:
+            try:
+                domain = domain_normalize.normalize(self.domain_entry.get())
+            except ValueError:
+                domain = None
+            if domain:
+                checked = set(history.checked(domain, self.history_since()))
+        changed = checked.symmetric_difference(self.checked_ids)
+        self.checked_ids = checked
+        for technique, btn in self.buttons.items():
+            if technique.id in changed:
+                btn.config(fg=CHECKED_FG if technique.id in checked else "#000000")
+    
+    def dispatch(self, label, func, *args):
+        """Run func(*args) on the worker pool and start polling for its result"""
+        self.dispatcher.submit(label, func, *args)
+        self.update_status()
+        if self._poll_job is None:
+            self._poll_job = self.root.after(DISPATCH_POLL_MS, self.poll_dispatcher)
+    
+    def poll_dispatcher(self):
+        """Collect finished jobs from the worker pool; keeps polling while work is in flight"""
+        self._poll_job = None
+        results = self.dispatcher.drain()
+        for result in results:
+            if result.error and result.error != "cancelled":
+                self.last_error = f"{result.label} failed: {result.error}"
+        if results and self.buttons:
+            self.refresh_checked()
+        self.update_status()
+        if self.dispatcher.in_flight:
+            self._poll_job = self.root.after(DISPATCH_POLL_MS, self.poll_dispatcher)
+    
+    def cancel_queued(self):
+        """Cancel dispatched jobs that have not started yet"""
+        self.dispatcher.cancel_pending()
+        self.poll_dispatcher()
+    
+    def update_status(self):
+        """Show in-flight/completed/failed counts in the status bar"""
+        d = self.dispatcher
+        text = f"In flight: {d.in_flight}   Completed: {d.completed}   Failed: {d.failed}   Cancelled: {d.cancelled}"
+        if self.last_error:
+            text += f"   Last error: {self.last_error}"
+        self.status_label.config(text=text)
+    
+    def create_status_bar(self):
+        """Status bar at the bottom of the window with dispatch counts and a cancel button"""
+        status_frame = tk.Frame(self.root, bg="#E4E4E4", bd=1, relief=tk.SUNKEN)
+        status_frame.pack(side=tk.BOTTOM, fill=tk.X)
+        tk.Button(status_frame, text="Cancel Queued", command=self.cancel_queued).pack(side=tk.RIGHT, padx=3, pady=1)
+        if metrics.enabled():
+            tk.Button(status_frame, text="Metrics", command=self.show_metrics).pack(side=tk.RIGHT, padx=3, pady=1)
+        self.status_label = tk.Label(status_frame, anchor=tk.W, bg="#E4E4E4")
+        self.status_label.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+        self.update_status()
+    
+    def show_metrics(self):
+        """Window with the latency of each stage per technique, refreshable and exportable"""
+        from tkinter import ttk
+        window = tk.Toplevel(self.root)
+        window.title("Metrics")
+        window.geometry("760x420")
+        columns = ("stage", "technique", "count", "mean", "p50", "p95", "max")
+        table = ttk.Treeview(window, columns=columns, show="headings")
+        for column in columns:
+            table.heading(column, text=column if column in ("stage", "technique", "count") else column + " (ms)")
+            table.column(column, width=150 if column in ("stage", "technique") else 80,
+                         anchor=tk.W if column in ("stage", "technique") else tk.E)
+        table.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+
+        def refresh():
+            table.delete(*table.get_children())
+            snapshot = metrics.get_registry().snapshot()
+            for entry in snapshot["stages"]:
+                table.insert("", tk.END, values=(
+                    entry["stage"], entry["technique"] or "-", entry["count"],
+                    f"{entry['sum'] / entry['count'] * 1000:.1f}", f"{entry['p50'] * 1000:.1f}",
+                    f"{entry['p95'] * 1000:.1f}", f"{entry['max'] * 1000:.1f}"))
+            for entry in snapshot["counters"]:
+                table.insert("", tk.END, values=(entry["event"], entry["technique"] or "-", entry["value"],
+                                                 "", "", "", ""))
+
+        def export(extension, label):
+            from tkinter import filedialog
+            path = filedialog.asksaveasfilename(parent=window, defaultextension=extension,
+                                                filetypes=[(label, "*" + extension)])
+            if path:
+                metrics.write(path)
+
+        buttons = tk.Frame(window)
+        buttons.pack(fill=tk.X, padx=5, pady=(0, 5))
+        tk.Button(buttons, text="Refresh", command=refresh).pack(side=tk.LEFT, padx=3)
+        tk.Button(buttons, text="Reset", command=lambda: (metrics.get_registry().reset(), refresh())).pack(
+            side=tk.LEFT, padx=3)
+        tk.Button(buttons, text="Export JSON...", command=lambda: export(".json", "JSON")).pack(side=tk.RIGHT, padx=3)
+        tk.Button(buttons, text="Export Prometheus...", command=lambda: export(".prom", "Prometheus textfile")).pack(
+            side=tk.RIGHT, padx=3)
+        refresh()
+
+    def close(self):
+        """Stop the worker pool and close the window"""
+        self.dispatcher.shutdown()
+        self.root.destroy()
+    
+    def run_selected(self):
+        """Run all selected techniques, in the order they were selected"""
+        self.run_batch(list(self.selected))
+    
+    def toggle_selection(self, btn, technique):
+        """Add a button to the selection, or remove it if already selected"""
+        if technique in self.selected:
+            del self.selected[technique]
+            btn.config(bg="#FFFFFF")
+        else:
+            self.selected[technique] = btn
+            btn.config(bg="#CCE4FF")
+        self.run_selected_button.config(text=f"Run Selected ({len(self.selected)})")
+        return "break"
+    
+    def clear_selection(self):
+        """Deselect all buttons"""
+        for btn in self.selected.values():
+            btn.config(bg="#FFFFFF")
+        self.selected.clear()
+        self.run_selected_button.config(text="Run Selected (0)")
     
     def create_new_ui(self):
         """Create the new UI matching the original Windows Forms layout"""
@@ -45,7 +337,7 @@ class BigBountyReconApp:
         
         # Logo text
         logo_label = tk.Label(header_frame, text="BIG BOUNTY RECON", 
-                             font=("Arial", 24, "bold"), 
+                             font=self.fonts["logo"], 
                              fg="#000000", bg="#F0F0F0")
         logo_label.pack()
         
@@ -53,143 +345,194 @@ class BigBountyReconApp:
         input_frame = tk.Frame(self.root, bg="#F0F0F0", pady=8)
         input_frame.pack(fill=tk.X, padx=20)
         
-        self.domain_entry = tk.Entry(input_frame, width=50, font=("Arial", 16), 
+        self.domain_entry = tk.Entry(input_frame, width=50, font=self.fonts["entry"], 
                                     relief=tk.SOLID, borderwidth=1)
         self.domain_entry.pack(expand=True, padx=5)
         self.domain_entry.insert(0, "tesla.com")
-        self.domain_entry.bind('<Return>', lambda e: self.validate_and_run(recon_searches.directory_listing))
+        self.domain_entry.bind('<Return>', lambda e: self.validate_and_run(techniques.get("directory_listing")))
+        self.domain_entry.bind('<KeyRelease>', lambda e: self.schedule_checked_refresh(), add='+')
+        self.domain_entry.focus_set()
+        
+        # Batch actions - Shift+click buttons to select them
+        batch_frame = tk.Frame(self.root, bg="#F0F0F0")
+        batch_frame.pack(fill=tk.X, padx=20)
+        batch_buttons = tk.Frame(batch_frame, bg="#F0F0F0")
+        batch_buttons.pack()
+        
+        self.run_selected_button = tk.Button(batch_buttons, text="Run Selected (0)", command=self.run_selected)
+        self.run_selected_button.pack(side=tk.LEFT, padx=3)
+        tk.Button(batch_buttons, text="Run All", command=lambda: self.run_batch(self.all_techniques)).pack(side=tk.LEFT, padx=3)
+        tk.Button(batch_buttons, text="Sweep Subdomains", command=self.run_sweep).pack(side=tk.LEFT, padx=3)
+        tk.Button(batch_buttons, text="Clear Selection", command=self.clear_selection).pack(side=tk.LEFT, padx=3)
+        tk.Checkbutton(batch_buttons, text="Skip checked", variable=self.skip_checked,
+                       bg="#F0F0F0").pack(side=tk.LEFT, padx=3)
+        tk.Label(batch_buttons, text="Shift+click buttons to select", fg="#555555", bg="#F0F0F0").pack(side=tk.LEFT, padx=8)
+        
+        # Technique filter - Ctrl+F to focus, Escape to clear
+        filter_frame = tk.Frame(self.root, bg="#F0F0F0")
+        filter_frame.pack(fill=tk.X, padx=20, pady=(6, 0))
+        filter_inner = tk.Frame(filter_frame, bg="#F0F0F0")
+        filter_inner.pack()
+        tk.Label(filter_inner, text="Filter:", bg="#F0F0F0").pack(side=tk.LEFT)
+        self.filter_entry = tk.Entry(filter_inner, width=40, relief=tk.SOLID, borderwidth=1)
+        self.filter_entry.pack(side=tk.LEFT, padx=5)
+        self.filter_entry.bind('<KeyRelease>', lambda e: self.schedule_filter())
+        self.filter_entry.bind('<Escape>', lambda e: self.clear_filter())
+        self.root.bind('<Control-f>', lambda e: self.filter_entry.focus_set())
+        self.match_label = tk.Label(filter_inner, text="", fg="#555555", bg="#F0F0F0")
+        self.match_label.pack(side=tk.LEFT, padx=8)
+        
+        self.create_status_bar()
         
         # Main button grid container - no scrollbars, direct frame, reduced padding
         main_container = tk.Frame(self.root, bg="#F0F0F0")
         main_container.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
         main_container.rowconfigure(0, weight=1)
         main_container.columnconfigure(0, weight=1)
+        self.startup.mark("window_built")
+        
+        # Show the window with the domain entry before any technique button exists
+        self.root.update_idletasks()
+        self.startup.mark("first_frame")
         
         # Create buttons in grid layout matching original
         self.create_new_button_grid(main_container)
     
-    def create_button_with_icon(self, parent, icon, text, func, row, col):
-        """Create button with icon and text - flexible sizing with text wrapping"""
+    def schedule_filter(self):
+        """Filter the grid once typing pauses for FILTER_DEBOUNCE_MS"""
+        if self._filter_job is not None:
+            self.root.after_cancel(self._filter_job)
+        self._filter_job = self.root.after(FILTER_DEBOUNCE_MS, self.apply_filter)
+    
+    def clear_filter(self):
+        """Empty the filter box and show all techniques again"""
+        self.filter_entry.delete(0, tk.END)
+        self.apply_filter()
+    
+    def apply_filter(self):
+        """Show only the techniques matching the filter text, creating buttons only for those shown"""
+        self._filter_job = None
+        if not self.grid_ready or self.index is None:
+            # The initial buttons are still being created, or the index is still being built
+            self.schedule_filter()
+            return
+        query = self.filter_entry.get()
+        self.grid_max_buttons = self.grid_button_cap()
+        self.visible_techniques = self.index.search(query, self.grid_max_buttons)
+        matches = self.index.count(query) if len(self.visible_techniques) == self.grid_max_buttons \
+            else len(self.visible_techniques)
+        self.button_grid.show([self.button_for(technique) for technique in self.visible_techniques],
+                              min_rows=self.grid_rows)
+        self.update_match_label(matches)
+    
+    def build_index(self):
+        """Start building the filter's search index on a background thread, once the grid is up"""
+        if self._index_thread is None:
+            import threading
+            from technique_index import TechniqueIndex
+            
+            def build():
+                self.index = TechniqueIndex(self.all_techniques)
+            self._index_thread = threading.Thread(target=build, name="bbr-index", daemon=True)
+            self._index_thread.start()
+    
+    def update_match_label(self, matches):
+        """Show how many techniques match, and how many of them are shown"""
+        shown = len(self.visible_techniques)
+        if shown < matches:
+            text = f"Showing {shown} of {matches} - type to narrow down"
+        elif matches < len(self.all_techniques):
+            text = f"{matches} of {len(self.all_techniques)} techniques"
+        else:
+            text = ""
+        self.match_label.config(text=text)
+    
+    def button_for(self, technique):
+        """The button of a technique, created on first use"""
+        btn = self.buttons.get(technique)
+        if btn is None:
+            btn = self.buttons[technique] = self.create_button_with_icon(
+                self.button_grid.container, technique.icon, technique.label, technique)
+        return btn
+    
+    def create_button_with_icon(self, parent, icon, text, technique):
+        """Create button with icon and text - flexible sizing with text wrapping
+        
+        The button is not placed; the ButtonGrid places it and manages its wraplength.
+        """
         # Create button with icon on top, text below
         btn_text = f"{icon}\n{text}" if icon else text
         
-        # Calculate wraplength based on estimated button width (approximately 90-100 pixels per column)
-        # Subtract some padding for icon and margins
-        estimated_width = 90
-        wraplength = max(60, estimated_width - 20)  # Ensure minimum wraplength
-        
         btn = tk.Button(parent, text=btn_text, 
-                       command=lambda: self.validate_and_run(func),
-                       font=("Arial", 12, "normal"),
+                       command=lambda: self.validate_and_run(technique),
+                       font=self.fonts["button"],
                        relief=tk.RAISED, borderwidth=1,
-                       bg="#FFFFFF", fg="#000000",
+                       bg="#FFFFFF", fg=CHECKED_FG if technique.id in self.checked_ids else "#000000",
                        justify=tk.CENTER,
-                       anchor=tk.CENTER,
-                       wraplength=wraplength)
-        btn.grid(row=row, column=col, padx=1, pady=1, sticky="nsew")
-        
-        # Bind to configure event to update wraplength when button is resized
-        def update_wraplength(event):
-            # Update wraplength to be slightly less than button width
-            new_wraplength = max(60, event.width - 20)
-            btn.config(wraplength=new_wraplength)
-        
-        btn.bind('<Configure>', update_wraplength)
+                       anchor=tk.CENTER)
+        btn.bind('<Shift-Button-1>', lambda e: self.toggle_selection(btn, technique))
         return btn
     
+    def grid_button_cap(self):
+        """Most buttons to show: BBR_GRID_MAX_BUTTONS, lowered to the rows that fit in the unscrolled grid"""
+        limit = config.get_int("grid_max_buttons", 240)
+        container = self.button_grid.container
+        height = container.winfo_height()
+        if height <= 1:
+            # Not laid out yet; the grid can be no taller than the screen
+            height = container.winfo_screenheight()
+        return min(limit, self.button_grid.capacity(height))
+    
     def create_new_button_grid(self, parent):
-        """Create button grid with 12 columns - simple layout, no sorting"""
-        # Configure grid columns (12 columns: 0-11)
-        for i in range(12):
-            parent.columnconfigure(i, weight=1, uniform="button_col", minsize=90)
-        
-        # Define all buttons in order (as they appear in recon_searches.py)
-        buttons = [
-            ("📁", "Directory Listing", recon_searches.directory_listing),
-            ("⚙️", "Configuration Files", recon_searches.configuration_files),
-            ("🗄️", "Database Files", recon_searches.database_files),
-            ("W", "WordPress", recon_searches.wordpress),
-            ("📋", "Log Files", recon_searches.log_files),
-            ("💾", "Backup and Old Files", recon_searches.backup_files),
-            ("🔐", "Login Pages", recon_searches.login_pages),
-            ("📄", "Publicly Exposed Documents", recon_searches.documents),
-            ("🐘", "phpinfo()", recon_searches.phpinfo),
-            ("🚪", "Finding Backdoors", recon_searches.backdoors),
-            ("📱", "Install / Setup files", recon_searches.install_setup_files),
-            ("🔧", "SQL Errors", recon_searches.sql_errors),
-            ("↗️", "Open Redirects", recon_searches.open_redirects),
-            ("💎", "Apache STRUTS RCE", recon_searches.apache_struts),
-            ("📋", "Find Pastebin entries", recon_searches.pastebin),
-            ("💼", "Employees on LINKEDIN", recon_searches.linkedin_employees),
-            ("S", "CVE-2020-0646 SharePoint RCE", recon_searches.sharepoint_rce),
-            ("📄", "API Endpoints - WSDL", recon_searches.wsdl_files),
-            ("🐙", "Search in GITHUB", recon_searches.github),
-            ("🐙", "Github GIST Searches", recon_searches.gist),
-            ("⚙️", "Apache Config Files", recon_searches.apache_config),
-            ("👥", "3rd Party Exposure", recon_searches.third_party_exposure),
-            ("🔵", "Search in Bitbucket and Atlassian", recon_searches.bitbucket_atlassian),
-            ("📁", ".git folder", recon_searches.git_folder),
-            ("🔵", "Traefik", recon_searches.traefik),
-            ("🔒", "Search in CT Logs", recon_searches.ct_logs),
-            ("🔒", ".htaccess sensitive files", recon_searches.htaccess_phpinfo),
-            ("🌍", "Find Subdomains", recon_searches.subdomains),
-            ("🌍", "Find Sub-Subdomains", recon_searches.sub_subdomains),
-            ("W", "Find WordPress #2", recon_searches.wordpress_exposure),
-            ("🗄️", "Find WordPress [Wayback Machine]", recon_searches.wordpress_wayback),
-            ("🐛", "Search in OpenBugBounty", recon_searches.openbugbounty),
-            ("🤖", "Search in Reddit", recon_searches.reddit),
-            ("📄", "Test CrossDomain", recon_searches.crossdomain_xml),
-            ("🤖", "Robots.txt File", recon_searches.robots_txt),
-            ("🛡️", "Check Security Headers", recon_searches.security_headers),
-            ("🎯", "Check in ThreatCrowd", recon_searches.threatcrowd),
-            ("🌀", "Passive Total", recon_searches.riskiq),
-            ("F", "Find .SWF file (Google)", recon_searches.swf_google),
-            ("▶️", "YouTube", recon_searches.youtube),
-            ("F", "Find .SWF file (Yandex)", recon_searches.swf_yandex),
-            ("F", "Search SWF in WayBack", recon_searches.swf_wayback),
-            ("🌐", "Search in Wayback Machine #2", recon_searches.swf_wayback_mime),
-            ("🌐", "Search in Wayback Machine #3", recon_searches.wayback_machine),
-            ("🔍", "Reverse IP Lookup", recon_searches.reverse_ip),
-            ("Q", "Sourcecode - PublicWWW", recon_searches.publicwww),
-            ("🔍", "Check in CENSYS [IP4]", recon_searches.censys_ipv4),
-            ("🔍", "Check in CENSYS [DOMAINS]", recon_searches.censys_domain),
-            ("🔍", "Check in CENSYS [CERTS]", recon_searches.censys_certificates),
-            ("8", "Search in SHODAN", recon_searches.shodan),
-            ("☁️", "Cloud Storage and Buckets", recon_searches.google_cse),
-            ("🔑", "Plaintext Password Leak", recon_searches.throwbin),
-            ("👁️", "DomainEye", recon_searches.domaineye),
-            ("🦊", "GitLab", recon_searches.gitlab),
-            ("📚", "Search in Stackoverflow", recon_searches.stackoverflow),
-            ("🪣", "s3 Buckets", recon_searches.s3_buckets),
-            ("💧", "Digital Ocean Spaces", recon_searches.digitalocean_spaces),
-            ("📊", "What CMS?", recon_searches.whatcms),
-        ]
-        
-        # Calculate number of rows needed
-        num_rows = (len(buttons) + 11) // 12  # Ceiling division
-        
-        # Configure rows
-        for i in range(num_rows):
-            parent.rowconfigure(i, weight=1, uniform="button_row", minsize=65)
-        
+        """Create button grid (12 columns unless BBR_GRID_COLUMNS says otherwise) - simple layout, no sorting
+        
+        Rows and columns are configured right away so the layout does not jump,
+        the buttons themselves are created a row at a time from idle callbacks.
+        """
+        self.button_grid = ButtonGrid(parent, columns=config.get_int("grid_columns", 12))
+        
+        # Built-in then imported techniques; only as many as fit get a button until filtered
+        from technique_store import load_catalogue
+        self.all_techniques = load_catalogue()
+        self.grid_max_buttons = self.grid_button_cap()
+        self.visible_techniques = self.all_techniques[:self.grid_max_buttons]
+        self.grid_rows = (len(self.visible_techniques) + self.button_grid.columns - 1) // self.button_grid.columns
+        self.button_grid.reserve(len(self.visible_techniques))
+        
+        self.root.after_idle(self.create_button_chunk, parent, 0)
+    
+    def create_button_chunk(self, parent, start):
+        """Create the next GRID_CHUNK_SIZE buttons, then schedule the rest"""
         # Place buttons in grid (left to right, top to bottom)
-        for index, (icon, text, func) in enumerate(buttons):
-            row = index // 12
-            col = index % 12
-            self.create_button_with_icon(parent, icon, text, func, row, col)
+        end = min(start + GRID_CHUNK_SIZE, len(self.visible_techniques))
+        for technique in self.visible_techniques[start:end]:
+            self.button_grid.add(self.button_for(technique))
+        
+        if end < len(self.visible_techniques):
+            self.root.after_idle(self.create_button_chunk, parent, end)
+        else:
+            self.button_grid.apply_layout()
+            self.grid_ready = True
+            self.update_match_label(len(self.all_techniques))
+            self.startup.mark("grid_complete")
+            self.startup.finish(self.report_timings)
+            self.root.after_idle(self.build_index)
+            self.root.after_idle(self.refresh_checked)
     
     def create_old_ui(self):
         """Create the old categorized UI"""
+        from tkinter import ttk
         self.root.geometry("800x700")
         
         # Domain input
         input_frame = ttk.Frame(self.root, padding="10")
         input_frame.pack(fill=tk.X)
         
-        ttk.Label(input_frame, text="Enter Target Domain:", font=("Arial", 12, "bold")).pack(side=tk.LEFT, padx=5)
-        self.domain_entry = ttk.Entry(input_frame, width=40, font=("Arial", 11))
+        ttk.Label(input_frame, text="Enter Target Domain:", font=self.fonts["label"]).pack(side=tk.LEFT, padx=5)
+        self.domain_entry = ttk.Entry(input_frame, width=40, font=self.fonts["old_entry"])
         self.domain_entry.pack(side=tk.LEFT, padx=5, fill=tk.X, expand=True)
-        self.domain_entry.bind('<Return>', lambda e: self.validate_and_run(recon_searches.directory_listing))
+        self.domain_entry.bind('<Return>', lambda e: self.validate_and_run(techniques.get("directory_listing")))
+        ttk.Button(input_frame, text="Run All", command=lambda: self.run_batch(self.all_techniques)).pack(side=tk.LEFT, padx=5)
         
         # Create scrollable frame for buttons
         canvas = tk.Canvas(self.root)
@@ -204,189 +547,42 @@ class BigBountyReconApp:
         canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
         canvas.configure(yscrollcommand=scrollbar.set)
         
+        self.create_status_bar()
         canvas.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
         
         # Create button groups
         self.create_button_groups(scrollable_frame)
     
-    def create_button(self, parent, text, func, row, col, width=30):
+    def create_button(self, parent, text, technique, row, col, width=30):
         """Helper method to create buttons"""
-        btn = ttk.Button(parent, text=text, command=lambda: self.validate_and_run(func), width=width)
+        from tkinter import ttk
+        btn = ttk.Button(parent, text=text, command=lambda: self.validate_and_run(technique), width=width)
         btn.grid(row=row, column=col, padx=5, pady=3, sticky="ew")
+        self.section_techniques.setdefault(parent, []).append(technique)
+        self.all_techniques.append(technique)
         return btn
     
     def create_button_groups(self, parent):
         """Create all button groups organized by category"""
-        row = 0
-        
-        # File Searches Section
-        file_frame = ttk.LabelFrame(parent, text="File Searches", padding="10")
-        file_frame.grid(row=row, column=0, columnspan=2, sticky="ew", padx=10, pady=5)
-        file_frame.columnconfigure(0, weight=1)
-        file_frame.columnconfigure(1, weight=1)
-        
-        file_row = 0
-        self.create_button(file_frame, "Directory Listing", recon_searches.directory_listing, file_row, 0)
-        self.create_button(file_frame, "Configuration Files", recon_searches.configuration_files, file_row, 1)
-        file_row += 1
-        self.create_button(file_frame, "Database Files", recon_searches.database_files, file_row, 0)
-        self.create_button(file_frame, "Log Files", recon_searches.log_files, file_row, 1)
-        file_row += 1
-        self.create_button(file_frame, "Backup Files", recon_searches.backup_files, file_row, 0)
-        self.create_button(file_frame, "Documents", recon_searches.documents, file_row, 1)
-        file_row += 1
-        self.create_button(file_frame, "Apache Config", recon_searches.apache_config, file_row, 0)
-        self.create_button(file_frame, ".htaccess/phpinfo", recon_searches.htaccess_phpinfo, file_row, 1)
-        file_row += 1
-        self.create_button(file_frame, "phpinfo", recon_searches.phpinfo, file_row, 0)
-        self.create_button(file_frame, "Install/Setup Files", recon_searches.install_setup_files, file_row, 1)
-        file_row += 1
-        self.create_button(file_frame, "Backdoors", recon_searches.backdoors, file_row, 0)
-        self.create_button(file_frame, "robots.txt", recon_searches.robots_txt, file_row, 1)
-        file_row += 1
-        self.create_button(file_frame, "crossdomain.xml", recon_searches.crossdomain_xml, file_row, 0)
-        self.create_button(file_frame, ".git Folder", recon_searches.git_folder, file_row, 1)
-        
-        row += 1
-        
-        # WordPress Section
-        wp_frame = ttk.LabelFrame(parent, text="WordPress", padding="10")
-        wp_frame.grid(row=row, column=0, columnspan=2, sticky="ew", padx=10, pady=5)
-        wp_frame.columnconfigure(0, weight=1)
-        wp_frame.columnconfigure(1, weight=1)
-        
-        wp_row = 0
-        self.create_button(wp_frame, "WordPress", recon_searches.wordpress, wp_row, 0)
-        self.create_button(wp_frame, "WordPress Exposure", recon_searches.wordpress_exposure, wp_row, 1)
-        wp_row += 1
-        self.create_button(wp_frame, "WordPress Wayback", recon_searches.wordpress_wayback, wp_row, 0)
-        
-        row += 1
-        
-        # Authentication & Errors Section
-        auth_frame = ttk.LabelFrame(parent, text="Authentication & Errors", padding="10")
-        auth_frame.grid(row=row, column=0, columnspan=2, sticky="ew", padx=10, pady=5)
-        auth_frame.columnconfigure(0, weight=1)
-        auth_frame.columnconfigure(1, weight=1)
-        
-        auth_row = 0
-        self.create_button(auth_frame, "Login Pages", recon_searches.login_pages, auth_row, 0)
-        self.create_button(auth_frame, "SQL Errors", recon_searches.sql_errors, auth_row, 1)
-        auth_row += 1
-        self.create_button(auth_frame, "Open Redirects", recon_searches.open_redirects, auth_row, 0)
-        self.create_button(auth_frame, "Apache Struts", recon_searches.apache_struts, auth_row, 1)
-        
-        row += 1
-        
-        # Subdomains Section
-        subdomain_frame = ttk.LabelFrame(parent, text="Subdomains", padding="10")
-        subdomain_frame.grid(row=row, column=0, columnspan=2, sticky="ew", padx=10, pady=5)
-        subdomain_frame.columnconfigure(0, weight=1)
-        subdomain_frame.columnconfigure(1, weight=1)
-        
-        sub_row = 0
-        self.create_button(subdomain_frame, "Subdomains", recon_searches.subdomains, sub_row, 0)
-        self.create_button(subdomain_frame, "Sub-subdomains", recon_searches.sub_subdomains, sub_row, 1)
-        sub_row += 1
-        self.create_button(subdomain_frame, "CT Logs (crt.sh)", recon_searches.ct_logs, sub_row, 0)
-        self.create_button(subdomain_frame, "Reverse IP", recon_searches.reverse_ip, sub_row, 1)
-        
-        row += 1
-        
-        # Third-party Services Section
-        thirdparty_frame = ttk.LabelFrame(parent, text="Third-party Services", padding="10")
-        thirdparty_frame.grid(row=row, column=0, columnspan=2, sticky="ew", padx=10, pady=5)
-        thirdparty_frame.columnconfigure(0, weight=1)
-        thirdparty_frame.columnconfigure(1, weight=1)
-        
-        tp_row = 0
-        self.create_button(thirdparty_frame, "GitHub", recon_searches.github, tp_row, 0)
-        self.create_button(thirdparty_frame, "Gist", recon_searches.gist, tp_row, 1)
-        tp_row += 1
-        self.create_button(thirdparty_frame, "GitLab", recon_searches.gitlab, tp_row, 0)
-        self.create_button(thirdparty_frame, "Pastebin", recon_searches.pastebin, tp_row, 1)
-        tp_row += 1
-        self.create_button(thirdparty_frame, "Throwbin", recon_searches.throwbin, tp_row, 0)
-        self.create_button(thirdparty_frame, "StackOverflow", recon_searches.stackoverflow, tp_row, 1)
-        tp_row += 1
-        self.create_button(thirdparty_frame, "LinkedIn Employees", recon_searches.linkedin_employees, tp_row, 0)
-        self.create_button(thirdparty_frame, "Reddit", recon_searches.reddit, tp_row, 1)
-        tp_row += 1
-        self.create_button(thirdparty_frame, "YouTube", recon_searches.youtube, tp_row, 0)
-        self.create_button(thirdparty_frame, "Third-party Exposure", recon_searches.third_party_exposure, tp_row, 1)
-        tp_row += 1
-        self.create_button(thirdparty_frame, "BitBucket & Atlassian", recon_searches.bitbucket_atlassian, tp_row, 0)
-        
-        row += 1
-        
-        # Security Tools Section
-        security_frame = ttk.LabelFrame(parent, text="Security Tools", padding="10")
-        security_frame.grid(row=row, column=0, columnspan=2, sticky="ew", padx=10, pady=5)
-        security_frame.columnconfigure(0, weight=1)
-        security_frame.columnconfigure(1, weight=1)
-        
-        sec_row = 0
-        self.create_button(security_frame, "Shodan", recon_searches.shodan, sec_row, 0)
-        self.create_button(security_frame, "Censys IPv4", recon_searches.censys_ipv4, sec_row, 1)
-        sec_row += 1
-        self.create_button(security_frame, "Censys Domain", recon_searches.censys_domain, sec_row, 0)
-        self.create_button(security_frame, "Censys Certificates", recon_searches.censys_certificates, sec_row, 1)
-        sec_row += 1
-        self.create_button(security_frame, "ThreatCrowd", recon_searches.threatcrowd, sec_row, 0)
-        self.create_button(security_frame, "RiskIQ", recon_searches.riskiq, sec_row, 1)
-        sec_row += 1
-        self.create_button(security_frame, "Security Headers", recon_searches.security_headers, sec_row, 0)
-        self.create_button(security_frame, "OpenBugBounty", recon_searches.openbugbounty, sec_row, 1)
-        sec_row += 1
-        self.create_button(security_frame, "DomainEye", recon_searches.domaineye, sec_row, 0)
-        self.create_button(security_frame, "What CMS", recon_searches.whatcms, sec_row, 1)
-        sec_row += 1
-        self.create_button(security_frame, "PublicWWW", recon_searches.publicwww, sec_row, 0)
-        self.create_button(security_frame, "Google CSE", recon_searches.google_cse, sec_row, 1)
-        
-        row += 1
-        
-        # Archive & Wayback Section
-        archive_frame = ttk.LabelFrame(parent, text="Archive & Wayback", padding="10")
-        archive_frame.grid(row=row, column=0, columnspan=2, sticky="ew", padx=10, pady=5)
-        archive_frame.columnconfigure(0, weight=1)
-        archive_frame.columnconfigure(1, weight=1)
-        
-        arch_row = 0
-        self.create_button(archive_frame, "Wayback Machine", recon_searches.wayback_machine, arch_row, 0)
-        self.create_button(archive_frame, "SWF (Google)", recon_searches.swf_google, arch_row, 1)
-        arch_row += 1
-        self.create_button(archive_frame, "SWF (Yandex)", recon_searches.swf_yandex, arch_row, 0)
-        self.create_button(archive_frame, "SWF (Wayback)", recon_searches.swf_wayback, arch_row, 1)
-        arch_row += 1
-        self.create_button(archive_frame, "SWF (Wayback MIME)", recon_searches.swf_wayback_mime, arch_row, 0)
-        
-        row += 1
-        
-        # Cloud Storage Section
-        cloud_frame = ttk.LabelFrame(parent, text="Cloud Storage", padding="10")
-        cloud_frame.grid(row=row, column=0, columnspan=2, sticky="ew", padx=10, pady=5)
-        cloud_frame.columnconfigure(0, weight=1)
-        cloud_frame.columnconfigure(1, weight=1)
-        
-        cloud_row = 0
-        self.create_button(cloud_frame, "S3 Buckets", recon_searches.s3_buckets, cloud_row, 0)
-        self.create_button(cloud_frame, "DigitalOcean Spaces", recon_searches.digitalocean_spaces, cloud_row, 1)
-        
-        row += 1
-        
-        # API & Services Section
-        api_frame = ttk.LabelFrame(parent, text="API & Services", padding="10")
-        api_frame.grid(row=row, column=0, columnspan=2, sticky="ew", padx=10, pady=5)
-        api_frame.columnconfigure(0, weight=1)
-        api_frame.columnconfigure(1, weight=1)
-        
-        api_row = 0
-        self.create_button(api_frame, "WSDL Files", recon_searches.wsdl_files, api_row, 0)
-        self.create_button(api_frame, "SharePoint RCE", recon_searches.sharepoint_rce, api_row, 1)
-        api_row += 1
-        self.create_button(api_frame, "Traefik", recon_searches.traefik, api_row, 0)
+        from tkinter import ttk
+        self.section_techniques = {}  # section frame -> techniques, for running a whole section
+        
+        for row, category in enumerate(techniques.CATEGORIES):
+            frame = ttk.LabelFrame(parent, text=category, padding="10")
+            frame.grid(row=row, column=0, columnspan=2, sticky="ew", padx=10, pady=5)
+            frame.columnconfigure(0, weight=1)
+            frame.columnconfigure(1, weight=1)
+            
+            # Two buttons per row
+            for index, technique in enumerate(techniques.by_category(category)):
+                self.create_button(frame, technique.short_label, technique, index // 2, index % 2)
+        
+        # Each section can be run as one batch
+        for frame, section in self.section_techniques.items():
+            _, frame_rows = frame.grid_size()
+            ttk.Button(frame, text="Run All in Section", command=lambda section=section: self.run_batch(section)).grid(
+                row=frame_rows, column=0, columnspan=2, padx=5, pady=3, sticky="ew")
         
         # Configure parent grid
         parent.columnconfigure(0, weight=1)
@@ -394,8 +590,10 @@ class BigBountyReconApp:
 
 
 def main():
+    # Startup phase timings are printed with --startup-timings or BBR_STARTUP_TIMINGS=1
+    report_timings = "--startup-timings" in sys.argv[1:] or config.get_bool("startup_timings")
     root = tk.Tk()
-    app = BigBountyReconApp(root)
+    app = BigBountyReconApp(root, report_timings=report_timings)
     root.mainloop()
 
 
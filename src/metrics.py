@@ -0,0 +1,228 @@
+"""
+Timing metrics for BigBountyRecon
+Collects per-stage, per-technique latency histograms and event counters for the
+path from a button click to an opened tab (validation, URL build, browser
+resolution, rate limit wait, browser launch) and for the fetchers
+
+Metrics are off unless BBR_METRICS=1 or BBR_METRICS_FILE is set (or
+enable() is called); while off, timed() hands back one shared no-op context
+manager and observe()/count() return at once. With a metrics file set, the
+metrics are written there when the process exits: Prometheus text format if
+the name ends in .prom (for node_exporter's textfile collector), JSON otherwise.
+"""
+
+import atexit
+import bisect
+import json
+import os
+import threading
+import time
+
+import config
+
+# Histogram bucket upper bounds in seconds; the last bucket is +Inf
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class Histogram:
+    """Latency histogram with fixed buckets, plus count, sum and max"""
+
+    __slots__ = ("buckets", "count", "sum", "max")
+
+    def __init__(self):
+        self.buckets = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds):
+        self.buckets[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-quantile (the max for the +Inf bucket)"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if seen >= rank and n:
+                return min(BUCKETS[i], self.max) if i < len(BUCKETS) else self.max
+        return self.max
+
+
+class Registry:
+    """Thread-safe store of histograms keyed by (stage, technique) and counters keyed by (event, technique)"""
+
+    def __init__(self):
+        self.histograms = {}
+        self.counters = {}
+        self.started = time.time()
+        self._lock = threading.Lock()
+
+    def observe(self, stage, seconds, technique=""):
+        key = (stage, technique)
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(seconds)
+
+    def count(self, event, technique="", n=1):
+        key = (event, technique)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + n
+
+    def snapshot(self):
+        """Plain-data copy of all metrics, as written to the JSON export"""
+        with self._lock:
+            histograms = [(key, list(h.buckets), h.count, h.sum, h.max, h.quantile(0.5), h.quantile(0.95))
+                          for key, h in sorted(self.histograms.items())]
+            counters = sorted(self.counters.items())
+        return {
+            "started": self.started,
+            "generated": time.time(),
+            "buckets": list(BUCKETS),
+            "stages": [{"stage": stage, "technique": technique, "count": count, "sum": total, "max": peak,
+                        "p50": p50, "p95": p95, "buckets": buckets}
+                       for (stage, technique), buckets, count, total, peak, p50, p95 in histograms],
+            "counters": [{"event": event, "technique": technique, "value": value}
+                         for (event, technique), value in counters],
+        }
+
+    def reset(self):
+        with self._lock:
+            self.histograms.clear()
+            self.counters.clear()
+            self.started = time.time()
+
+
+def _label(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def to_json(snapshot):
+    return json.dumps(snapshot, indent=2)
+
+
+def to_prometheus(snapshot):
+    """Prometheus text exposition format of a snapshot"""
+    lines = ["# HELP bbr_stage_seconds Time spent in each stage of a technique launch or fetch",
+             "# TYPE bbr_stage_seconds histogram"]
+    bounds = [str(bound) for bound in snapshot["buckets"]] + ["+Inf"]
+    for entry in snapshot["stages"]:
+        labels = f'stage="{_label(entry["stage"])}",technique="{_label(entry["technique"])}"'
+        cumulative = 0
+        for bound, n in zip(bounds, entry["buckets"]):
+            cumulative += n
+            lines.append(f'bbr_stage_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f"bbr_stage_seconds_sum{{{labels}}} {entry['sum']!r}")
+        lines.append(f"bbr_stage_seconds_count{{{labels}}} {entry['count']}")
+    lines.append("# HELP bbr_events_total Launches, fetches and errors by technique")
+    lines.append("# TYPE bbr_events_total counter")
+    for entry in snapshot["counters"]:
+        lines.append(f'bbr_events_total{{event="{_label(entry["event"])}",'
+                     f'technique="{_label(entry["technique"])}"}} {entry["value"]}')
+    return "\n".join(lines) + "\n"
+
+
+def write(path, snapshot=None):
+    """Write the metrics to path, Prometheus format for *.prom and JSON otherwise
+
+    The file is replaced atomically so a collector never reads half of it.
+    """
+    snapshot = snapshot if snapshot is not None else get_registry().snapshot()
+    text = to_prometheus(snapshot) if path.endswith(".prom") else to_json(snapshot)
+    temp = path + ".tmp"
+    with open(temp, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(temp, path)
+
+
+class _Timer:
+    __slots__ = ("registry", "stage", "technique", "start")
+
+    def __init__(self, registry, stage, technique):
+        self.registry = registry
+        self.stage = stage
+        self.technique = technique
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.registry.observe(self.stage, time.perf_counter() - self.start, self.technique)
+        return False
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+_registry = None
+_configured = False
+_lock = threading.Lock()
+
+
+def enable(path=None):
+    """Start collecting metrics; if path is given they are written there at exit"""
+    global _registry, _configured
+    with _lock:
+        _configured = True
+        if _registry is None:
+            _registry = Registry()
+        if path:
+            atexit.register(write, path)
+    return _registry
+
+
+def _configure():
+    global _configured
+    path = config.get("metrics_file")
+    if path or config.get_bool("metrics"):
+        enable(path)
+    _configured = True
+
+
+def get_registry():
+    """The process-wide registry, or None while metrics are off"""
+    if not _configured:
+        _configure()
+    return _registry
+
+
+def enabled():
+    return get_registry() is not None
+
+
+def timed(stage, technique=""):
+    """Context manager recording how long its block took under (stage, technique)"""
+    registry = _registry if _configured else get_registry()
+    if registry is None:
+        return _NULL_TIMER
+    return _Timer(registry, stage, technique)
+
+
+def observe(stage, seconds, technique=""):
+    registry = _registry if _configured else get_registry()
+    if registry is not None:
+        registry.observe(stage, seconds, technique)
+
+
+def count(event, technique="", n=1):
+    registry = _registry if _configured else get_registry()
+    if registry is not None:
+        registry.count(event, technique, n)
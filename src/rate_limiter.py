@@ -0,0 +1,231 @@
+"""
+Per-host rate limiting for BigBountyRecon
+Token buckets per search engine / service so a sweep does not get the egress IP
+CAPTCHA-blocked, with bucket state persisted across restarts
+"""
+
+import atexit
+import heapq
+import json
+import os
+import sys
+import threading
+import time
+import urllib.parse
+
+import config
+
+# Default limits per host: (requests per minute, burst size)
+DEFAULT_LIMITS = {
+    "www.google.com": (12, 6),
+    "cse.google.com": (12, 6),
+    "yandex.com": (10, 4),
+    "web.archive.org": (20, 5),
+    "wwwb-dedup.us.archive.org": (20, 5),
+    "crt.sh": (20, 5),
+    "censys.io": (10, 3),
+    "www.shodan.io": (15, 5),
+    "github.com": (20, 10),
+}
+
+# Limit for hosts not listed above
+FALLBACK_LIMIT = (60, 20)
+
+
+def _warn(message):
+    print(f"rate limits: {message}", file=sys.stderr)
+
+
+def parse_limit(value):
+    """(per_minute, burst) of a [per_minute, burst] pair, or None if it is not one"""
+    try:
+        per_minute, burst = value
+        per_minute, burst = float(per_minute), float(burst)
+    except (TypeError, ValueError):
+        return None
+    if per_minute < 0 or burst < 1:
+        return None
+    return per_minute, burst
+
+
+def host_of(url):
+    """Host part of a URL, lowercased"""
+    return (urllib.parse.urlsplit(url).hostname or "").lower()
+
+
+class TokenBucket:
+    """Token bucket that hands out reservations
+
+    reserve() always succeeds and returns how long the caller must wait
+    before using its token, so callers can plan a schedule up front.
+    """
+
+    def __init__(self, per_minute, burst, tokens=None, updated=None):
+        self.rate = per_minute / 60.0
+        self.burst = float(burst)
+        self.tokens = self.burst if tokens is None else min(float(tokens), self.burst)
+        self.updated = time.time() if updated is None else updated
+
+    def _refill(self, now):
+        if now > self.updated:
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+    def reserve(self, now=None):
+        """Take a token, returning the number of seconds to wait before it may be used"""
+        now = time.time() if now is None else now
+        self._refill(now)
+        self.tokens -= 1
+        if self.tokens >= 0 or self.rate <= 0:
+            return 0.0
+        return -self.tokens / self.rate
+
+
+class HostRateLimiter:
+    """Token bucket per host, with state saved to a JSON file"""
+
+    def __init__(self, limits=None, state_file=None):
+        self.limits = dict(DEFAULT_LIMITS)
+        self.limits.update(limits or {})
+        self.state_file = state_file
+        self._buckets = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _bucket(self, host):
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            per_minute, burst = self.limits.get(host, FALLBACK_LIMIT)
+            bucket = self._buckets[host] = TokenBucket(per_minute, burst)
+        return bucket
+
+    def reserve(self, url, now=None):
+        """Reserve a request slot for url's host, returning seconds to wait"""
+        with self._lock:
+            return self._bucket(host_of(url)).reserve(now)
+
+    def acquire(self, url):
+        """Block until a request to url's host is allowed"""
+        wait = self.reserve(url)
+        if wait > 0:
+            time.sleep(wait)
+
+    def schedule(self, urls, now=None, key=None):
+        """Plan when each URL may be opened, as a list of (ready_time, url) in time order
+
+        URLs are grouped by host and the hosts are interleaved: each host's
+        URLs are spaced by that host's bucket, and URLs for different hosts
+        fill the gaps, so a slow host does not hold back the others. key(url),
+        if given, is the URL whose host's bucket applies.
+        """
+        now = time.time() if now is None else now
+        by_host = {}
+        for url in urls:
+            by_host.setdefault(host_of(key(url) if key else url), []).append(url)
+
+        plan = []
+        with self._lock:
+            for order, (host, host_urls) in enumerate(by_host.items()):
+                bucket = self._bucket(host)
+                for position, url in enumerate(host_urls):
+                    # Position before host order interleaves hosts round-robin when ready at the same time
+                    heapq.heappush(plan, (now + bucket.reserve(now), position, order, url))
+        return [(ready, url) for ready, _, _, url in (heapq.heappop(plan) for _ in range(len(plan)))]
+
+    def run(self, urls, open_many, group_window=1.0, key=None):
+        """Open URLs according to schedule(), batching URLs that become ready together
+
+        open_many(list_of_urls) is called once per group of URLs whose ready
+        times fall within group_window seconds of each other. Blocks until
+        the last group has been opened, so call it from a worker thread.
+        """
+        plan = self.schedule(urls, key=key)
+        index = 0
+        while index < len(plan):
+            group_start = plan[index][0]
+            group = []
+            while index < len(plan) and plan[index][0] - group_start <= group_window:
+                group.append(plan[index][1])
+                index += 1
+            wait = group_start - time.time()
+            if wait > 0:
+                time.sleep(wait)
+            open_many(group)
+        self.save()
+
+    def _load(self):
+        """Restore bucket levels from the state file, if there is one"""
+        if not self.state_file:
+            return
+        try:
+            with open(self.state_file, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return
+        if not isinstance(state, dict):
+            _warn(f"ignoring {self.state_file}: not a JSON object")
+            return
+        for host, value in state.items():
+            try:
+                tokens, updated = value
+                tokens, updated = float(tokens), float(updated)
+            except (TypeError, ValueError):
+                _warn(f"ignoring saved state for {host!r} in {self.state_file}")
+                continue
+            per_minute, burst = self.limits.get(host, FALLBACK_LIMIT)
+            self._buckets[host] = TokenBucket(per_minute, burst, tokens, updated)
+
+    def save(self):
+        """Write bucket levels to the state file"""
+        if not self.state_file:
+            return
+        with self._lock:
+            state = {host: [bucket.tokens, bucket.updated] for host, bucket in self._buckets.items()}
+        tmp = self.state_file + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(state, f)
+            os.replace(tmp, self.state_file)
+        except OSError:
+            pass
+
+
+def configured_limits():
+    """Limits from the "rate_limits" setting: {"host": [per_minute, burst]} as JSON or a dict"""
+    limits = config.get("rate_limits")
+    if limits is None:
+        return {}
+    if isinstance(limits, str):
+        try:
+            limits = json.loads(limits)
+        except ValueError:
+            _warn("ignoring rate_limits: not valid JSON")
+            return {}
+    if not isinstance(limits, dict):
+        _warn('ignoring rate_limits: expected {"host": [per_minute, burst]}')
+        return {}
+    parsed = {}
+    for host, value in limits.items():
+        limit = parse_limit(value)
+        if limit is None:
+            _warn(f"ignoring rate_limits entry for {host!r}: expected [per_minute, burst]")
+            continue
+        parsed[host.lower()] = limit
+    return parsed
+
+
+_limiter = None
+_limiter_lock = threading.Lock()
+
+
+def get_limiter():
+    """Process-wide limiter, or None if rate limiting is disabled with BBR_RATE_LIMIT=0"""
+    global _limiter
+    if not config.get_bool("rate_limit", True):
+        return None
+    if _limiter is None:
+        with _limiter_lock:
+            if _limiter is None:
+                _limiter = HostRateLimiter(configured_limits(), config.state_path("rate_limits.json"))
+                atexit.register(_limiter.save)
+    return _limiter
@@ -0,0 +1,191 @@
+"""
+Incremental Wayback CDX and Certificate Transparency refresh for BigBountyRecon
+Re-checks monitored domains by fetching only what is newer than the last run
+and reporting only the URLs and subdomains not seen before
+
+Each (domain, source) pair has a watermark in ~/.bigbountyrecon/refresh.sqlite3:
+the newest CDX capture timestamp or the highest crt.sh certificate id seen.
+CDX queries are sent with from=<watermark>, so the archive only returns
+captures since the last refresh. crt.sh's JSON output cannot be filtered
+server-side, so certificates at or below the watermark id are skipped as the
+response streams in. Everything found is merged into a stored set per
+(domain, source), and only items missing from it are reported as new.
+
+A watermark only moves after the whole response has been read: a CDX page
+cut short or a crt.sh array without its closing bracket is an error, and
+the next refresh starts again from the old watermark.
+"""
+
+import asyncio
+import sqlite3
+import threading
+import time
+
+import cdx
+import cdx_analyze
+import config
+import ct_harvest
+
+CT_SOURCE = "ct_logs"
+
+# Items merged into the store per transaction while a CDX query streams in
+BATCH_SIZE = 5000
+
+
+class RefreshStore:
+    """Watermarks and the set of items already seen, per (domain, source)"""
+
+    def __init__(self, path):
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS watermarks ("
+            " domain TEXT, source TEXT, mark TEXT, refreshed_at REAL, PRIMARY KEY (domain, source)) WITHOUT ROWID")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS seen ("
+            " domain TEXT, source TEXT, item TEXT, first_seen REAL, PRIMARY KEY (domain, source, item)) WITHOUT ROWID")
+
+    def watermark(self, domain, source):
+        """Watermark of the last completed refresh, or None if there was none"""
+        with self._lock:
+            row = self._db.execute("SELECT mark FROM watermarks WHERE domain = ? AND source = ?",
+                                   (domain, source)).fetchone()
+        return row[0] if row else None
+
+    def merge(self, domain, source, items, seen_at=None):
+        """Add (key, value) items to the stored set in one transaction; returns the values whose key was new"""
+        seen_at = seen_at if seen_at is not None else time.time()
+        new = []
+        with self._lock:
+            self._db.execute("BEGIN")
+            try:
+                for key, value in items:
+                    cursor = self._db.execute("INSERT OR IGNORE INTO seen VALUES (?, ?, ?, ?)",
+                                              (domain, source, key, seen_at))
+                    if cursor.rowcount:
+                        new.append(value)
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        return new
+
+    def set_watermark(self, domain, source, mark):
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO watermarks VALUES (?, ?, ?, ?)",
+                             (domain, source, mark, time.time()))
+
+    def count(self, domain, source):
+        """Number of items stored for (domain, source)"""
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM seen WHERE domain = ? AND source = ?",
+                                    (domain, source)).fetchone()[0]
+
+    def forget(self, domain, source=None):
+        """Drop the watermarks and stored items of a domain (one source or all), so the next refresh is full"""
+        where, params = ("domain = ?", (domain,)) if source is None else ("domain = ? AND source = ?", (domain, source))
+        with self._lock:
+            self._db.execute("BEGIN")
+            self._db.execute("DELETE FROM watermarks WHERE " + where, params)
+            self._db.execute("DELETE FROM seen WHERE " + where, params)
+            self._db.execute("COMMIT")
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+class RefreshResult:
+    """Outcome of refreshing one (domain, source)"""
+
+    __slots__ = ("domain", "source", "previous", "watermark", "fetched", "new", "error")
+
+    def __init__(self, domain, source, previous):
+        self.domain = domain
+        self.source = source
+        self.previous = previous
+        self.watermark = previous
+        self.fetched = 0
+        self.new = []
+        self.error = None
+
+
+def cdx_query(technique_id, domain, since=None, base_url=None):
+    """(endpoint, params) of a CDX technique's query, with timestamps and only captures from since on"""
+    endpoint, params = cdx.technique_query(technique_id, domain, base_url)
+    fields = dict(params).get("fl")
+    if fields and "timestamp" not in fields.split(","):
+        params = [(key, value + ",timestamp" if key == "fl" else value) for key, value in params]
+    if since:
+        params.append(("from", since))
+    return endpoint, params
+
+
+def refresh_cdx(store, technique_id, domain, base_url=None, page_size=5000):
+    """Fetch a CDX technique's captures since its watermark, merging the URLs into the store
+
+    The watermark only moves once the whole query has been read, so an
+    interrupted refresh is repeated from the same point; URLs it already
+    merged are not reported again.
+    """
+    result = RefreshResult(domain, technique_id, store.watermark(domain, technique_id))
+    endpoint, params = cdx_query(technique_id, domain, result.previous, base_url)
+    newest = result.previous or ""
+    batch = []
+    complete = False
+    try:
+        for record in cdx.CdxClient(page_size=page_size).iter_records(endpoint, params):
+            result.fetched += 1
+            if record.timestamp > newest:
+                newest = record.timestamp
+            batch.append((cdx_analyze.url_key(record.original), record.original))
+            if len(batch) >= BATCH_SIZE:
+                result.new.extend(store.merge(domain, technique_id, batch))
+                batch = []
+        complete = True
+    except cdx.CdxError as e:
+        result.error = str(e)
+    result.new.extend(store.merge(domain, technique_id, batch))
+    # Results are sorted by urlkey, not time, so the newest timestamp of a partial read
+    # can be later than captures that never arrived
+    if complete and newest:
+        store.set_watermark(domain, technique_id, newest)
+        result.watermark = newest
+    return result
+
+
+def refresh_ct(store, domains, base_url=ct_harvest.CRT_SH_URL, concurrency=4, timeout=120):
+    """Query crt.sh for certificates newer than each domain's watermark, merging the names into the store"""
+    domains = list(dict.fromkeys(domains))
+    results = {domain: RefreshResult(domain, CT_SOURCE, store.watermark(domain, CT_SOURCE)) for domain in domains}
+    harvester = ct_harvest.CtHarvester(concurrency=concurrency, timeout=timeout, base_url=base_url)
+    harvester.since = {domain: int(result.previous) for domain, result in results.items() if result.previous}
+    asyncio.run(harvester.harvest(domains))
+    for domain, result in results.items():
+        result.error = harvester.errors.get(domain)
+        if result.error is not None:
+            continue
+        names = harvester.subdomains.get(domain, ())
+        result.fetched = len(names)
+        result.new = sorted(store.merge(domain, CT_SOURCE, ((name, name) for name in names)))
+        latest = harvester.latest.get(domain)
+        if latest is not None and (result.previous is None or latest > int(result.previous)):
+            result.watermark = str(latest)
+            store.set_watermark(domain, CT_SOURCE, result.watermark)
+    return list(results.values())
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """Process-wide store at ~/.bigbountyrecon/refresh.sqlite3"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = RefreshStore(config.state_path("refresh.sqlite3"))
+    return _store
@@ -0,0 +1,175 @@
+"""
+Bulk report export for BigBountyRecon
+Renders every technique URL for every domain in a scope into a self-contained
+HTML report (grouped by domain and category) and/or a JSON report
+
+Domains are split into chunks that worker processes render to HTML and JSON
+text; chunks are written in input order as they come back, with a bounded
+number in flight, so memory use does not grow with the size of the scope.
+"""
+
+import collections
+import concurrent.futures
+import html
+import itertools
+import json
+import os
+import time
+
+import techniques
+
+HTML_HEAD = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>
+body {{ font-family: Arial, sans-serif; margin: 2em; color: #000; background: #F0F0F0; }}
+h1 {{ font-size: 24px; }}
+details {{ background: #FFF; border: 1px solid #CCC; margin: 4px 0; padding: 4px 10px; }}
+summary {{ font-weight: bold; cursor: pointer; }}
+h3 {{ font-size: 14px; margin: 10px 0 4px; color: #555; }}
+ul {{ margin: 0; padding-left: 20px; }}
+li {{ font-size: 13px; line-height: 1.5; }}
+a {{ color: #0645AD; }}
+</style>
+</head>
+<body>
+<h1>{title}</h1>
+<p>Generated {generated} &middot; {technique_count} techniques per domain</p>
+"""
+
+HTML_TAIL = """<p>{domains} domains, {urls} links</p>
+</body>
+</html>
+"""
+
+# Techniques used by the worker processes, set once per process by _init_worker
+_worker_techniques = None
+
+
+def _init_worker(selected):
+    global _worker_techniques
+    _worker_techniques = selected
+
+
+def grouped(selected):
+    """Techniques grouped by category, categories in registry order then any others"""
+    groups = collections.OrderedDict((category, []) for category in techniques.CATEGORIES)
+    for technique in selected:
+        groups.setdefault(technique.category, []).append(technique)
+    return [(category, items) for category, items in groups.items() if items]
+
+
+def render_chunk(domains, want_html=True, want_json=True, selected=None):
+    """Render one chunk of domains to (html text, json text, url count)
+
+    The JSON text is the chunk's domain objects joined by ",\\n", ready to be
+    placed inside the report's "domains" array.
+    """
+    selected = selected if selected is not None else _worker_techniques
+    groups = grouped(selected)
+    html_parts = []
+    json_parts = []
+    urls = 0
+    for domain in domains:
+        rendered = {technique.id: url for technique, url in techniques.render_all(domain, selected)}
+        urls += len(rendered)
+        if want_html:
+            html_parts.append(f"<details><summary>{html.escape(domain)}</summary>\n")
+            for category, items in groups:
+                html_parts.append(f"<h3>{html.escape(category)}</h3>\n<ul>\n")
+                for technique in items:
+                    html_parts.append(f'<li><a href="{html.escape(rendered[technique.id])}" target="_blank" '
+                                      f'rel="noopener noreferrer">{html.escape(technique.label)}</a></li>\n')
+                html_parts.append("</ul>\n")
+            html_parts.append("</details>\n")
+        if want_json:
+            json_parts.append(json.dumps({
+                "domain": domain,
+                "categories": {category: [{"technique": technique.id, "label": technique.label,
+                                           "url": rendered[technique.id]} for technique in items]
+                               for category, items in groups},
+            }))
+    return "".join(html_parts), ",\n".join(json_parts), urls
+
+
+def chunks(iterable, size):
+    """Yield lists of up to size items from an iterable without reading it all"""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class ReportWriter:
+    """Writes the HTML and JSON reports incrementally, one rendered chunk at a time"""
+
+    def __init__(self, html_out, json_out, selected, title):
+        self.html_out = html_out
+        self.json_out = json_out
+        self.domains = 0
+        self.urls = 0
+        self._first_json = True
+        generated = time.strftime("%Y-%m-%d %H:%M:%S")
+        if html_out is not None:
+            html_out.write(HTML_HEAD.format(title=html.escape(title), generated=generated,
+                                            technique_count=len(selected)))
+        if json_out is not None:
+            header = json.dumps({"title": title, "generated": generated,
+                                 "techniques": [technique.id for technique in selected]})
+            # Open the object and leave the "domains" array open for the chunks
+            json_out.write(header[:-1] + ', "domains": [\n')
+
+    def write(self, chunk_domains, rendered):
+        html_text, json_text, urls = rendered
+        self.domains += chunk_domains
+        self.urls += urls
+        if self.html_out is not None:
+            self.html_out.write(html_text)
+        if self.json_out is not None and json_text:
+            if not self._first_json:
+                self.json_out.write(",\n")
+            self.json_out.write(json_text)
+            self._first_json = False
+
+    def close(self):
+        if self.html_out is not None:
+            self.html_out.write(HTML_TAIL.format(domains=self.domains, urls=self.urls))
+        if self.json_out is not None:
+            self.json_out.write(f'\n], "domain_count": {self.domains}, "url_count": {self.urls}}}\n')
+
+
+def export(domains, html_out=None, json_out=None, selected=techniques.TECHNIQUES, workers=None,
+           chunk_size=500, title="BigBountyRecon report"):
+    """Render reports for a domain iterable to open text files; returns (domains, urls) written
+
+    workers=1 renders in this process; otherwise a process pool with
+    os.cpu_count() workers (or the number given) is used, keeping at most
+    2 chunks per worker in flight.
+    """
+    selected = list(selected)
+    writer = ReportWriter(html_out, json_out, selected, title)
+    want_html = html_out is not None
+    want_json = json_out is not None
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1:
+        for chunk in chunks(domains, chunk_size):
+            writer.write(len(chunk), render_chunk(chunk, want_html, want_json, selected))
+    else:
+        with concurrent.futures.ProcessPoolExecutor(workers, initializer=_init_worker,
+                                                    initargs=(selected,)) as pool:
+            pending = collections.deque()
+            for chunk in chunks(domains, chunk_size):
+                pending.append((len(chunk), pool.submit(render_chunk, chunk, want_html, want_json)))
+                if len(pending) >= workers * 2:
+                    count, future = pending.popleft()
+                    writer.write(count, future.result())
+            while pending:
+                count, future = pending.popleft()
+                writer.write(count, future.result())
+    writer.close()
+    return writer.domains, writer.urls
@@ -0,0 +1,200 @@
+"""
+Direct site checks for BigBountyRecon
+Fetches /robots.txt and /crossdomain.xml and grades security headers for
+many hosts concurrently, instead of going through Google or securityheaders.com
+
+Requests share keep-alive connections per host (async_http.ConnectionPool),
+with a cap on concurrent requests overall and per host. Results are passed
+to a callback as each check finishes, so output streams however many hosts
+there are.
+"""
+
+import asyncio
+import re
+import urllib.parse
+
+import async_http
+import metrics
+
+# Checks that can be run against each host
+CHECKS = ("robots", "crossdomain", "headers")
+
+CHECK_PATHS = {
+    "robots": "/robots.txt",
+    "crossdomain": "/crossdomain.xml",
+    "headers": "/",
+}
+
+# Headers graded by the headers check, as securityheaders.com does
+SECURITY_HEADERS = (
+    "strict-transport-security",
+    "content-security-policy",
+    "x-frame-options",
+    "x-content-type-options",
+    "referrer-policy",
+    "permissions-policy",
+)
+
+# Grade for the number of security headers present
+GRADES = {6: "A+", 5: "A", 4: "B", 3: "C", 2: "D", 1: "E", 0: "F"}
+
+# Largest robots.txt / crossdomain.xml body read
+MAX_BODY = 512 * 1024
+
+MAX_REDIRECTS = 3
+
+_ALLOW_ACCESS_FROM = re.compile(r"<allow-access-from\b[^>]*\bdomain\s*=\s*[\"']([^\"']*)[\"']", re.IGNORECASE)
+
+
+def base_url(host, scheme="https"):
+    """Base URL for a host; hosts given with a scheme (http://127.0.0.1:8000) are used as they are"""
+    host = host.strip().rstrip("/")
+    if "://" in host:
+        return host
+    return f"{scheme}://{host}"
+
+
+def parse_robots(text):
+    """Disallow, Allow and Sitemap entries of a robots.txt, deduplicated in order"""
+    found = {"disallow": [], "allow": [], "sitemap": []}
+    for line in text.splitlines():
+        field, _, value = line.split("#", 1)[0].partition(":")
+        field = field.strip().lower()
+        value = value.strip()
+        if field in found and value and value not in found[field]:
+            found[field].append(value)
+    return found
+
+
+def parse_crossdomain(text):
+    """Domains allowed by a crossdomain.xml policy, and whether any wildcard lets every site in"""
+    domains = _ALLOW_ACCESS_FROM.findall(text)
+    return {"allow_access_from": domains, "wildcard": "*" in domains}
+
+
+def grade_headers(headers, https=True):
+    """Present and missing security headers, plus a grade from A+ to F
+
+    A Content-Security-Policy with frame-ancestors counts for X-Frame-Options,
+    and Strict-Transport-Security only counts over HTTPS.
+    """
+    present = []
+    missing = []
+    csp = headers.get("content-security-policy", "").lower()
+    for name in SECURITY_HEADERS:
+        value = headers.get(name)
+        if name == "x-frame-options" and not value and "frame-ancestors" in csp:
+            value = csp
+        if name == "strict-transport-security" and not https:
+            value = None
+        (present if value else missing).append(name)
+    return {"present": present, "missing": missing, "grade": GRADES[len(present)]}
+
+
+class SiteFetcher:
+    """Runs the site checks for many hosts with pooled connections and concurrency limits"""
+
+    def __init__(self, checks=CHECKS, concurrency=50, per_host=2, timeout=10, scheme="https", ssl_context=None):
+        self.checks = tuple(checks)
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.timeout = timeout
+        self.scheme = scheme
+        self.ssl_context = ssl_context
+        self.pool = None
+
+    async def _get(self, url):
+        """GET url following redirects; returns (final url, Response)"""
+        for _ in range(MAX_REDIRECTS + 1):
+            response = await asyncio.wait_for(self.pool.request("GET", url), self.timeout)
+            location = response.header("location")
+            if response.status not in (301, 302, 303, 307, 308) or not location:
+                return url, response
+            await response.drain()
+            url = urllib.parse.urljoin(url, location)
+        return url, response
+
+    async def check(self, host, check):
+        """Run one check against one host and return its result record"""
+        url = base_url(host, self.scheme) + CHECK_PATHS[check]
+        record = {"host": host, "check": check, "url": url}
+        metrics.count("fetches", check)
+        with metrics.timed("fetch", check):
+            return await self._check(url, check, record)
+
+    async def _check(self, url, check, record):
+        try:
+            final_url, response = await self._get(url)
+        except (async_http.HttpError, OSError, asyncio.TimeoutError, ValueError) as e:
+            record["error"] = str(e) or type(e).__name__
+            metrics.count("fetch_errors", check)
+            return record
+        record["status"] = response.status
+        if final_url != url:
+            record["final_url"] = final_url
+        try:
+            if check == "headers":
+                record.update(grade_headers(response.headers, final_url.startswith("https:")))
+                await response.drain()
+            else:
+                body = await response.read(MAX_BODY)
+                if response.status == 200:
+                    text = body.decode("utf-8", "replace")
+                    record.update(parse_robots(text) if check == "robots" else parse_crossdomain(text))
+        except (async_http.HttpError, OSError, asyncio.TimeoutError, ValueError) as e:
+            record["error"] = str(e) or type(e).__name__
+            metrics.count("fetch_errors", check)
+        finally:
+            await response.close()
+        return record
+
+    async def run(self, hosts, on_result):
+        """Run every check against every host, calling on_result(record) as each one finishes
+
+        hosts may be a lazy iterable; only a bounded number of hosts are read ahead.
+        """
+        self.pool = async_http.ConnectionPool(self.per_host, self.timeout, self.ssl_context)
+        work = asyncio.Queue(maxsize=self.concurrency * 2)
+
+        async def worker():
+            while True:
+                item = await work.get()
+                if item is None:
+                    return
+                on_result(await self.check(*item))
+
+        workers = [asyncio.ensure_future(worker()) for _ in range(self.concurrency)]
+
+        async def put(item):
+            # Waits on the workers too: one that failed (e.g. on_result raised) stops the run
+            # instead of leaving the producer blocked on a full queue forever
+            if work.full():
+                waiter = asyncio.ensure_future(work.put(item))
+                await asyncio.wait([waiter, *workers], return_when=asyncio.FIRST_COMPLETED)
+                if not waiter.done():
+                    waiter.cancel()
+            else:
+                work.put_nowait(item)
+            for task in workers:
+                if task.done():
+                    task.result()
+
+        try:
+            for host in hosts:
+                for check in self.checks:
+                    await put((host, check))
+            for _ in workers:
+                await put(None)
+            await asyncio.gather(*workers)
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            await self.pool.close()
+
+
+def fetch(hosts, on_result, checks=CHECKS, concurrency=50, per_host=2, timeout=10, scheme="https"):
+    """Run a SiteFetcher to completion; returns the fetcher (its pool has opened/reused counts)"""
+    fetcher = SiteFetcher(checks, concurrency, per_host, timeout, scheme)
+    asyncio.run(fetcher.run(hosts, on_result))
+    return fetcher
@@ -0,0 +1,111 @@
+"""
+Technique search index for BigBountyRecon
+Prefix/token index over technique labels, categories, descriptions and query
+text, so the technique filter stays instant with catalogues of 10k+ entries
+
+Common tokens map to a bitmask of the techniques they occur in (bit i is
+technique i), rare ones to a tuple of positions, so catalogues with many
+unique words do not hold one large bitmask per word. A search word matches
+every token it is a prefix of, found by bisecting the sorted token list, and
+the words of a search are AND-ed.
+"""
+
+import bisect
+import re
+import urllib.parse
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+# Tokens every URL template has, which would match everything
+STOP_TOKENS = {"https", "http", "www", "com", "q", "domain"}
+
+# Tokens in at least this many techniques are stored as a bitmask rather than a tuple of positions
+BITMASK_MIN = 64
+
+
+def tokens(text):
+    """Lowercase alphanumeric tokens of a text, with URL escapes (%2F) decoded first"""
+    if "%" in text:
+        text = urllib.parse.unquote(text)
+    return _TOKEN.findall(text.lower())
+
+
+def technique_text(technique):
+    """All searchable text of a technique"""
+    return " ".join((technique.id, technique.label, technique.short_label, technique.category,
+                     technique.description, technique.template))
+
+
+class TechniqueIndex:
+    """Prefix search over a fixed list of techniques"""
+
+    def __init__(self, items):
+        # A sequence with search_text(i) (technique_store.Catalogue) is indexed without building its techniques
+        self.items = items if hasattr(items, "__getitem__") else list(items)
+        search_text = getattr(items, "search_text", lambda position: None)
+        postings = {}
+        for position in range(len(self.items)):
+            text = search_text(position)
+            if text is None:
+                text = technique_text(self.items[position])
+            for token in set(tokens(text)):
+                if token not in STOP_TOKENS:
+                    postings.setdefault(token, []).append(position)
+        self._tokens = sorted(postings)
+        # A bitmask (int) for common tokens, a tuple of positions for rare ones
+        self._postings = [self._mask_of(postings[token]) if len(postings[token]) >= BITMASK_MIN
+                          else tuple(postings[token]) for token in self._tokens]
+        self._all = (1 << len(self.items)) - 1
+        self._prefix_cache = {}
+
+    def _mask_of(self, positions):
+        """Bitmask with the given bits set, built in one pass rather than one big-int OR per bit"""
+        bits = bytearray((len(self.items) + 7) // 8)
+        for position in positions:
+            bits[position >> 3] |= 1 << (position & 7)
+        return int.from_bytes(bits, "little")
+
+    def prefix_mask(self, prefix):
+        """Bitmask of techniques with a token starting with prefix"""
+        mask = self._prefix_cache.get(prefix)
+        if mask is None:
+            mask = 0
+            positions = []
+            start = bisect.bisect_left(self._tokens, prefix)
+            end = bisect.bisect_left(self._tokens, prefix + "\uffff", start)
+            for posting in self._postings[start:end]:
+                if isinstance(posting, int):
+                    mask |= posting
+                else:
+                    positions.extend(posting)
+            if positions:
+                mask |= self._mask_of(positions)
+            if len(self._prefix_cache) > 4096:
+                self._prefix_cache.clear()
+            self._prefix_cache[prefix] = mask
+        return mask
+
+    def search_mask(self, query):
+        """Bitmask of techniques matching every word of query (all techniques for an empty query)"""
+        mask = self._all
+        for word in tokens(query):
+            mask &= self.prefix_mask(word)
+            if not mask:
+                break
+        return mask
+
+    def search(self, query, limit=None):
+        """Techniques matching query in their original order, at most limit of them"""
+        mask = self.search_mask(query)
+        found = []
+        while mask and (limit is None or len(found) < limit):
+            # Skip to the lowest set bit
+            low = mask & -mask
+            position = low.bit_length() - 1
+            found.append(self.items[position])
+            mask ^= low
+        return found
+
+    def count(self, query):
+        """Number of techniques matching query"""
+        return bin(self.search_mask(query)).count("1")
@@ -0,0 +1,319 @@
+"""
+Imported technique store for BigBountyRecon
+Keeps dork collections imported from CSV, JSON, JSON lines or YAML (e.g.
+GHDB exports) in a compact on-disk format that is memory-mapped at startup
+
+The store is two append-only files in the config directory:
+    dorks.idx  32-byte header, then one 32-byte record per technique:
+               template hash, offset into dorks.dat, and the byte lengths
+               of the id, label, category, description and template
+    dorks.dat  the UTF-8 strings, each followed by a newline
+Opening the store maps both files without reading the entries; a Technique
+object is only built when an entry is accessed. Imports append new entries
+and skip any whose template is already in the store or the built-in registry.
+"""
+
+import csv
+import hashlib
+import html
+import io
+import json
+import mmap
+import os
+import re
+import struct
+import urllib.parse
+
+import config
+import dork_packer
+import techniques
+
+IDX_MAGIC = b"BBRTIDX1"
+HEADER = struct.Struct("<8s24x")
+RECORD = struct.Struct("<QQ5H6x")
+
+# Longest id/label/category/description/template kept, in UTF-8 bytes
+MAX_FIELD = 0xFFFF
+
+CATEGORY = "Imported"
+
+SEARCH_PREFIX = "https://www.google.com/search?q=site:{domain}"
+
+# Keys tried, in order, for each field of an imported entry
+FIELD_KEYS = {
+    "template": ("template", "url"),
+    "dork": ("dork", "query", "google_dork", "url_title"),
+    "label": ("label", "title", "name"),
+    "category": ("category", "cat_title"),
+    "description": ("description", "desc", "summary"),
+}
+
+_TAG = re.compile(r"<[^>]+>")
+
+
+def template_hash(template):
+    """64-bit hash of a template's canonical form, used to spot duplicates"""
+    query = dork_packer.search_query(template.replace("{domain}", "example.invalid"))
+    canonical = dork_packer.canonical_query(query) if query is not None else template.strip()
+    return int.from_bytes(hashlib.blake2b(canonical.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def _field(entry, name):
+    """First non-empty value of a field in an imported entry, as plain text"""
+    for key in FIELD_KEYS[name]:
+        value = entry.get(key)
+        if isinstance(value, dict):
+            # GHDB exports nest the category as {"cat_id": ..., "cat_title": ...}
+            value = value.get("cat_title") or value.get("title")
+        if value not in (None, ""):
+            return html.unescape(_TAG.sub("", str(value))).strip()
+    return ""
+
+
+def _encode(field):
+    """UTF-8 bytes of a field on one line, cut to MAX_FIELD bytes without splitting a character"""
+    data = field.replace("\n", " ").encode("utf-8")
+    if len(data) > MAX_FIELD:
+        data = data[:MAX_FIELD].decode("utf-8", "ignore").encode("utf-8")
+    return data
+
+
+def entry_template(entry):
+    """URL template for an imported entry, or None if it has no usable template or dork
+
+    A full URL must contain {domain}; a bare dork becomes a Google search limited to site:{domain}.
+    """
+    template = _field(entry, "template")
+    if template:
+        return template if "{domain}" in template and template.startswith(("http://", "https://")) else None
+    dork = _field(entry, "dork")
+    if not dork:
+        return None
+    return SEARCH_PREFIX + urllib.parse.quote_plus(" " + " ".join(dork.split()), safe=':"*|()')
+
+
+def read_entries(stream, fmt):
+    """Yield entries (dicts) from an export in csv, json, jsonl or yaml format"""
+    if fmt == "csv":
+        yield from csv.DictReader(stream)
+    elif fmt == "jsonl":
+        for line in stream:
+            if line.strip():
+                yield json.loads(line)
+    elif fmt in ("json", "yaml"):
+        if fmt == "yaml":
+            try:
+                import yaml
+            except ImportError:
+                raise ValueError("YAML import needs PyYAML (pip install pyyaml)")
+            data = yaml.safe_load(stream)
+        else:
+            data = json.load(stream)
+        if isinstance(data, dict):
+            # {"data": [...]} as in GHDB exports, or {"dorks": [...]}
+            data = data.get("data") or data.get("dorks") or data.get("techniques") or []
+        for entry in data:
+            yield entry if isinstance(entry, dict) else {"dork": entry}
+    else:
+        raise ValueError(f"Unknown import format {fmt!r}")
+
+
+def guess_format(path):
+    """Import format from a file extension"""
+    extension = os.path.splitext(path)[1].lower().lstrip(".")
+    return {"yml": "yaml", "ndjson": "jsonl", "txt": "jsonl"}.get(extension, extension)
+
+
+class TechniqueStore:
+    """Read-only, memory-mapped view of the imported techniques, indexable like a list"""
+
+    def __init__(self, directory=None):
+        directory = directory or config.config_dir()
+        self.idx_path = os.path.join(directory, "dorks.idx")
+        self.dat_path = os.path.join(directory, "dorks.dat")
+        self._idx = self._map(self.idx_path)
+        self._dat = self._map(self.dat_path)
+        size = len(self._idx) if self._idx is not None else 0
+        if size and HEADER.unpack_from(self._idx, 0)[0] != IDX_MAGIC:
+            raise ValueError(f"{self.idx_path} is not a technique store")
+        self._count = max(0, (size - HEADER.size) // RECORD.size)
+        self._cache = {}
+
+    @staticmethod
+    def _map(path):
+        try:
+            with open(path, "rb") as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return None
+                return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except FileNotFoundError:
+            return None
+
+    def __len__(self):
+        return self._count
+
+    def _fields(self, index):
+        """(hash, [id, label, category, description, template]) of entry index"""
+        record = RECORD.unpack_from(self._idx, HEADER.size + index * RECORD.size)
+        offset = record[1]
+        fields = []
+        for length in record[2:]:
+            fields.append(self._dat[offset:offset + length].decode("utf-8"))
+            offset += length + 1
+        return record[0], fields
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("technique store index out of range")
+        technique = self._cache.get(index)
+        if technique is None:
+            _, (technique_id, label, category, description, template) = self._fields(index)
+            technique = techniques.Technique(technique_id, label, label[:40], "", category,
+                                             description or label, template)
+            self._cache[index] = technique
+        return technique
+
+    def search_text(self, index):
+        """Label, category, description and template of entry index as one string, without building its Technique"""
+        record = RECORD.unpack_from(self._idx, HEADER.size + index * RECORD.size)
+        start = record[1] + record[2] + 1
+        return self._dat[start:start + sum(record[3:]) + 3].decode("utf-8")
+
+    def find(self, technique_id):
+        """Entry with the given id (dork_<hash>), or None"""
+        if not technique_id.startswith("dork_") or not self._count:
+            return None
+        try:
+            key = int(technique_id[len("dork_"):], 16)
+        except ValueError:
+            return None
+        words = memoryview(self._idx)[HEADER.size:HEADER.size + self._count * RECORD.size].cast("Q")
+        stride = RECORD.size // 8
+        for index in range(self._count):
+            if words[index * stride] == key:
+                return self[index]
+        return None
+
+    def hashes(self):
+        """Template hashes of all entries"""
+        if not self._count:
+            return set()
+        words = memoryview(self._idx)[HEADER.size:HEADER.size + self._count * RECORD.size].cast("Q")
+        return set(words[::RECORD.size // 8])
+
+    def close(self):
+        for mapped in (self._idx, self._dat):
+            if mapped is not None:
+                mapped.close()
+        self._idx = self._dat = None
+        self._count = 0
+
+
+def import_entries(entries, directory=None, default_category=CATEGORY):
+    """Append entries to the store, skipping duplicates; returns (added, duplicates, invalid)
+
+    Strings are written and flushed to dorks.dat before their records go into
+    dorks.idx, so an interrupted import never leaves records pointing at
+    missing data.
+    """
+    directory = directory or config.config_dir()
+    os.makedirs(directory, exist_ok=True)
+    store = TechniqueStore(directory)
+    seen = store.hashes()
+    store.close()
+    seen.update(template_hash(technique.template) for technique in techniques.TECHNIQUES)
+
+    added = duplicates = invalid = 0
+    with open(os.path.join(directory, "dorks.dat"), "ab") as dat, \
+            open(os.path.join(directory, "dorks.idx"), "ab") as idx:
+        if idx.tell() == 0:
+            idx.write(HEADER.pack(IDX_MAGIC))
+        else:
+            # Drop a partly written record left by an interrupted import
+            idx.truncate(HEADER.size + (idx.tell() - HEADER.size) // RECORD.size * RECORD.size)
+            idx.seek(0, os.SEEK_END)
+        offset = dat.seek(0, os.SEEK_END)
+        records = io.BytesIO()
+        for entry in entries:
+            template = entry_template(entry)
+            if template is None:
+                invalid += 1
+                continue
+            key = template_hash(template)
+            if key in seen:
+                duplicates += 1
+                continue
+            seen.add(key)
+            label = _field(entry, "label") or _field(entry, "dork") or template
+            fields = [f"dork_{key:016x}", label, _field(entry, "category") or default_category,
+                      _field(entry, "description"), template]
+            data = [_encode(field) for field in fields]
+            if len(data[4]) != len(template.encode("utf-8")):
+                # Template too long to store whole
+                invalid += 1
+                continue
+            dat.write(b"\n".join(data) + b"\n")
+            records.write(RECORD.pack(key, offset, *(len(value) for value in data)))
+            offset += sum(len(value) + 1 for value in data)
+            added += 1
+        dat.flush()
+        os.fsync(dat.fileno())
+        idx.write(records.getvalue())
+    return added, duplicates, invalid
+
+
+def import_file(path, fmt=None, directory=None, default_category=CATEGORY):
+    """Import one export file into the store; returns (added, duplicates, invalid)"""
+    fmt = fmt or guess_format(path)
+    with open(path, "r", encoding="utf-8-sig", newline="" if fmt == "csv" else None) as stream:
+        return import_entries(read_entries(stream, fmt), directory, default_category)
+
+
+class Catalogue:
+    """The built-in techniques followed by the imported ones, as one list-like sequence"""
+
+    def __init__(self, builtins, store):
+        self.builtins = tuple(builtins)
+        self.store = store
+
+    def __len__(self):
+        return len(self.builtins) + len(self.store)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if index < len(self.builtins):
+            return self.builtins[index]
+        return self.store[index - len(self.builtins)]
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def get(self, technique_id):
+        """Technique by id, built-in or imported, or None"""
+        technique = techniques.BY_ID.get(technique_id)
+        if technique is None and isinstance(self.store, TechniqueStore):
+            technique = self.store.find(technique_id)
+        return technique
+
+    def search_text(self, index):
+        """Searchable text of an imported entry without building its Technique; None for built-ins"""
+        if index < len(self.builtins):
+            return None
+        return self.store.search_text(index - len(self.builtins))
+
+
+def load_catalogue():
+    """Built-in techniques plus the imported store, if any"""
+    try:
+        store = TechniqueStore()
+    except (OSError, ValueError):
+        store = []
+    return Catalogue(techniques.TECHNIQUES, store)
@@ -0,0 +1,273 @@
+"""
+Technique registry for BigBountyRecon
+Single catalogue of all reconnaissance techniques, used by the GUI, the
+search functions in recon_searches and the headless command line
+"""
+
+import urllib.parse
+
+# Encoding rules: how the domain is encoded before it is put into a template
+ENCODERS = {
+    "quote": urllib.parse.quote,
+    "quote_plus": urllib.parse.quote_plus,
+    "raw": str,
+}
+
+# Category order, as shown in the categorized UI
+CATEGORIES = [
+    "File Searches",
+    "WordPress",
+    "Authentication & Errors",
+    "Subdomains",
+    "Third-party Services",
+    "Security Tools",
+    "Archive & Wayback",
+    "Cloud Storage",
+    "API & Services",
+]
+
+
+class Technique:
+    """A reconnaissance technique: a URL template with {domain} plus how it is shown in the UI
+
+    The template is split around {domain} once, when the registry is built,
+    so rendering a URL is a single join with the encoded domain.
+    """
+
+    __slots__ = ("id", "label", "short_label", "icon", "category", "description", "template", "encoding",
+                 "cacheable", "_parts")
+
+    def __init__(self, id, label, short_label, icon, category, description, template, encoding="quote",
+                 cacheable=False):
+        if encoding not in ENCODERS:
+            raise ValueError(f"Unknown encoding {encoding!r} for technique {id!r}")
+        self.id = id
+        self.label = label
+        self.short_label = short_label
+        self.icon = icon
+        self.category = category
+        self.description = description
+        self.template = template
+        self.encoding = encoding
+        self.cacheable = cacheable  # large, slow responses worth routing through the caching proxy
+        self._parts = template.split("{domain}")
+
+    def render(self, encoded_domain):
+        """Build the URL from a domain already encoded with this technique's encoding"""
+        return encoded_domain.join(self._parts)
+
+    def url(self, domain):
+        """Build the URL for a domain"""
+        return self.render(ENCODERS[self.encoding](domain))
+
+    def __repr__(self):
+        return f"Technique({self.id!r})"
+
+
+TECHNIQUES = (
+    Technique('directory_listing', 'Directory Listing', 'Directory Listing', '📁', 'File Searches',
+              'Directory Listing: Finding open directories',
+              'https://www.google.com/search?q=site:{domain} intitle:index.of'),
+    Technique('configuration_files', 'Configuration Files', 'Configuration Files', '⚙️', 'File Searches',
+              'Configuration Files: Often contains sensitive information',
+              'https://www.google.com/search?q=site:{domain} ext:xml | ext:conf | ext:cnf | ext:reg | ext:inf | ext:rdp | ext:cfg | ext:txt | ext:ora | ext:ini'),
+    Technique('database_files', 'Database Files', 'Database Files', '🗄️', 'File Searches',
+              'Database Files: Data files that store database contents',
+              'https://www.google.com/search?q=site:{domain} ext:sql | ext:dbf | ext:mdb'),
+    Technique('wordpress', 'WordPress', 'WordPress', 'W', 'WordPress',
+              'WordPress: WordPress related exposure',
+              'https://www.google.com/search?q=site:{domain} inurl:wp- | inurl:wp-content | inurl:plugins | inurl:uploads | inurl:themes | inurl:download'),
+    Technique('log_files', 'Log Files', 'Log Files', '📋', 'File Searches',
+              'Log Files: Sometimes provide detailed information',
+              'https://www.google.com/search?q=site:{domain} ext:log'),
+    Technique('backup_files', 'Backup and Old Files', 'Backup Files', '💾', 'File Searches',
+              'Backup and Old Files: Backup files are original copies',
+              'https://www.google.com/search?q=site:{domain} ext:bkf | ext:bkp | ext:bak | ext:old | ext:backup'),
+    Technique('login_pages', 'Login Pages', 'Login Pages', '🔐', 'Authentication & Errors',
+              'Login Pages: Identify login pages',
+              'https://www.google.com/search?q=site:{domain} inurl:login | inurl:signin | intitle:Login | intitle: signin | inurl:auth'),
+    Technique('documents', 'Publicly Exposed Documents', 'Documents', '📄', 'File Searches',
+              'Publicly Exposed Documents: Can be used to extract metadata',
+              'https://www.google.com/search?q=site:{domain} ext:doc | ext:docx | ext:odt | ext:pdf | ext:rtf | ext:sxw | ext:psw | ext:ppt | ext:pptx | ext:pps | ext:csv'),
+    Technique('phpinfo', 'phpinfo()', 'phpinfo', '🐘', 'File Searches',
+              'phpinfo(): Exposing phpinfo()',
+              'https://www.google.com/search?q=site:{domain} ext:php intitle:phpinfo "published by the PHP Group"'),
+    Technique('backdoors', 'Finding Backdoors', 'Backdoors', '🚪', 'File Searches',
+              'Finding Backdoors: Identify website defacements',
+              'https://www.google.com/search?q=site:{domain}  inurl:shell | inurl:backdoor | inurl:wso | inurl:cmd | shadow | passwd | boot.ini | inurl:backdoor'),
+    Technique('install_setup_files', 'Install / Setup files', 'Install/Setup Files', '📱', 'File Searches',
+              'Install/Setup Files: Allows enumeration',
+              'https://www.google.com/search?q=site:{domain}  inurl:readme | inurl:license | inurl:install | inurl:setup | inurl:config'),
+    Technique('sql_errors', 'SQL Errors', 'SQL Errors', '🔧', 'Authentication & Errors',
+              'SQL Errors: SQL errors leak sensitive information',
+              'https://www.google.com/search?q=site:{domain} intext:"sql syntax near" | intext:"syntax error has occurred" | intext:"incorrect syntax near" | intext:"unexpected end of SQL command" | intext:"Warning: mysql_connect()" | intext:"Warning: mysql_query()" | intext:"Warning: pg_connect()"'),
+    Technique('open_redirects', 'Open Redirects', 'Open Redirects', '↗️', 'Authentication & Errors',
+              'Open Redirects: Look at various known parameters',
+              'https://www.google.com/search?q=site:{domain} inurl:redir | inurl:url | inurl:redirect | inurl:return | inurl:src=http | inurl:r=http'),
+    Technique('apache_struts', 'Apache STRUTS RCE', 'Apache Struts', '💎', 'Authentication & Errors',
+              'Apache Struts RCE: Looking for files with extensions .action or .do',
+              'https://www.google.com/search?q=site:{domain} ext:action | ext:struts | ext:do'),
+    Technique('pastebin', 'Find Pastebin entries', 'Pastebin', '📋', 'Third-party Services',
+              'Find Pastebin Entries: Results related to target organisation',
+              'https://www.google.com/search?q=site:pastebin.com {domain}'),
+    Technique('linkedin_employees', 'Employees on LINKEDIN', 'LinkedIn Employees', '💼', 'Third-party Services',
+              'Employees on LINKEDIN: Identifying employee names',
+              'https://www.google.com/search?q=site:linkedin.com employees {domain}'),
+    Technique('sharepoint_rce', 'CVE-2020-0646 SharePoint RCE', 'SharePoint RCE', 'S', 'API & Services',
+              'SharePoint RCE: Look for CVE-2020-0646 SharePoint RCE',
+              'https://www.google.com/search?q=.sharepoint.com/_vti_bin/webpartpages/asmx -docs -msdn -mdsec site:{domain}'),
+    Technique('wsdl_files', 'API Endpoints - WSDL', 'WSDL Files', '📄', 'API & Services',
+              'API Endpoints: Find WSDL files',
+              'https://www.google.com/search?q=site:{domain} filetype:wsdl | filetype:WSDL | ext:svc | inurl:wsdl | Filetype: ?wsdl | inurl:asmx?wsdl | inurl:jws?wsdl | intitle:_vti_bin/sites.asmx?wsdl | inurl:_vti_bin/sites.asmx?wsdl'),
+    Technique('github', 'Search in GITHUB', 'GitHub', '🐙', 'Third-party Services',
+              'GitHub: Quickly look for sensitive information',
+              'https://github.com/search?q="*.{domain}"'),
+    Technique('gist', 'Github GIST Searches', 'Gist', '🐙', 'Third-party Services',
+              'Gist Searches: Quickly look for sensitive information',
+              'https://gist.github.com/search?q=*."{domain}"'),
+    Technique('apache_config', 'Apache Config Files', 'Apache Config', '⚙️', 'File Searches',
+              'Apache Config Files: Apache HTTP Server configuration',
+              'https://www.google.com/search?q=site:{domain} filetype:config "apache"'),
+    Technique('third_party_exposure', '3rd Party Exposure', 'Third-party Exposure', '👥', 'Third-party Services',
+              '3rd Party Exposure: Exposure on third party sites',
+              'https://www.google.com/search?q=site%3Ahttp%3A%2F%2Fideone.com+|+site%3Ahttp%3A%2F%2Fcodebeautify.org+|+site%3Ahttp%3A%2F%2Fcodeshare.io+|+site%3Ahttp%3A%2F%2Fcodepen.io+|+site%3Ahttp%3A%2F%2Frepl.it+|+site%3Ahttp%3A%2F%2Fjustpaste.it+|+site%3Ahttp%3A%2F%2Fpastebin.com+|+site%3Ahttp%3A%2F%2Fjsfiddle.net+|+site%3Ahttp%3A%2F%2Ftrello.com+|+site%3A*.atlassian.net+|+site%3Abitbucket.org+ "{domain}"'),
+    Technique('bitbucket_atlassian', 'Search in Bitbucket and Atlassian', 'BitBucket & Atlassian', '🔵', 'Third-party Services',
+              'BitBucket & Atlassian: Source code leakage',
+              'https://www.google.com/search?q=site%3Aatlassian.net+|+site%3Abitbucket.org+ "{domain}"'),
+    Technique('git_folder', '.git folder', '.git Folder', '📁', 'File Searches',
+              'git Folder: Source code exposure',
+              'https://www.google.com/search?q=inurl:"/.git " {domain} -github '),
+    Technique('traefik', 'Traefik', 'Traefik', '🔵', 'API & Services',
+              'Traefik: Look for open-source Edge Router',
+              'https://www.google.com/search?q=intitle:traefik+inurl:8080/dashboard"{domain}"'),
+    Technique('ct_logs', 'Search in CT Logs', 'CT Logs (crt.sh)', '🔒', 'Subdomains',
+              'CT Logs: Certificate Transparency logs',
+              'https://crt.sh/?q={domain}',
+              cacheable=True),
+    Technique('htaccess_phpinfo', '.htaccess sensitive files', '.htaccess/phpinfo', '🔒', 'File Searches',
+              '.HTACCESS / Sensitive Files: Look for sensitive file exposure',
+              'https://www.google.com/search?q=site:{domain} inurl:"/phpinfo.php" | inurl:".htaccess"'),
+    Technique('subdomains', 'Find Subdomains', 'Subdomains', '🌍', 'Subdomains',
+              'Find Subdomains: Subdomain helps expand attack surface',
+              'https://www.google.com/search?q=site:*.{domain}'),
+    Technique('sub_subdomains', 'Find Sub-Subdomains', 'Sub-subdomains', '🌍', 'Subdomains',
+              'Find Sub-Subdomains: Identify sub-sub domains',
+              'https://www.google.com/search?q=site:*.*.{domain}'),
+    Technique('wordpress_exposure', 'Find WordPress #2', 'WordPress Exposure', 'W', 'WordPress',
+              'Find WordPress related exposure: WordPress related exposure',
+              'https://www.google.com/search?q=site:{domain} inurl:wp-content | inurl:wp-includes'),
+    Technique('wordpress_wayback', 'Find WordPress [Wayback Machine]', 'WordPress Wayback', '🗄️', 'WordPress',
+              'Find WordPress related exposure using Wayback Machine',
+              'http://wwwb-dedup.us.archive.org:8083/cdx/search?url={domain}/&matchType=domain&collapse=digest&output=text&fl=original,timestamp&filter=urlkey:.*wp[-].*&limit=1000000&xx=',
+              cacheable=True),
+    Technique('openbugbounty', 'Search in OpenBugBounty', 'OpenBugBounty', '🐛', 'Security Tools',
+              'OpenBugBounty: Look for publicly exposed security issues',
+              'https://www.openbugbounty.org/search/?search={domain}'),
+    Technique('reddit', 'Search in Reddit', 'Reddit', '🤖', 'Third-party Services',
+              'Reddit: Information about organisation on Reddit',
+              'https://www.reddit.com/search/?q={domain}'),
+    Technique('crossdomain_xml', 'Test CrossDomain', 'crossdomain.xml', '📄', 'File Searches',
+              'Crossdomain.xml: Look for misconfigured crossdomain.xml files',
+              'https://www.google.com/search?q={domain}/crossdomain.xml'),
+    Technique('robots_txt', 'Robots.txt File', 'robots.txt', '🤖', 'File Searches',
+              'Robots.txt File: Instructs web robots how to crawl',
+              'https://www.google.com/search?q={domain}/robots.txt'),
+    Technique('security_headers', 'Check Security Headers', 'Security Headers', '🛡️', 'Security Tools',
+              'Check Security Headers: Identify security related headers',
+              'https://securityheaders.com/?q={domain}&followRedirects=on'),
+    Technique('threatcrowd', 'Check in ThreatCrowd', 'ThreatCrowd', '🎯', 'Security Tools',
+              'ThreatCrowd: Search engine for threats',
+              'https://threatcrowd.org/domain.php?domain={domain}'),
+    Technique('riskiq', 'Passive Total', 'RiskIQ', '🌀', 'Security Tools',
+              'RiskIQ: Threat investigation',
+              'https://community.riskiq.com/search/{domain}'),
+    Technique('swf_google', 'Find .SWF file (Google)', 'SWF (Google)', 'F', 'Archive & Wayback',
+              '.SWF File (Google): Look for older versions of flash .swf',
+              'https://www.google.com/search?q=inurl:{domain} ext:swf'),
+    Technique('youtube', 'YouTube', 'YouTube', '▶️', 'Third-party Services',
+              'YouTube: Look for any recent news',
+              'https://www.youtube.com/results?search_query={domain}'),
+    Technique('swf_yandex', 'Find .SWF file (Yandex)', 'SWF (Yandex)', 'F', 'Archive & Wayback',
+              '.SWF File (Yandex): Look for older versions of flash .swf',
+              'https://yandex.com/search/?text=site:{domain}  mime:swf'),
+    Technique('swf_wayback', 'Search SWF in WayBack', 'SWF (Wayback)', 'F', 'Archive & Wayback',
+              '.SWF File (Wayback Machine): Look for older versions of flash .swf',
+              'https://web.archive.org/cdx/search?url={domain}/&matchType=domain&collapse=urlkey&output=text&fl=original&filter=urlkey:.*swf&limit=100000',
+              cacheable=True),
+    Technique('swf_wayback_mime', 'Search in Wayback Machine #2', 'SWF (Wayback MIME)', '🌐', 'Archive & Wayback',
+              '.SWF File (Wayback Machine MIME): Look for older versions of flash .swf',
+              'https://web.archive.org/cdx/search?url={domain}/&matchType=domain&collapse=urlkey&output=text&fl=original&filter=mimetype:application/x-shockwave-flash&limit=100000',
+              cacheable=True),
+    Technique('wayback_machine', 'Search in Wayback Machine #3', 'Wayback Machine', '🌐', 'Archive & Wayback',
+              'Wayback Machine: Look for archived files',
+              'https://web.archive.org/web/*/{domain}/*'),
+    Technique('reverse_ip', 'Reverse IP Lookup', 'Reverse IP', '🔍', 'Subdomains',
+              'Reverse IP Lookup: Discover all domain names hosted on IP',
+              'https://viewdns.info/reverseip/?host={domain}&t=1'),
+    Technique('publicwww', 'Sourcecode - PublicWWW', 'PublicWWW', 'Q', 'Security Tools',
+              'PublicWWW: Source code search engine',
+              'https://publicwww.com/websites/"{domain}"/'),
+    Technique('censys_ipv4', 'Check in CENSYS [IP4]', 'Censys IPv4', '🔍', 'Security Tools',
+              'Censys (IPv4): Search engine for finding internet devices',
+              'https://censys.io/ipv4?q={domain}'),
+    Technique('censys_domain', 'Check in CENSYS [DOMAINS]', 'Censys Domain', '🔍', 'Security Tools',
+              'Censys (Domain): Search engine for finding internet devices',
+              'https://censys.io/domain?q={domain}'),
+    Technique('censys_certificates', 'Check in CENSYS [CERTS]', 'Censys Certificates', '🔍', 'Security Tools',
+              'Censys (Certificates): Search engine for finding internet devices',
+              'https://censys.io/certificates?q={domain}'),
+    Technique('shodan', 'Search in SHODAN', 'Shodan', '8', 'Security Tools',
+              'Shodan: Search engine for Internet-connected devices',
+              'https://www.shodan.io/search?query={domain}'),
+    Technique('google_cse', 'Cloud Storage and Buckets', 'Google CSE', '☁️', 'Security Tools',
+              'Google CSE: Custom search engine',
+              'https://cse.google.com/cse?cx=002972716746423218710:veac6ui3rio#gsc.tab=0&gsc.q={domain}'),
+    Technique('throwbin', 'Plaintext Password Leak', 'Throwbin', '🔑', 'Third-party Services',
+              'Throwbin: Look for sensitive information',
+              'https://www.google.com/search?q=site:throwbin.io {domain}'),
+    Technique('domaineye', 'DomainEye', 'DomainEye', '👁️', 'Security Tools',
+              'DomainEye: Domain/host investigation tool',
+              'https://domaineye.com/similar/{domain}'),
+    Technique('gitlab', 'GitLab', 'GitLab', '🦊', 'Third-party Services',
+              'GitLab: Quickly look for sensitive information',
+              'https://www.google.com/search?q=inurl:gitlab {domain}'),
+    Technique('stackoverflow', 'Search in Stackoverflow', 'StackOverflow', '📚', 'Third-party Services',
+              'Stackoverflow: Source code exposure',
+              'https://www.google.com/search?q=site:stackoverflow.com "{domain}"'),
+    Technique('s3_buckets', 's3 Buckets', 'S3 Buckets', '🪣', 'Cloud Storage',
+              's3 Buckets: Open s3 buckets',
+              'https://www.google.com/search?q=site:.s3.amazonaws.com "{domain}"'),
+    Technique('digitalocean_spaces', 'Digital Ocean Spaces', 'DigitalOcean Spaces', '💧', 'Cloud Storage',
+              'Digitalocean Spaces: S3-compatible object storage',
+              'https://www.google.com/search?q=site:digitaloceanspaces.com "{domain}"'),
+    Technique('whatcms', 'What CMS?', 'What CMS', '📊', 'Security Tools',
+              'What CMS: Identify the version and type of CMS',
+              'https://whatcms.org/?s={domain}'),
+)
+
+BY_ID = {technique.id: technique for technique in TECHNIQUES}
+
+
+def get(technique_id):
+    """Get a technique by id, raising KeyError for unknown ids"""
+    return BY_ID[technique_id]
+
+
+def by_category(category):
+    """All techniques in a category, in registry order"""
+    return [technique for technique in TECHNIQUES if technique.category == category]
+
+
+def render_all(domain, selected=TECHNIQUES):
+    """Build the URLs of the selected techniques for one domain as (technique, url) pairs
+
+    The domain is encoded once per encoding rule rather than once per technique.
+    """
+    encoded = {}
+    urls = []
+    for technique in selected:
+        value = encoded.get(technique.encoding)
+        if value is None:
+            value = encoded[technique.encoding] = ENCODERS[technique.encoding](domain)
+        urls.append((technique, technique.render(value)))
+    return urls
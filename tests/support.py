@@ -0,0 +1,175 @@
+"""
+Shared setup for the BigBountyRecon tests
+Puts src/ on the import path, keeps state in a temporary BBR_HOME with rate
+limiting, history and the caching proxy off, and runs local http.server
+stand-ins for the remote services
+"""
+
+import contextlib
+import http.server
+import json
+import os
+import sys
+import tempfile
+import threading
+import urllib.parse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+HOME = tempfile.mkdtemp(prefix="bbr-tests-")
+os.environ.update(BBR_HOME=HOME, BBR_RATE_LIMIT="0", BBR_HISTORY="0", BBR_CACHE_PROXY="0", BBR_METRICS="0")
+os.environ.pop("BBR_METRICS_FILE", None)
+
+
+lock = threading.Lock()
+
+
+class StandIn(http.server.ThreadingHTTPServer):
+    """http.server on 127.0.0.1 with a free port, counting requests and connections"""
+
+    daemon_threads = True
+
+    def __init__(self, handler, **state):
+        super().__init__(("127.0.0.1", 0), handler)
+        self.requests = []  # request paths, in order
+        self.connections = 0
+        self.__dict__.update(state)
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class Handler(http.server.BaseHTTPRequestHandler):
+    """Base stand-in handler: records each request and sends complete bodies"""
+
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        with lock:
+            self.server.connections += 1
+
+    def parse_request(self):
+        ok = super().parse_request()
+        if ok:
+            with lock:
+                self.server.requests.append(self.path)
+        return ok
+
+    def send_body(self, body, content_type="text/plain", status=200, headers=()):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_cut_short(self, body, length, content_type="text/plain"):
+        """Announce length bytes, send body (fewer) and drop the connection"""
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(length))
+        self.end_headers()
+        self.wfile.write(body)
+        self.wfile.flush()
+        self.close_connection = True
+
+    def log_message(self, format, *args):
+        pass
+
+
+class CdxHandler(Handler):
+    """Wayback CDX stand-in: server.records are dicts of CDX fields, in urlkey order
+
+    Honours fl, from, limit, showResumeKey and resumeKey (the index of the
+    next record). A page starting at an index in server.fail gets a 404;
+    one in server.cut_once is cut short the first time it is asked for.
+    """
+
+    def do_GET(self):
+        parts = urllib.parse.urlsplit(self.path)
+        params = dict(urllib.parse.parse_qsl(parts.query))
+        fields = params.get("fl", "original").split(",")
+        records = [record for record in self.server.records if record["timestamp"] >= params.get("from", "")]
+        start = int(params.get("resumeKey", 0))
+        end = min(len(records), start + int(params.get("limit", len(records))))
+        if start in self.server.fail:
+            self.send_body(b"not found", status=404)
+            return
+        lines = [" ".join(record[field] for field in fields) for record in records[start:end]]
+        if end < len(records) and params.get("showResumeKey") == "true":
+            lines += ["", str(end)]
+        body = "".join(line + "\n" for line in lines).encode()
+        if start in self.server.cut_once:
+            self.server.cut_once.discard(start)
+            self.send_cut_short(body[:len(body) // 2], len(body))
+            return
+        self.send_body(body)
+
+
+def cdx_records(count, first=0, timestamp="2020"):
+    """count CDX records for example.com pages first, first + 1, ..."""
+    return [{"original": f"http://example.com/wp-{i:05d}", "timestamp": f"{timestamp}0101{i:06d}"}
+            for i in range(first, first + count)]
+
+
+def serve_cdx(records, fail=(), cut_once=()):
+    return serve(CdxHandler, records=list(records), fail=set(fail), cut_once=set(cut_once))
+
+
+class CrtShHandler(Handler):
+    """crt.sh stand-in: server.entries maps an apex to its JSON entries
+
+    server.cut is a set of apexes whose response stops before the closing
+    bracket: sent chunked without the last chunk, or, with server.close_cut,
+    as a read-to-close body.
+    """
+
+    def do_GET(self):
+        params = dict(urllib.parse.parse_qsl(urllib.parse.urlsplit(self.path).query))
+        apex = params.get("q", "").lstrip("%.")
+        body = json.dumps(self.server.entries.get(apex, [])).encode()
+        if apex not in self.server.cut:
+            self.send_body(body, "application/json")
+            return
+        body = body[:body.rindex(b"}") + 1]
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        if self.server.close_cut:
+            self.send_header("Connection", "close")
+            self.end_headers()
+            self.wfile.write(body)
+        else:
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(body), body))
+        self.wfile.flush()
+        self.close_connection = True
+
+
+def ct_entries(apex, count, first_id=1):
+    """count crt.sh entries for names under apex, with ids from first_id"""
+    return [{"id": first_id + i, "common_name": f"host{first_id + i}.{apex}",
+             "name_value": f"host{first_id + i}.{apex}\n*.wild{first_id + i}.{apex}"}
+            for i in range(count)]
+
+
+def serve_crt_sh(entries, cut=(), close_cut=False):
+    return serve(CrtShHandler, entries=dict(entries), cut=set(cut), close_cut=close_cut)
+
+
+@contextlib.contextmanager
+def serve(handler, **state):
+    """Run a StandIn for handler in a background thread for the duration of the block"""
+    server = StandIn(handler, **state)
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
@@ -0,0 +1,71 @@
+import http.client
+import os
+import tempfile
+import threading
+import unittest
+import urllib.error
+import urllib.request
+
+import support
+import cache_proxy
+
+
+class UpstreamHandler(support.Handler):
+    """Serves 1000 bytes, or only the first 400 of them on paths containing "short" """
+
+    def do_GET(self):
+        body = b"x" * 1000
+        if "short" in self.path:
+            self.send_cut_short(body[:400], len(body))
+        else:
+            self.send_body(body)
+
+
+class CachingProxyTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = cache_proxy.CacheStore(os.path.join(self.directory.name, "cache.sqlite3"),
+                                            ttls={"127.0.0.1": 60})
+        self.proxy = cache_proxy.CachingProxy(self.store, timeout=10)
+        self.thread = threading.Thread(target=self.proxy.serve_forever, args=(0.05,), daemon=True)
+        self.thread.start()
+
+    def tearDown(self):
+        self.proxy.shutdown()
+        self.proxy.server_close()
+        self.thread.join()
+        self.store._db.close()
+        self.directory.cleanup()
+
+    def fetch(self, url):
+        """(X-Cache, body) of url fetched through the proxy"""
+        with urllib.request.urlopen(self.proxy.proxied_url(url), timeout=10) as response:
+            return response.headers.get("X-Cache"), response.read()
+
+    def test_complete_response_is_cached(self):
+        with support.serve(UpstreamHandler) as upstream:
+            self.assertEqual(self.fetch(upstream.url + "/full"), ("MISS", b"x" * 1000))
+            self.assertEqual(self.fetch(upstream.url + "/full"), ("HIT", b"x" * 1000))
+        self.assertEqual(len(upstream.requests), 1)
+        self.assertEqual(self.store.stats()["entries"], 1)
+
+    def test_truncated_response_is_not_cached(self):
+        with support.serve(UpstreamHandler) as upstream:
+            for _ in range(2):
+                # The relay keeps the upstream Content-Length, so the client sees the truncation too
+                with self.assertRaises(http.client.IncompleteRead):
+                    self.fetch(upstream.url + "/short")
+        self.assertEqual(len(upstream.requests), 2)
+        stats = self.store.stats()
+        self.assertEqual(stats["entries"], 0)
+        self.assertEqual(stats["upstream_errors"], 2)
+
+    def test_other_hosts_are_refused(self):
+        with self.assertRaises(urllib.error.HTTPError) as raised:
+            self.fetch("http://169.254.169.254/latest/meta-data/")
+        self.assertEqual(raised.exception.code, 403)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import os
+import tempfile
+import unittest
+
+import support
+import cdx
+
+
+class CdxFetchTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.output = os.path.join(self.directory.name, "wordpress.tsv")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def read_output(self):
+        with open(self.output, encoding="utf-8") as f:
+            return [line.split("\t")[0] for line in f.read().splitlines()]
+
+    def test_pages_follow_resume_keys(self):
+        records = support.cdx_records(23)
+        with support.serve_cdx(records) as server:
+            written = cdx.fetch_to_file("wordpress_wayback", "example.com", self.output, server.url, page_size=5)
+        self.assertEqual(written, 23)
+        self.assertEqual(self.read_output(), [record["original"] for record in records])
+        self.assertEqual(len(server.requests), 5)
+        self.assertFalse(os.path.exists(self.output + ".resume"))
+
+    def test_resume_continues_at_the_next_page(self):
+        records = support.cdx_records(23)
+        with support.serve_cdx(records) as server:
+            # Stops partway through the second page; the resume point is the end of the first
+            cdx.fetch_to_file("wordpress_wayback", "example.com", self.output, server.url, page_size=5,
+                              max_records=7)
+            self.assertEqual(len(self.read_output()), 7)
+            with open(self.output + ".resume", encoding="utf-8") as f:
+                self.assertTrue(f.read().endswith("\t5"))
+            del server.requests[:]
+            written = cdx.fetch_to_file("wordpress_wayback", "example.com", self.output, server.url, page_size=5,
+                                        resume=True)
+        self.assertEqual(written, 18)
+        self.assertEqual(self.read_output(), [record["original"] for record in records])
+        self.assertIn("resumeKey=5", server.requests[0])
+        self.assertFalse(os.path.exists(self.output + ".resume"))
+
+    def test_page_cut_short_is_fetched_again(self):
+        records = support.cdx_records(12)
+        with support.serve_cdx(records, cut_once={5}) as server:
+            written = cdx.fetch_to_file("wordpress_wayback", "example.com", self.output, server.url, page_size=5)
+        self.assertEqual(written, 12)
+        self.assertEqual(self.read_output(), [record["original"] for record in records])
+        self.assertEqual(len(server.requests), 4)
+
+    def test_client_error_is_not_retried(self):
+        with support.serve_cdx(support.cdx_records(12), fail={5}) as server:
+            with self.assertRaises(cdx.CdxError):
+                cdx.fetch_to_file("wordpress_wayback", "example.com", self.output, server.url, page_size=5)
+        self.assertEqual(len(server.requests), 2)
+        self.assertTrue(os.path.exists(self.output + ".resume"))
+
+
+if __name__ == "__main__":
+    unittest.main()
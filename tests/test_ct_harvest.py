@@ -0,0 +1,74 @@
+import asyncio
+import unittest
+
+import support
+import ct_harvest
+
+
+async def chunks(*parts):
+    for part in parts:
+        yield part
+
+
+async def collect(stream):
+    return [value async for value in stream]
+
+
+def names(apex, ids):
+    found = set()
+    for i in ids:
+        found.update((f"host{i}.{apex}", f"wild{i}.{apex}"))
+    return found
+
+
+class JsonArrayTest(unittest.TestCase):
+
+    def test_objects_split_across_chunks(self):
+        stream = ct_harvest.iter_json_array(chunks(b' [{"id": 1, "na', b'me": "a"},', b'{"id": 2}', b"]"))
+        self.assertEqual(asyncio.run(collect(stream)), [{"id": 1, "name": "a"}, {"id": 2}])
+
+    def test_array_without_closing_bracket(self):
+        stream = ct_harvest.iter_json_array(chunks(b'[{"id": 1},', b'{"id": 2}'))
+        with self.assertRaises(ValueError):
+            asyncio.run(collect(stream))
+
+
+class CtHarvesterTest(unittest.TestCase):
+
+    def harvest(self, server, domains, since=None):
+        harvester = ct_harvest.CtHarvester(base_url=server.url + "/", retries=0, timeout=10)
+        harvester.since = since or {}
+        asyncio.run(harvester.harvest(domains))
+        return harvester
+
+    def test_complete_response(self):
+        entries = support.ct_entries("example.com", 3)
+        # Entries that are not certificate objects are skipped, not fatal
+        entries[1:1] = [7, "text", None, {"id": "x", "name_value": None, "common_name": 5}]
+        with support.serve_crt_sh({"example.com": entries}) as server:
+            harvester = self.harvest(server, ["example.com"])
+        self.assertEqual(harvester.errors, {})
+        self.assertEqual(harvester.subdomains["example.com"], names("example.com", (1, 2, 3)))
+        self.assertEqual(harvester.latest, {"example.com": 3})
+
+    def test_entries_at_or_below_since_are_skipped(self):
+        with support.serve_crt_sh({"example.com": support.ct_entries("example.com", 5)}) as server:
+            harvester = self.harvest(server, ["example.com"], since={"example.com": 3})
+        self.assertEqual(harvester.subdomains["example.com"], names("example.com", (4, 5)))
+        self.assertEqual(harvester.latest, {"example.com": 5})
+
+    def test_cut_off_array_is_an_error(self):
+        entries = {"example.com": support.ct_entries("example.com", 4),
+                   "example.org": support.ct_entries("example.org", 2)}
+        for close_cut in (False, True):
+            with self.subTest(close_cut=close_cut):
+                with support.serve_crt_sh(entries, cut={"example.com"}, close_cut=close_cut) as server:
+                    harvester = self.harvest(server, ["example.com", "example.org"])
+                self.assertIn("example.com", harvester.errors)
+                self.assertNotIn("example.com", harvester.latest)
+                self.assertEqual(harvester.subdomains["example.org"], names("example.org", (1, 2)))
+                self.assertEqual(harvester.latest, {"example.org": 2})
+
+
+if __name__ == "__main__":
+    unittest.main()
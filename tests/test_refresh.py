@@ -0,0 +1,69 @@
+import os
+import tempfile
+import unittest
+
+import support
+import refresh
+
+
+class RefreshTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = refresh.RefreshStore(os.path.join(self.directory.name, "refresh.sqlite3"))
+
+    def tearDown(self):
+        self.store.close()
+        self.directory.cleanup()
+
+    def refresh_cdx(self, server):
+        return refresh.refresh_cdx(self.store, "wordpress_wayback", "example.com", server.url, page_size=4)
+
+    def test_cdx_watermark_stays_after_a_failed_page(self):
+        first = support.cdx_records(6)
+        with support.serve_cdx(first) as server:
+            result = self.refresh_cdx(server)
+        self.assertIsNone(result.error)
+        self.assertEqual(len(result.new), 6)
+        self.assertEqual(self.store.watermark("example.com", "wordpress_wayback"), first[-1]["timestamp"])
+
+        later = support.cdx_records(6, first=6, timestamp="2021")
+        with support.serve_cdx(first + later, fail={4}) as server:
+            result = self.refresh_cdx(server)
+        self.assertIsNotNone(result.error)
+        self.assertEqual(result.watermark, first[-1]["timestamp"])
+        self.assertEqual(self.store.watermark("example.com", "wordpress_wayback"), first[-1]["timestamp"])
+        # The first page was merged and reported; the next run asks from the old watermark again
+        self.assertEqual(len(result.new), 3)
+
+        with support.serve_cdx(first + later) as server:
+            result = self.refresh_cdx(server)
+        self.assertIsNone(result.error)
+        self.assertIn("from=" + first[-1]["timestamp"], server.requests[0])
+        self.assertEqual(sorted(result.new), [record["original"] for record in later[3:]])
+        self.assertEqual(self.store.watermark("example.com", "wordpress_wayback"), later[-1]["timestamp"])
+
+    def test_ct_watermark_stays_after_a_cut_off_array(self):
+        entries = support.ct_entries("example.com", 3)
+        with support.serve_crt_sh({"example.com": entries}) as server:
+            result, = refresh.refresh_ct(self.store, ["example.com"], base_url=server.url + "/", timeout=10)
+        self.assertIsNone(result.error)
+        self.assertEqual(self.store.watermark("example.com", refresh.CT_SOURCE), "3")
+
+        entries += support.ct_entries("example.com", 2, first_id=4)
+        with support.serve_crt_sh({"example.com": entries}, cut={"example.com"}) as server:
+            result, = refresh.refresh_ct(self.store, ["example.com"], base_url=server.url + "/", timeout=10)
+        self.assertIsNotNone(result.error)
+        self.assertEqual(result.new, [])
+        self.assertEqual(self.store.watermark("example.com", refresh.CT_SOURCE), "3")
+
+        with support.serve_crt_sh({"example.com": entries}) as server:
+            result, = refresh.refresh_ct(self.store, ["example.com"], base_url=server.url + "/", timeout=10)
+        self.assertIsNone(result.error)
+        self.assertEqual(result.new, ["host4.example.com", "host5.example.com",
+                                      "wild4.example.com", "wild5.example.com"])
+        self.assertEqual(self.store.watermark("example.com", refresh.CT_SOURCE), "5")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import asyncio
+import unittest
+
+import support
+import site_fetch
+
+
+class SiteHandler(support.Handler):
+    """Serves robots.txt chunked, crossdomain.xml and / with Content-Length, closing after each if server.close"""
+
+    def do_GET(self):
+        if self.server.close:
+            self.close_connection = True
+        headers = [("Connection", "close")] if self.server.close else []
+        if self.path == "/robots.txt":
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain")
+            self.send_header("Transfer-Encoding", "chunked")
+            for name, value in headers:
+                self.send_header(name, value)
+            self.end_headers()
+            for part in (b"User-agent: *\n", b"Disallow: /admin\n"):
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(part), part))
+            self.wfile.write(b"0\r\n\r\n")
+        elif self.path == "/crossdomain.xml":
+            self.send_body(b'<cross-domain-policy><allow-access-from domain="*"/></cross-domain-policy>',
+                           "text/xml", headers=headers)
+        else:
+            self.send_body(b"<html></html>", "text/html",
+                           headers=headers + [("X-Frame-Options", "DENY"), ("X-Content-Type-Options", "nosniff")])
+
+
+class SiteFetcherTest(unittest.TestCase):
+
+    def run_checks(self, server, hosts):
+        fetcher = site_fetch.SiteFetcher(concurrency=4, per_host=1, timeout=10, scheme="http")
+        records = []
+        asyncio.run(fetcher.run(hosts, records.append))
+        return fetcher, records
+
+    def test_keep_alive_connection_is_reused(self):
+        with support.serve(SiteHandler, close=False) as server:
+            fetcher, records = self.run_checks(server, [server.url, server.url])
+        self.assertEqual(len(records), 6)
+        self.assertTrue(all("error" not in record for record in records), records)
+        self.assertEqual(len(server.requests), 6)
+        self.assertEqual(server.connections, 1)
+        self.assertEqual((fetcher.pool.opened, fetcher.pool.reused), (1, 5))
+        by_check = {record["check"]: record for record in records}
+        self.assertEqual(by_check["robots"]["disallow"], ["/admin"])
+        self.assertTrue(by_check["crossdomain"]["wildcard"])
+        self.assertEqual(by_check["headers"]["present"], ["x-frame-options", "x-content-type-options"])
+
+    def test_connection_close_opens_a_new_connection(self):
+        with support.serve(SiteHandler, close=True) as server:
+            fetcher, records = self.run_checks(server, [server.url])
+        self.assertTrue(all("error" not in record for record in records), records)
+        self.assertEqual(server.connections, 3)
+        self.assertEqual((fetcher.pool.opened, fetcher.pool.reused), (3, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()